@@ -1,20 +1,116 @@
 """Ollama API client for AI-powered generation."""
 
+import json
 import logging
+import threading
+import time
 import requests
-from typing import Optional
-from config import OLLAMA_BASE_URL, OLLAMA_MODEL, AI_TIMEOUT, AI_MAX_RETRIES
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+from ai.tracing import ReplayBackend, TraceRecorder
+from config import OllamaSettings, TOKEN_USAGE_LOG_INTERVAL
 
 logger = logging.getLogger(__name__)
 
 
+class TokenUsage:
+    """Running totals of Ollama token counts per task."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"requests": 0, "prompt_tokens": 0, "eval_tokens": 0, "eval_seconds": 0.0}
+        )
+        self.requests = 0
+    
+    def record(self, task: str, result: Dict[str, Any]):
+        """
+        Add the counts from one Ollama response.
+        
+        Args:
+            task: Task name (e.g. "concept")
+            result: Parsed Ollama response body
+        """
+        with self._lock:
+            totals = self._totals[task]
+            totals["requests"] += 1
+            totals["prompt_tokens"] += result.get("prompt_eval_count", 0)
+            totals["eval_tokens"] += result.get("eval_count", 0)
+            totals["eval_seconds"] += result.get("eval_duration", 0) / 1e9
+            self.requests += 1
+    
+    def drain(self) -> Dict[str, Dict[str, float]]:
+        """
+        Take the raw totals recorded so far and start counting from zero.
+        
+        Returns:
+            Mapping of task to summed counts, for merge() in another process
+        """
+        with self._lock:
+            totals = {task: dict(counts) for task, counts in self._totals.items()}
+            self._totals.clear()
+            self.requests = 0
+            return totals
+    
+    def merge(self, totals: Dict[str, Dict[str, float]]):
+        """
+        Add totals taken with drain() (e.g. from a generation worker process).
+        
+        Args:
+            totals: Mapping of task to summed counts
+        """
+        with self._lock:
+            for task, counts in totals.items():
+                for name, value in counts.items():
+                    self._totals[task][name] += value
+                self.requests += counts["requests"]
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Average usage per task.
+        
+        Returns:
+            Mapping of task to requests, average prompt/generated tokens and
+            generated tokens per second
+        """
+        with self._lock:
+            summary = {}
+            for task, totals in self._totals.items():
+                requests_made = totals["requests"] or 1
+                summary[task] = {
+                    "requests": totals["requests"],
+                    "avg_prompt_tokens": round(totals["prompt_tokens"] / requests_made, 1),
+                    "avg_eval_tokens": round(totals["eval_tokens"] / requests_made, 1),
+                    "tokens_per_second": round(
+                        totals["eval_tokens"] / totals["eval_seconds"], 1
+                    ) if totals["eval_seconds"] else 0.0,
+                }
+            return summary
+
+
 class OllamaClient:
     """Client for interacting with Ollama API."""
     
-    def __init__(self, base_url: str = OLLAMA_BASE_URL, model: str = OLLAMA_MODEL):
-        self.base_url = base_url.rstrip('/')
-        self.model = model
+    def __init__(self, settings: Optional[OllamaSettings] = None):
+        """
+        Args:
+            settings: Connection, timeout and option settings (read from the
+                      environment if omitted)
+        
+        Raises:
+            ValueError: If the settings are invalid
+        """
+        self.settings = settings or OllamaSettings.from_env()
+        self.base_url = self.settings.base_url.rstrip('/')
+        self.model = self.settings.model
         self.api_url = f"{self.base_url}/api/generate"
+        
+        self.usage = TokenUsage()
+        
+        # Optional trace recording and offline replay (see ai/tracing.py)
+        trace_path, replay_path = self.settings.trace_path, self.settings.replay_path
+        self.recorder = TraceRecorder(trace_path) if trace_path else None
+        self.replay = ReplayBackend(replay_path, self.settings.replay_speed) if replay_path else None
     
     def is_available(self) -> bool:
         """
@@ -23,6 +119,9 @@ class OllamaClient:
         Returns:
             True if Ollama is reachable, False otherwise
         """
+        if self.replay:
+            return True
+        
         try:
             response = requests.get(
                 f"{self.base_url}/api/tags",
@@ -37,7 +136,9 @@ class OllamaClient:
         self,
         prompt: str,
         model: Optional[str] = None,
-        timeout: int = AI_TIMEOUT
+        timeout: Optional[float] = None,
+        options: Optional[Dict[str, Any]] = None,
+        task: Optional[str] = None
     ) -> Optional[str]:
         """
         Generate text using Ollama API.
@@ -45,12 +146,19 @@ class OllamaClient:
         Args:
             prompt: The prompt to send to the model
             model: Model to use (defaults to configured model)
-            timeout: Request timeout in seconds
+            timeout: Request timeout in seconds (defaults to the task's timeout)
+            options: Extra Ollama model options (e.g. {"seed": 42}), applied
+                     on top of the task's defaults
+            task: Task name used to look up the timeout and GENERATION_OPTIONS
+                  (token limit, stop sequences, temperature) and to group
+                  token usage
         
         Returns:
             Generated text, or None if generation failed
         """
         model = model or self.model
+        timeout = timeout or self.settings.timeout_for(task)
+        max_retries = self.settings.max_retries
         
         payload = {
             "model": model,
@@ -58,20 +166,23 @@ class OllamaClient:
             "stream": False
         }
         
+        merged_options = self.settings.options_for(task)
+        if options:
+            merged_options.update(options)
+        if merged_options:
+            payload["options"] = merged_options
+        
         # Retry logic
         last_error = None
-        for attempt in range(AI_MAX_RETRIES):
+        for attempt in range(max_retries):
             try:
-                logger.debug(f"Ollama API call (attempt {attempt + 1}/{AI_MAX_RETRIES})")
-                response = requests.post(
-                    self.api_url,
-                    json=payload,
-                    timeout=timeout
-                )
+                logger.debug(f"Ollama API call (attempt {attempt + 1}/{max_retries})")
+                status, body = self._post(payload, timeout, task)
                 
-                if response.status_code == 200:
-                    result = response.json()
+                if status == 200:
+                    result = json.loads(body)
                     generated_text = result.get("response", "").strip()
+                    self._record_usage(task or "other", result)
                     
                     if generated_text:
                         logger.debug("Ollama generation successful")
@@ -80,26 +191,105 @@ class OllamaClient:
                         logger.warning("Ollama returned empty response")
                         return None
                 else:
-                    error_msg = f"Ollama API returned status {response.status_code}: {response.text}"
+                    error_msg = f"Ollama API returned status {status}: {body}"
                     logger.warning(error_msg)
                     last_error = error_msg
             
             except requests.exceptions.Timeout:
-                logger.warning(f"Ollama request timed out (attempt {attempt + 1}/{AI_MAX_RETRIES})")
+                logger.warning(f"Ollama request timed out (attempt {attempt + 1}/{max_retries})")
                 last_error = "Request timeout"
             
             except requests.exceptions.ConnectionError:
-                logger.warning(f"Ollama connection error (attempt {attempt + 1}/{AI_MAX_RETRIES})")
+                logger.warning(f"Ollama connection error (attempt {attempt + 1}/{max_retries})")
                 last_error = "Connection error"
             
             except Exception as e:
                 logger.error(f"Unexpected error in Ollama API call: {e}", exc_info=True)
                 last_error = str(e)
         
-        logger.error(f"Ollama generation failed after {AI_MAX_RETRIES} attempts: {last_error}")
+        logger.error(f"Ollama generation failed after {max_retries} attempts: {last_error}")
         return None
+    
+    def _record_usage(self, task: str, result: Dict[str, Any]):
+        """Track token counts and periodically log the per-task averages."""
+        self.usage.record(task, result)
+        logger.debug(
+            f"Ollama {task}: {result.get('prompt_eval_count', 0)} prompt tokens, "
+            f"{result.get('eval_count', 0)} generated tokens"
+        )
+        if self.usage.requests % TOKEN_USAGE_LOG_INTERVAL == 0:
+            logger.info(f"Ollama token usage: {self.usage.snapshot()}")
+    
+    def _post(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        task: Optional[str] = None
+    ) -> Tuple[int, str]:
+        """
+        Send one generate request, or replay it from a trace.
+        
+        Args:
+            payload: Request payload
+            timeout: Request timeout in seconds
+            task: Task name, stored in the trace
+        
+        Returns:
+            Tuple of (status code, response body)
+        
+        Raises:
+            requests.exceptions.Timeout, requests.exceptions.ConnectionError
+        """
+        if self.replay:
+            status, body, error = self.replay.serve(payload, task)
+            if error == "timeout":
+                raise requests.exceptions.Timeout("Replayed timeout")
+            if error:
+                raise requests.exceptions.ConnectionError("Replayed connection error")
+            return status, body
+        
+        start = time.perf_counter()
+        try:
+            response = requests.post(
+                self.api_url,
+                json=payload,
+                timeout=timeout
+            )
+        except requests.exceptions.Timeout:
+            self._record(payload, None, None, start, task, "timeout")
+            raise
+        except requests.exceptions.ConnectionError:
+            self._record(payload, None, None, start, task, "connection")
+            raise
+        
+        self._record(payload, response.status_code, response.text, start, task)
+        return response.status_code, response.text
+    
+    def _record(
+        self,
+        payload: Dict[str, Any],
+        status: Optional[int],
+        body: Optional[str],
+        start: float,
+        task: Optional[str] = None,
+        error: Optional[str] = None
+    ):
+        """Write a trace entry if recording is enabled."""
+        if self.recorder:
+            try:
+                self.recorder.record(payload, status, body, time.perf_counter() - start, error, task)
+            except Exception as e:
+                logger.warning(f"Failed to record Ollama trace: {e}")
+
+
+# Shared instance, created on first use
+_ollama_client: Optional[OllamaClient] = None
 
 
-# Global instance
-ollama_client = OllamaClient()
+def get_ollama_client() -> OllamaClient:
+    """Return the shared Ollama client, creating it on first use."""
+    global _ollama_client
+    if _ollama_client is None:
+        _ollama_client = OllamaClient()
+    return _ollama_client
 
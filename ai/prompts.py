@@ -25,7 +25,7 @@ Guidelines:
 
 Tone: {tone} (encouraging/sarcastic/neutral)
 
-IMPORTANT: Respond ONLY in the format above with the 5 fields. Do not write a full game description or narrative. Just provide the 5 structured fields.
+IMPORTANT: Respond ONLY in the format above with the 5 fields, one per line. Do not write a full game description or narrative. Just provide the 5 structured fields and stop.
 
 Generate the concept now:"""
 
@@ -70,6 +70,19 @@ Provide a brief, {tone} response (2-4 sentences) that:
 Be concise and engaging. Response:"""
 
 
+JAM_SUMMARY_PROMPT = """You are a game jam assistant bot with personality. A team just finished the jam "{jam_name}" ({hours:.1f} of {duration} planned hours, {update_count} progress updates).
+
+Their progress updates, in order:
+{updates}
+
+Write a short post-jam summary (one or two short paragraphs) that:
+1. Recaps the journey from the updates (highs, lows, pivots)
+2. Celebrates what they shipped
+3. Ends with one suggestion for what to polish or try next
+
+Be {tone} and concise. Summary:"""
+
+
 def format_concept_prompt(
     duration: int = 48,
     tone: str = "encouraging",
@@ -159,3 +172,35 @@ def format_vibe_check_prompt(
         tone=tone
     )
 
+
+
+def format_jam_summary_prompt(
+    jam_name: str,
+    hours: float,
+    duration: int,
+    update_count: int,
+    updates: str,
+    tone: str = "encouraging"
+) -> str:
+    """
+    Format the post-jam summary prompt.
+    
+    Args:
+        jam_name: Name of the jam
+        hours: Hours the jam actually ran
+        duration: Planned duration in hours
+        update_count: Total number of progress updates
+        updates: Progress updates, one per line
+        tone: Response tone
+    
+    Returns:
+        Formatted prompt string
+    """
+    return JAM_SUMMARY_PROMPT.format(
+        jam_name=jam_name,
+        hours=hours,
+        duration=duration,
+        update_count=update_count,
+        updates=updates or "No updates were posted.",
+        tone=tone
+    )
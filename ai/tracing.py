@@ -0,0 +1,284 @@
+"""Record and replay Ollama traffic as JSONL traces.
+
+Recording (OLLAMA_TRACE_PATH) appends one line per API call with the request
+payload, response status and body, and elapsed time. Replay
+(OLLAMA_REPLAY_PATH) serves those recorded responses instead of calling
+Ollama, at recorded speed or faster (OLLAMA_REPLAY_SPEED), for offline load
+tests and parser regression checks.
+
+Usage:
+    python -m ai.tracing summary trace.jsonl
+    python -m ai.tracing check-parser trace.jsonl
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Marker identifying concept generation prompts in a trace
+CONCEPT_PROMPT_MARKER = "Generate the concept now:"
+
+# Response fields OllamaClient reads; the rest (notably the large "context"
+# token array) is left out of recorded bodies
+RECORDED_FIELDS = (
+    "response", "prompt_eval_count", "eval_count",
+    "prompt_eval_duration", "eval_duration", "total_duration",
+)
+# Options that differ on every request and would keep payloads from ever matching
+UNKEYED_OPTIONS = frozenset(("seed",))
+
+
+def payload_key(payload: Dict[str, Any]) -> str:
+    """Stable key for a request payload (model, prompt and options except the seed)."""
+    options = payload.get("options") or {}
+    relevant = {
+        "model": payload.get("model"),
+        "prompt": payload.get("prompt"),
+        "options": {name: value for name, value in options.items() if name not in UNKEYED_OPTIONS} or None,
+    }
+    encoded = json.dumps(relevant, sort_keys=True, ensure_ascii=False).encode()
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def read_trace(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield trace entries one at a time, skipping malformed lines."""
+    with open(path, encoding="utf-8") as trace_file:
+        for line_number, line in enumerate(trace_file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed trace line {line_number} in {path}")
+
+
+def _slim_body(body: Optional[str]) -> Optional[str]:
+    """Keep only the response fields the client reads."""
+    try:
+        result = json.loads(body or "")
+    except json.JSONDecodeError:
+        return body
+    if not isinstance(result, dict):
+        return body
+    return json.dumps(
+        {name: result[name] for name in RECORDED_FIELDS if name in result},
+        ensure_ascii=False, separators=(",", ":")
+    )
+
+
+class TraceRecorder:
+    """Appends one compact JSON line per Ollama call."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        payload: Dict[str, Any],
+        status: Optional[int],
+        body: Optional[str],
+        elapsed: float,
+        error: Optional[str] = None,
+        task: Optional[str] = None
+    ):
+        """
+        Append a trace entry.
+
+        Args:
+            payload: Request payload sent to Ollama
+            status: HTTP status code (None if the request failed)
+            body: Raw response body (successful responses are stored with
+                  RECORDED_FIELDS only)
+            elapsed: Request duration in seconds
+            error: Error kind ("timeout" or "connection") if the request failed
+            task: Generation task (e.g. "concept")
+        """
+        entry = {
+            "ts": round(time.time(), 3),
+            "key": payload_key(payload),
+            "task": task,
+            "elapsed": round(elapsed, 4),
+            "payload": payload,
+            "status": status,
+            "body": _slim_body(body) if status == 200 else body,
+        }
+        if error:
+            entry["error"] = error
+
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        # One write per line keeps entries intact when several workers append
+        with self._lock, open(self.path, "a", encoding="utf-8") as trace_file:
+            trace_file.write(line)
+
+
+class ReplayBackend:
+    """
+    Serves recorded responses instead of calling Ollama.
+
+    Requests are matched to recorded entries by payload (model, prompt and
+    options, ignoring the seed); repeated requests cycle through every
+    recording for that payload. Unmatched requests (e.g. prompts with a
+    different random duration) are served in round-robin order from the
+    entries recorded for the same task, so a concept request always gets a
+    concept response. A task with no recordings at all replays as a
+    connection error, which sends the generator to its template fallback.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0):
+        """
+        Args:
+            path: Trace file to replay
+            speed: Playback speed multiplier (2.0 = twice as fast, 0 = no delay)
+        """
+        self.path = path
+        self.speed = speed
+        self._by_key: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._by_task: Dict[Optional[str], Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+        count = 0
+        for entry in read_trace(path):
+            # Keys are recomputed so traces recorded with seeded keys still match
+            self._by_key[payload_key(entry.get("payload", {}))].append(entry)
+            self._by_task[entry.get("task")].append(entry)
+            count += 1
+
+        if not count:
+            raise ValueError(f"Trace {path} contains no entries")
+        logger.info(f"Loaded {count} trace entries from {path} (speed {speed}x)")
+
+    def _next(self, payload: Dict[str, Any], task: Optional[str]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        with self._lock:
+            entries = self._by_key.get(payload_key(payload))
+            matched = bool(entries)
+            if not matched:
+                entries = self._by_task.get(task)
+                if not entries:
+                    return None, False
+            entry = entries[0]
+            entries.rotate(-1)
+            return entry, matched
+
+    def serve(
+        self,
+        payload: Dict[str, Any],
+        task: Optional[str] = None
+    ) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+        """
+        Replay the response for a request payload.
+
+        Args:
+            payload: Request payload that would have been sent to Ollama
+            task: Generation task, used when no recording matches the payload
+
+        Returns:
+            Tuple of (status, body, error) as recorded
+        """
+        entry, matched = self._next(payload, task)
+        if entry is None:
+            logger.warning(f"No recorded responses for task {task}, replaying a connection error")
+            return None, None, "connection"
+        if not matched:
+            logger.debug(f"No recorded response for this payload, replaying the next {task} entry")
+
+        if self.speed > 0:
+            time.sleep(entry.get("elapsed", 0) / self.speed)
+
+        return entry.get("status"), entry.get("body"), entry.get("error")
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(path: str):
+    """Print request count, errors, latency percentiles and tokens per task."""
+    latencies = []
+    errors = 0
+    tokens: Dict[str, List[int]] = defaultdict(list)
+    for entry in read_trace(path):
+        latencies.append(entry.get("elapsed", 0))
+        if entry.get("error") or entry.get("status") != 200:
+            errors += 1
+            continue
+        try:
+            result = json.loads(entry.get("body") or "{}")
+        except json.JSONDecodeError:
+            continue
+        if "eval_count" in result:
+            tokens[entry.get("task") or "other"].append(result["eval_count"])
+
+    if not latencies:
+        print("Trace is empty")
+        return
+
+    print(f"Requests: {len(latencies)}  Errors: {errors}")
+    print(
+        f"Latency p50 {_percentile(latencies, 0.5):.2f}s  "
+        f"p95 {_percentile(latencies, 0.95):.2f}s  "
+        f"max {max(latencies):.2f}s"
+    )
+    for task, counts in sorted(tokens.items()):
+        print(f"{task}: {len(counts)} responses, avg {sum(counts) / len(counts):.1f} generated tokens")
+
+
+def check_parser(path: str) -> int:
+    """
+    Re-run the concept parser over every recorded concept response.
+
+    Returns:
+        Number of responses that did not parse into a complete concept
+    """
+    from generators.ai_generator import get_ai_generator
+
+    generator = get_ai_generator()
+    total = incomplete = 0
+    for entry in read_trace(path):
+        payload = entry.get("payload", {})
+        if CONCEPT_PROMPT_MARKER not in payload.get("prompt", "") or entry.get("status") != 200:
+            continue
+
+        try:
+            text = json.loads(entry.get("body") or "{}").get("response", "").strip()
+        except json.JSONDecodeError:
+            continue
+
+        total += 1
+        concept = generator._parse_ai_concept(text, None, "medium", "neutral", 48)
+        if not (concept.is_complete and concept.constraint):
+            incomplete += 1
+            print(f"--- Incomplete parse (trace ts {entry.get('ts')}):\n{text}\n")
+
+    print(f"Concept responses: {total}  Fully parsed: {total - incomplete}  Incomplete: {incomplete}")
+    return incomplete
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect recorded Ollama traces")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("summary", help="Show latency and error stats").add_argument("trace")
+    subparsers.add_parser("check-parser", help="Re-parse recorded concept responses").add_argument("trace")
+    args = parser.parse_args()
+
+    if args.command == "summary":
+        summarize(args.trace)
+    elif args.command == "check-parser":
+        raise SystemExit(1 if check_parser(args.trace) else 0)
+
+
+if __name__ == "__main__":
+    main()
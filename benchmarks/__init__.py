@@ -0,0 +1 @@
+"""Performance micro-benchmarks."""
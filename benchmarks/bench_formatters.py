@@ -0,0 +1,97 @@
+"""Micro-benchmark for message formatting.
+
+Usage:
+    python -m benchmarks.bench_formatters
+
+Formats concepts whose text grows from tiny to very large and reports the
+cost per call and per KiB of output. With precompiled templates the cost per
+KiB stays flat: each message is assembled in a single pass, so long AI
+descriptions cost a copy of their text and nothing more.
+
+Exits with status 1 if the cost per KiB of the largest concepts grows past
+MAX_COST_GROWTH times that of the 1,000-character ones, so a formatter that
+turns quadratic fails the run instead of just printing bigger numbers.
+"""
+
+import sys
+import timeit
+from generators.models import Concept, Difficulty
+from utils.formatters import format_concept_message, format_constraint_message, format_help_message
+
+SIZES = [100, 1_000, 10_000, 100_000]
+
+# Fixed per-call overhead dominates the 100-character messages, so growth is
+# measured from this size
+BASELINE_SIZE = 1_000
+# Largest allowed ratio of µs/KiB at SIZES[-1] to µs/KiB at BASELINE_SIZE
+# (linear formatting stays near or below 1; quadratic would be ~100)
+MAX_COST_GROWTH = 3.0
+
+
+def _described_concept(size: int) -> Concept:
+    return Concept(
+        genre="Puzzle",
+        time_limit=48,
+        difficulty=Difficulty.HARD,
+        is_ai=True,
+        description="x" * size
+    )
+
+
+def _structured_concept(size: int) -> Concept:
+    field = "y" * (size // 5)
+    return Concept(
+        genre="Puzzle",
+        setting=field,
+        mechanic=field,
+        theme=field,
+        constraint=field,
+        time_limit=48,
+        is_ai=True
+    )
+
+
+def bench(label: str, func, *args) -> float:
+    """
+    Time one formatter call and print µs/call and µs/KiB of output.
+
+    Returns:
+        µs per KiB of output
+    """
+    number = 2_000
+    output_kib = len(func(*args).encode()) / 1024
+    seconds = min(timeit.repeat(lambda: func(*args), number=number, repeat=5)) / number
+    per_kib = seconds * 1e6 / output_kib
+    print(f"{label:<34} {seconds * 1e6:9.2f} µs/call {per_kib:9.3f} µs/KiB")
+    return per_kib
+
+
+def check_growth(label: str, per_kib: dict) -> bool:
+    """Compare the cost per KiB of the largest size with the baseline size."""
+    growth = per_kib[SIZES[-1]] / per_kib[BASELINE_SIZE]
+    within = growth <= MAX_COST_GROWTH
+    status = "ok" if within else f"REGRESSION (limit {MAX_COST_GROWTH:.1f}x)"
+    print(f"{label:<34} {growth:9.2f}x µs/KiB from {BASELINE_SIZE} to {SIZES[-1]} chars: {status}")
+    return within
+
+
+def main() -> int:
+    print("Formatter micro-benchmark (best of 5)\n")
+    described = {
+        size: bench(f"described concept, {size:>7} chars", format_concept_message, _described_concept(size))
+        for size in SIZES
+    }
+    structured = {
+        size: bench(f"structured concept, {size:>7} chars", format_concept_message, _structured_concept(size))
+        for size in SIZES
+    }
+    bench("constraint", format_constraint_message, "Only 3 colors")
+    bench("help (memoized)", format_help_message)
+
+    print()
+    results = [check_growth("described concept", described), check_growth("structured concept", structured)]
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Owner-only diagnostics commands for the Game Jam Assistant bot."""
+
+import asyncio
+import io
+import json
+import logging
+from enum import Enum
+import discord
+from discord import app_commands
+from discord.ext import commands
+from database.job_queue import job_queue
+from database.preferences import preference_store
+from generators.concept_sessions import concept_sessions
+from generators.genre_index import genre_index
+from generators.kickoff_stager import kickoff_stager
+from generators.load_shedder import load_shedder
+from generators.seeds import seed_cache
+from generators.vibe_router import vibe_router
+from generators.warm_pool import warm_pool
+from generators.worker_pool import generation_pool
+from utils.message_queue import message_queue
+from utils.profiling import MemoryTracker, cprofile_event_loop, sample_profile
+from utils.rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Lines of a report shown inline; the full report is attached as a file
+PREVIEW_LINES = 25
+PREVIEW_LIMIT = 1900
+
+
+class ProfileMode(Enum):
+    SAMPLING = "sampling"
+    CPROFILE = "cprofile"
+
+
+class MemoryAction(Enum):
+    START = "start"
+    DIFF = "diff"
+    STOP = "stop"
+
+
+def _report_reply(report: str, filename: str) -> dict:
+    """Message kwargs with a preview of a report and the full text attached."""
+    preview = "\n".join(report.splitlines()[:PREVIEW_LINES])[:PREVIEW_LIMIT]
+    return {
+        "content": f"```\n{preview}\n```",
+        "file": discord.File(io.BytesIO(report.encode("utf-8")), filename=filename),
+        "ephemeral": True,
+    }
+
+
+class AdminCog(commands.Cog):
+    """Profiling, memory and runtime state commands for the bot owner."""
+
+    admin = app_commands.Group(
+        name="admin",
+        description="Bot owner diagnostics",
+        default_permissions=discord.Permissions(administrator=True)
+    )
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._profiling = asyncio.Lock()
+        self.memory = MemoryTracker({
+            "seed_cache": lambda: len(seed_cache.cache),
+            "preference_cache": lambda: len(preference_store),
+            "concept_sessions": lambda: len(concept_sessions),
+            "warm_pool": lambda: len(warm_pool),
+            "learned_genres": lambda: len(genre_index.learned()),
+            "rate_limit_buckets": rate_limiter.active_buckets,
+            "message_queue": lambda: message_queue.pending,
+            "generation_in_flight": lambda: generation_pool.in_flight,
+        })
+
+    async def _check_owner(self, interaction: discord.Interaction) -> bool:
+        """Only the application owner may run diagnostics (they can expose internals)."""
+        if await self.bot.is_owner(interaction.user):
+            return True
+        await interaction.response.send_message("❌ Only the bot owner can use this command.", ephemeral=True)
+        return False
+
+    @admin.command(name="profile", description="Profile the running bot and report the hotspots")
+    @app_commands.describe(
+        seconds="How long to profile",
+        mode="sampling: every thread, low overhead; cprofile: exact calls on the event loop",
+        top="Number of hotspots to list"
+    )
+    async def profile(
+        self,
+        interaction: discord.Interaction,
+        seconds: app_commands.Range[int, 1, 60] = 10,
+        mode: ProfileMode = ProfileMode.SAMPLING,
+        top: app_commands.Range[int, 5, 50] = 20
+    ):
+        """Run a time-boxed profiler in-process."""
+        if not await self._check_owner(interaction):
+            return
+        if self._profiling.locked():
+            await interaction.response.send_message("⏳ A profile is already running.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        async with self._profiling:
+            logger.info(f"{mode.value} profile started by {interaction.user} for {seconds}s")
+            if mode is ProfileMode.CPROFILE:
+                report = await cprofile_event_loop(seconds, top)
+            else:
+                report = await sample_profile(seconds, top)
+
+        await interaction.followup.send(**_report_reply(report, f"profile-{mode.value}.txt"))
+
+    @admin.command(name="memory", description="Trace allocations and diff memory snapshots")
+    @app_commands.describe(
+        action="start: begin tracing; diff: compare with the last snapshot; stop: end tracing",
+        top="Number of source lines to list"
+    )
+    async def memory_snapshot(
+        self,
+        interaction: discord.Interaction,
+        action: MemoryAction = MemoryAction.DIFF,
+        top: app_commands.Range[int, 5, 50] = 20
+    ):
+        """Start, diff or stop tracemalloc snapshots."""
+        if not await self._check_owner(interaction):
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        # Snapshots walk every traced allocation, so keep them off the event loop
+        if action is MemoryAction.START:
+            message = await asyncio.to_thread(self.memory.start)
+        elif action is MemoryAction.STOP:
+            message = self.memory.stop()
+        else:
+            report = await asyncio.to_thread(self.memory.diff, top)
+            await interaction.followup.send(**_report_reply(report, "memory-diff.txt"))
+            return
+        await interaction.followup.send(message, ephemeral=True)
+
+    @admin.command(name="status", description="Show load shedding, pools, caches and token usage")
+    async def status(self, interaction: discord.Interaction):
+        """Dump the runtime counters of every subsystem."""
+        if not await self._check_owner(interaction):
+            return
+
+        state = {
+            "generation_pool": {
+                "mode": generation_pool.mode,
+                "in_flight": generation_pool.in_flight,
+                "completed": generation_pool.completed,
+                "failed": generation_pool.failed,
+                "latency": round(generation_pool.latency, 2),
+            },
+            "load_shedder": load_shedder.snapshot(),
+            "vibe_router": vibe_router.stats.snapshot(),
+            "warm_pool": {
+                "pooled": len(warm_pool),
+                "hits": warm_pool.hits,
+                "misses": warm_pool.misses,
+                "generated": warm_pool.generated,
+            },
+            "kickoff_stager": kickoff_stager.snapshot(),
+            "job_queue": job_queue.snapshot(),
+            "message_queue": {"pending": message_queue.pending, **message_queue.stats.snapshot()},
+            "stores": self.memory.sizes(),
+            "token_usage": generation_pool.token_usage(),
+        }
+
+        report = json.dumps(state, indent=2, default=str)
+        await interaction.response.send_message(**_report_reply(report, "status.json"))
+
+
+async def setup(bot: commands.Bot):
+    """Setup function for loading the cog."""
+    await bot.add_cog(AdminCog(bot))
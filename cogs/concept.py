@@ -1,11 +1,27 @@
 """Concept generation commands for the Game Jam Assistant bot."""
 
+import asyncio
+import logging
+from typing import List
 import discord
 from discord import app_commands
 from discord.ext import commands
-from generators.ai_generator import ai_generator
-from config import DEFAULT_TONE
-from utils.formatters import format_concept_message, format_constraint_message
+from database.db_manager import db_manager
+from database.preferences import preference_store
+from generators.concept_sessions import concept_sessions
+from generators.worker_pool import generation_pool
+from generators.template_generator import template_generator
+from generators.genre_index import genre_index
+from generators.load_shedder import load_shedder
+from generators.models import Difficulty
+from generators.seeds import ConceptCode, new_seed, seed_cache
+from generators.vibe_router import vibe_router
+from generators.warm_pool import warm_key, warm_pool
+from utils.formatters import build_concept_embed, build_constraint_embed
+from utils.message_queue import split_message
+from utils.rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
 
 
 class ConceptCog(commands.Cog):
@@ -14,56 +30,179 @@ class ConceptCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
     
+    async def _within_budget(
+        self,
+        interaction: discord.Interaction,
+        command: str,
+        message: str = ""
+    ) -> bool:
+        """
+        Check the caller's AI budget for a command.
+        
+        Args:
+            interaction: The Discord interaction
+            command: Slash command name (used to look up its cost)
+            message: Free-form user text sent along with the command
+        
+        Returns:
+            True if the command may use AI, False if it should degrade to templates
+        """
+        cost = rate_limiter.command_cost(command, message)
+        return await rate_limiter.try_acquire(
+            interaction.user.id,
+            interaction.guild_id,
+            cost
+        )
+    
+    async def _record(self, method, *args):
+        """Count a generation in the jam stats without failing the command."""
+        try:
+            await asyncio.to_thread(method, *args)
+        except Exception as e:
+            logger.warning(f"Failed to record generation stats: {e}")
+    
     @app_commands.command(
         name="generate-concept",
         description="Generate a random game concept with constraints"
     )
     @app_commands.describe(
-        genre="Specify a genre (platformer, rpg, puzzle, etc.)",
-        difficulty="Difficulty level: Easy, Medium, Hard, or Insane"
+        genre="Specify a genre (platformer, rpg, puzzle, etc.); defaults to a favorite genre if set",
+        difficulty="Difficulty level: Easy, Medium, Hard, or Insane; defaults to your preference",
+        seed="Concept code from an earlier concept to regenerate it (overrides genre and difficulty)"
     )
     async def generate_concept(
         self,
         interaction: discord.Interaction,
         genre: str = None,
-        difficulty: str = "medium"
+        difficulty: str = None,
+        seed: str = None
     ):
         """Generate a game concept with constraints."""
-        # Validate difficulty
-        valid_difficulties = ["easy", "medium", "hard", "insane"]
-        if difficulty.lower() not in valid_difficulties:
-            difficulty = "medium"
+        preferences = preference_store.resolve(interaction.user.id, interaction.guild_id)
+        tone = preferences.tone
+        
+        if seed:
+            code = ConceptCode.decode(seed)
+            if code is None:
+                await interaction.response.send_message(
+                    f"❌ `{seed}` is not a valid concept code.",
+                    ephemeral=True
+                )
+                return
+            
+            # Shared codes are served from cache without a new generation
+            cached = seed_cache.get(seed, tone)
+            if cached is not None:
+                concept_sessions.remember(interaction.channel_id, cached)
+                await interaction.response.send_message(embed=build_concept_embed(cached))
+                return
+            
+            genre = code.genre
+            difficulty = code.difficulty.value
+            use_ai = code.is_ai
+        else:
+            code = ConceptCode(seed=new_seed())
+            # Options left out (or invalid) fall back to user/guild preferences
+            difficulty = Difficulty.parse(difficulty, preferences.difficulty).value
+            genre = genre or preferences.pick_genre(code.seed)
+            use_ai = True
         
         # Defer response since AI generation may take time
         await interaction.response.defer()
         
         try:
-            # Generate concept using AI generator (with template fallback)
-            concept = ai_generator.generate_concept(
-                genre=genre,
-                difficulty=difficulty,
-                tone=DEFAULT_TONE
-            )
+            concept = None
+            use_template = True
+            if use_ai and await self._within_budget(interaction, "generate-concept"):
+                # Pre-generated concepts answer common requests instantly
+                concept = None if seed else warm_pool.take(warm_key(genre, difficulty, tone))
+                if concept is not None:
+                    use_template = False
+                elif load_shedder.admit("generate-concept"):
+                    # Generate concept using AI generator (with template fallback)
+                    use_template = False
+                    concept = await generation_pool.submit(
+                        "generate_concept",
+                        genre=genre,
+                        difficulty=difficulty,
+                        tone=tone,
+                        seed=code.seed
+                    )
             
-            # Check for errors
-            if "error" in concept:
+            if use_template:
+                # Template codes, over budget or AI overloaded: serve a
+                # template concept instead of hitting Ollama
+                concept = template_generator.generate_concept(
+                    genre=genre,
+                    difficulty=difficulty,
+                    seed=code.seed
+                )
+            
+            # AI failed and template fallback is disabled
+            if concept is None:
                 await interaction.followup.send(
-                    f"❌ {concept['error']}\n\nFalling back to template generation...",
+                    "❌ AI generation failed. Please try again later.",
                     ephemeral=True
                 )
                 return
             
-            # Determine if this is AI-generated
-            is_ai = concept.get("is_ai", False)
+            # Warm pool concepts already carry the code they were generated with
+            if not concept.code:
+                concept.code = ConceptCode(
+                    seed=code.seed,
+                    difficulty=Difficulty.parse(difficulty),
+                    genre=genre,
+                    is_ai=concept.is_ai
+                ).encode()
+            seed_cache.put(concept, tone)
+            concept_sessions.remember(interaction.channel_id, concept)
+            
+            # Offer genres invented by the AI in future autocompletes (never
+            # the genre a user typed, which would show up for everyone)
+            if concept.genre_from_ai:
+                genre_index.learn(concept.genre)
             
             # Format and send message
-            message = format_concept_message(concept, is_ai=is_ai)
-            await interaction.followup.send(message)
+            await interaction.followup.send(embed=build_concept_embed(concept))
+            
+            await self._record(
+                db_manager.record_concept,
+                concept,
+                interaction.guild_id,
+                interaction.channel_id,
+                interaction.user.id
+            )
         
         except Exception as e:
             error_msg = f"Failed to generate concept: {str(e)}"
             await interaction.followup.send(error_msg, ephemeral=True)
     
+    @generate_concept.autocomplete("genre")
+    async def genre_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Suggest built-in and AI-learned genres matching what was typed."""
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in genre_index.complete(current)
+        ]
+    
+    @generate_concept.autocomplete("difficulty")
+    async def difficulty_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Suggest difficulty levels matching what was typed."""
+        current = current.strip().lower()
+        return [
+            app_commands.Choice(name=level.value.title(), value=level.value)
+            for level in Difficulty
+            if level.value.startswith(current)
+        ]
+    
     @app_commands.command(
         name="generate-constraint",
         description="Add one more constraint to your existing concept"
@@ -74,16 +213,35 @@ class ConceptCog(commands.Cog):
         await interaction.response.defer()
         
         try:
-            # Generate constraint using AI generator (with template fallback)
-            constraint = ai_generator.generate_constraint(tone=DEFAULT_TONE)
+            tone = preference_store.resolve(interaction.user.id, interaction.guild_id).tone
+            # Build on the last concept generated in this channel, if any
+            session = await asyncio.to_thread(concept_sessions.get, interaction.channel_id)
+            
+            constraint = None
+            if session is not None:
+                # Constraints already generated for this concept cost nothing
+                constraint = concept_sessions.cached_constraint(session, tone)
             
-            if not constraint or constraint.startswith("AI"):
-                # Fallback to template if AI failed
-                from generators.template_generator import template_generator
+            if constraint is None and load_shedder.admit("generate-constraint") and await self._within_budget(
+                interaction, "generate-constraint"
+            ):
+                # Generate constraint using AI generator (with template fallback)
+                constraint = await generation_pool.submit(
+                    "generate_constraint",
+                    existing_concept=session.summary if session else None,
+                    tone=tone
+                )
+                if session is not None and constraint and not constraint.startswith("AI"):
+                    concept_sessions.add_constraint(session, tone, constraint)
+            
+            is_ai = bool(constraint) and not constraint.startswith("AI")
+            if not is_ai:
+                # Fallback to template if AI failed, is overloaded or the caller is over budget
                 constraint = template_generator.generate_additional_constraint()
             
-            message = format_constraint_message(constraint)
-            await interaction.followup.send(message)
+            await interaction.followup.send(embed=build_constraint_embed(constraint))
+            
+            await self._record(db_manager.record_constraint, constraint, interaction.guild_id, is_ai)
         
         except Exception as e:
             error_msg = f"Failed to generate constraint: {str(e)}"
@@ -102,17 +260,33 @@ class ConceptCog(commands.Cog):
         message: str = ""
     ):
         """Get AI commentary on current progress/mood."""
+        tone = preference_store.resolve(interaction.user.id, interaction.guild_id).tone
+        
+        # Stock phrases ("tired", "stuck on a bug") get an instant canned reply
+        # and don't count against the AI budget
+        response = vibe_router.route(message, tone)
+        if response is not None:
+            await interaction.response.send_message(response)
+            return
+        
         # Defer response since AI generation may take time
         await interaction.response.defer()
         
         try:
-            # Generate vibe check response using AI
-            response = ai_generator.generate_vibe_check(
-                user_message=message,
-                tone=DEFAULT_TONE
-            )
+            if load_shedder.admit("vibe-check") and await self._within_budget(interaction, "vibe-check", message):
+                # Generate vibe check response using AI
+                vibe_router.record_llm_call()
+                response = await generation_pool.submit(
+                    "generate_vibe_check",
+                    user_message=message,
+                    tone=tone
+                )
+            else:
+                response = template_generator.generate_vibe_check()
             
-            await interaction.followup.send(response)
+            # Rambling AI responses can exceed Discord's message limit
+            for chunk in split_message(response):
+                await interaction.followup.send(chunk)
         
         except Exception as e:
             error_msg = f"Failed to generate vibe check: {str(e)}"
@@ -0,0 +1,293 @@
+"""Jam tracking commands for the Game Jam Assistant bot."""
+
+import asyncio
+import io
+import logging
+import time
+from typing import Optional
+import discord
+from discord import app_commands
+from discord.ext import commands
+from database.analytics import export_jam_stats, jam_stats
+from database.db_manager import db_manager
+from database.job_queue import job_queue
+from database.models import JOB_FAILED, JOB_PENDING, JOB_RUNNING, Job, JamSession, ProgressUpdate
+from database.preferences import preference_store
+from generators.load_shedder import load_shedder
+from generators.worker_pool import generation_pool
+from config import CHECKIN_INTERVALS, DEFAULT_JAM_DURATION, JAM_SUMMARY_UPDATES
+from utils.formatters import (
+    build_jam_complete_embed,
+    build_jam_started_embed,
+    build_jam_stats_embed,
+    build_jam_status_embed,
+    build_jobs_embed,
+    format_checkin,
+    format_jam_summary,
+    format_progress_logged,
+)
+from utils.message_queue import split_message
+from utils.rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+MAX_JAM_HOURS = 24 * 30
+MAX_UPDATE_LENGTH = 500
+NO_ACTIVE_JAM = "❌ There is no jam running in this channel. Start one with `/start-jam`."
+
+# Background job kinds (see database/job_queue.py)
+CHECKIN_JOB = "checkin"
+SUMMARY_JOB = "jam-summary"
+
+
+async def run_checkin(job: Job, last_attempt: bool) -> Optional[str]:
+    """Generate a scheduled check-in for a jam that is still running."""
+    jam = await asyncio.to_thread(db_manager.get_jam, job.payload["jam_id"])
+    if jam is None or jam.completed:
+        return None
+
+    hour = job.payload["hour"]
+    updates = await asyncio.to_thread(db_manager.recent_updates, jam.id, 1)
+    commentary = await generation_pool.submit(
+        "generate_commentary",
+        user_message=updates[-1].message if updates else "No progress updates posted yet",
+        context_info=f"Scheduled check-in at hour {hour} of a {jam.duration_hours}-hour jam, "
+                     f"{jam.update_count} update(s) so far",
+        tone=preference_store.resolve(jam.created_by, jam.guild_id).tone
+    )
+    return format_checkin(jam, hour, commentary)
+
+
+async def run_jam_summary(job: Job, last_attempt: bool) -> Optional[str]:
+    """Generate the post-jam summary (a plain recap once AI retries run out)."""
+    jam = await asyncio.to_thread(db_manager.get_jam, job.payload["jam_id"])
+    if jam is None:
+        return None
+
+    updates = await asyncio.to_thread(db_manager.recent_updates, jam.id, JAM_SUMMARY_UPDATES)
+    summary = await generation_pool.submit(
+        "generate_jam_summary",
+        jam_name=jam.name,
+        hours=jam.hours_elapsed(),
+        duration=jam.duration_hours,
+        update_count=jam.update_count,
+        updates="\n".join(f"[{update.hours_elapsed:.1f}h] {update.message}" for update in updates),
+        tone=preference_store.resolve(jam.created_by, jam.guild_id).tone
+    )
+    if summary is None and not last_attempt:
+        raise RuntimeError("AI summary unavailable")
+    return format_jam_summary(jam, updates, summary or "")
+
+
+class JamTrackingCog(commands.Cog):
+    """Commands for tracking jams and their progress."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        job_queue.register(CHECKIN_JOB, run_checkin)
+        job_queue.register(SUMMARY_JOB, run_jam_summary)
+
+    async def _schedule_checkins(self, jam: JamSession):
+        """Queue a check-in job for every interval that falls inside the jam."""
+        for hour in CHECKIN_INTERVALS:
+            if hour > jam.duration_hours:
+                break
+            await job_queue.enqueue(Job(
+                kind=CHECKIN_JOB,
+                key=f"checkin:{jam.id}:{hour}",
+                guild_id=jam.guild_id,
+                channel_id=jam.channel_id,
+                payload={"jam_id": jam.id, "hour": hour},
+                run_at=jam.start_time + hour * 3600
+            ))
+
+    @app_commands.command(
+        name="start-jam",
+        description="Start tracking a game jam in this channel"
+    )
+    @app_commands.describe(
+        name="Name of the jam",
+        duration_hours="How long the jam runs, in hours"
+    )
+    async def start_jam(
+        self,
+        interaction: discord.Interaction,
+        name: str,
+        duration_hours: app_commands.Range[int, 1, MAX_JAM_HOURS] = DEFAULT_JAM_DURATION
+    ):
+        """Start a jam in the current channel."""
+        jam = JamSession(
+            guild_id=interaction.guild_id,
+            channel_id=interaction.channel_id,
+            name=name.strip()[:100],
+            duration_hours=duration_hours,
+            created_by=interaction.user.id
+        )
+
+        if not await asyncio.to_thread(db_manager.start_jam, jam):
+            await interaction.response.send_message(
+                "❌ A jam is already running in this channel. Finish it with `/jam-complete` first.",
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.send_message(embed=build_jam_started_embed(jam))
+
+        try:
+            await self._schedule_checkins(jam)
+        except Exception as e:
+            logger.error(f"Failed to schedule check-ins for jam {jam.id}: {e}", exc_info=True)
+
+    @app_commands.command(
+        name="update-progress",
+        description="Log a progress update for the running jam"
+    )
+    @app_commands.describe(message="What you got done (or what broke)")
+    async def update_progress(self, interaction: discord.Interaction, message: str):
+        """Log a progress update and reply with commentary."""
+        jam = await asyncio.to_thread(db_manager.get_active_jam, interaction.channel_id)
+        if jam is None:
+            await interaction.response.send_message(NO_ACTIVE_JAM, ephemeral=True)
+            return
+
+        # Defer response since AI commentary may take time
+        await interaction.response.defer()
+
+        message = message.strip()[:MAX_UPDATE_LENGTH]
+        now = time.time()
+        update = ProgressUpdate(
+            jam_id=jam.id,
+            user_id=interaction.user.id,
+            message=message,
+            hours_elapsed=jam.hours_elapsed(now),
+            timestamp=now
+        )
+
+        try:
+            await asyncio.to_thread(db_manager.add_progress_update, jam, update)
+
+            commentary = ""
+            cost = rate_limiter.command_cost("update-progress", message)
+            if load_shedder.admit("update-progress") and await rate_limiter.try_acquire(
+                interaction.user.id, interaction.guild_id, cost
+            ):
+                commentary = await generation_pool.submit(
+                    "generate_commentary",
+                    user_message=message,
+                    context_info=f"Time into jam: {update.hours_elapsed:.1f}/{jam.duration_hours} hours",
+                    tone=preference_store.resolve(interaction.user.id, interaction.guild_id).tone
+                )
+
+            for chunk in split_message(format_progress_logged(jam, update, commentary)):
+                await interaction.followup.send(chunk)
+
+        except Exception as e:
+            logger.error(f"Failed to log progress update: {e}", exc_info=True)
+            await interaction.followup.send(f"Failed to log progress: {str(e)}", ephemeral=True)
+
+    @app_commands.command(
+        name="jam-status",
+        description="Show time remaining and recent updates for the running jam"
+    )
+    async def jam_status(self, interaction: discord.Interaction):
+        """Show the running jam's status."""
+        jam = await asyncio.to_thread(db_manager.get_active_jam, interaction.channel_id)
+        if jam is None:
+            await interaction.response.send_message(NO_ACTIVE_JAM, ephemeral=True)
+            return
+
+        updates = await asyncio.to_thread(db_manager.recent_updates, jam.id)
+        await interaction.response.send_message(embed=build_jam_status_embed(jam, updates))
+
+    @app_commands.command(
+        name="jam-complete",
+        description="Mark the running jam as complete"
+    )
+    async def jam_complete(self, interaction: discord.Interaction):
+        """Complete the running jam."""
+        jam = await asyncio.to_thread(db_manager.get_active_jam, interaction.channel_id)
+        if jam is None or not await asyncio.to_thread(db_manager.complete_jam, jam):
+            await interaction.response.send_message(NO_ACTIVE_JAM, ephemeral=True)
+            return
+
+        # The summary is a long generation, so it runs as a background job
+        # and is posted to the channel when ready
+        try:
+            summary_queued = await job_queue.enqueue(Job(
+                kind=SUMMARY_JOB,
+                key=f"jam-summary:{jam.id}",
+                guild_id=jam.guild_id,
+                channel_id=jam.channel_id,
+                payload={"jam_id": jam.id}
+            ))
+        except Exception as e:
+            logger.error(f"Failed to queue summary for jam {jam.id}: {e}", exc_info=True)
+            summary_queued = False
+
+        await interaction.response.send_message(embed=build_jam_complete_embed(jam, summary_queued))
+
+    @app_commands.command(
+        name="jam-stats",
+        description="Show jam statistics for this server"
+    )
+    @app_commands.describe(
+        all_servers="Show statistics across every server instead of just this one (bot owner only)",
+        export="Attach the statistics as a JSON file"
+    )
+    async def jam_stats(
+        self,
+        interaction: discord.Interaction,
+        all_servers: bool = False,
+        export: bool = False
+    ):
+        """Show counters-backed jam statistics."""
+        guild_id = None if all_servers else interaction.guild_id
+        # Global counters cover every server using the bot, so only the owner sees them
+        if guild_id is None and not await self.bot.is_owner(interaction.user):
+            message = (
+                "❌ Only the bot owner can view statistics across every server."
+                if all_servers else "❌ Jam stats are only available inside a server."
+            )
+            await interaction.response.send_message(message, ephemeral=True)
+            return
+
+        stats = await asyncio.to_thread(jam_stats, guild_id)
+        title = "📈 Jam Stats (all servers)" if guild_id is None else "📈 Jam Stats"
+
+        kwargs = {}
+        if export:
+            document = await asyncio.to_thread(export_jam_stats, guild_id)
+            kwargs["file"] = discord.File(io.BytesIO(document.encode("utf-8")), filename="jam-stats.json")
+
+        await interaction.response.send_message(
+            embed=build_jam_stats_embed(stats, title), ephemeral=guild_id is None, **kwargs
+        )
+
+    @app_commands.command(
+        name="jam-jobs",
+        description="Show this server's pending and failed background jobs (summaries, check-ins)"
+    )
+    @app_commands.describe(retry_failed="Queue failed jobs again (requires Manage Server)")
+    async def jam_jobs(self, interaction: discord.Interaction, retry_failed: bool = False):
+        """Show the background job queue for this server."""
+        if interaction.guild_id is None:
+            await interaction.response.send_message("❌ Jobs can only be listed inside a server.", ephemeral=True)
+            return
+        if retry_failed:
+            if not interaction.permissions.manage_guild:
+                await interaction.response.send_message(
+                    "❌ You need the Manage Server permission to retry jobs.", ephemeral=True
+                )
+                return
+            await asyncio.to_thread(db_manager.retry_failed_jobs, interaction.guild_id)
+
+        counts = await asyncio.to_thread(db_manager.job_counts, interaction.guild_id)
+        jobs = await asyncio.to_thread(
+            db_manager.list_jobs, (JOB_PENDING, JOB_RUNNING, JOB_FAILED), interaction.guild_id
+        )
+        await interaction.response.send_message(embed=build_jobs_embed(counts, jobs), ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    """Setup function for loading the cog."""
+    await bot.add_cog(JamTrackingCog(bot))
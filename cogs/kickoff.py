@@ -0,0 +1,173 @@
+"""Scheduled jam kickoff commands for the Game Jam Assistant bot."""
+
+import asyncio
+import logging
+import time
+from typing import List, Optional
+import discord
+from discord import app_commands
+from discord.ext import commands
+from database.db_manager import db_manager
+from database.job_queue import job_queue
+from database.models import KICKOFF_CANCELLED, KICKOFF_REVEALED, KICKOFF_STAGING, Job, Kickoff
+from database.preferences import preference_store
+from generators.genre_index import genre_index
+from generators.kickoff_stager import kickoff_stager
+from generators.models import Concept, Difficulty
+from generators.seeds import seed_cache
+from config import MAX_KICKOFF_LEAD_HOURS, MAX_KICKOFF_TEAMS
+from utils.formatters import build_kickoff_embed, format_kickoff_reveal
+
+logger = logging.getLogger(__name__)
+
+REVEAL_JOB = "kickoff-reveal"
+NO_KICKOFF = "❌ There is no kickoff scheduled in this channel. Schedule one with `/schedule-kickoff`."
+
+
+async def run_kickoff_reveal(job: Job, last_attempt: bool) -> Optional[str]:
+    """Post every team's staged concept (topping up from templates if needed)."""
+    kickoff = await asyncio.to_thread(db_manager.get_kickoff, job.payload["kickoff_id"])
+    if kickoff is None or kickoff.status not in (KICKOFF_STAGING, KICKOFF_REVEALED):
+        return None
+
+    if kickoff.status == KICKOFF_REVEALED:
+        # Only this job reveals a kickoff, and the queue skips the handler once the
+        # message is saved, so an earlier attempt stopped before posting: rebuild it
+        concepts = await asyncio.to_thread(db_manager.kickoff_concepts, kickoff.id)
+        _cache_concepts(kickoff, concepts)
+        return format_kickoff_reveal(kickoff, concepts)
+
+    await asyncio.to_thread(kickoff_stager.fill_with_templates, kickoff)
+    concepts = await asyncio.to_thread(db_manager.kickoff_concepts, kickoff.id)
+    # Build the message before flipping the status, so a failure leaves the kickoff staging
+    message = format_kickoff_reveal(kickoff, concepts)
+    if not await asyncio.to_thread(db_manager.set_kickoff_status, kickoff, KICKOFF_REVEALED):
+        return None
+
+    _cache_concepts(kickoff, concepts)
+    for concept in concepts:
+        try:
+            await asyncio.to_thread(
+                db_manager.record_concept, concept, kickoff.guild_id, kickoff.channel_id, kickoff.created_by
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record kickoff concept stats: {e}")
+
+    return message
+
+
+def _cache_concepts(kickoff: Kickoff, concepts: List[Concept]):
+    """Teams can re-open their concept with /generate-concept seed:<code>."""
+    for concept in concepts:
+        seed_cache.put(concept, kickoff.tone.value)
+
+
+class KickoffCog(commands.Cog):
+    """Commands for scheduling a jam start with pre-generated team concepts."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        # The reveal only reads staged concepts, so it runs on time even under load
+        job_queue.register(REVEAL_JOB, run_kickoff_reveal, uses_ai=False)
+
+    @app_commands.command(
+        name="schedule-kickoff",
+        description="Pre-generate one concept per team and reveal them all at a set time"
+    )
+    @app_commands.describe(
+        name="Name of the jam",
+        teams="Number of teams (one concept each)",
+        minutes_until_reveal="Minutes from now until the concepts are posted",
+        genre="Genre for every concept (optional)",
+        difficulty="Difficulty for every concept (defaults to the server preference)"
+    )
+    async def schedule_kickoff(
+        self,
+        interaction: discord.Interaction,
+        name: str,
+        teams: app_commands.Range[int, 1, MAX_KICKOFF_TEAMS],
+        minutes_until_reveal: app_commands.Range[int, 1, MAX_KICKOFF_LEAD_HOURS * 60],
+        genre: Optional[str] = None,
+        difficulty: Optional[Difficulty] = None
+    ):
+        """Schedule a kickoff in the current channel."""
+        if interaction.guild_id is None or not interaction.permissions.manage_guild:
+            await interaction.response.send_message(
+                "❌ You need the Manage Server permission to schedule a kickoff.", ephemeral=True
+            )
+            return
+
+        preferences = preference_store.resolve(interaction.user.id, interaction.guild_id)
+        kickoff = Kickoff(
+            guild_id=interaction.guild_id,
+            channel_id=interaction.channel_id,
+            name=name.strip()[:100],
+            teams=teams,
+            reveal_at=time.time() + minutes_until_reveal * 60,
+            created_by=interaction.user.id,
+            genre=(genre_index.lookup(genre) or genre.strip()[:50]) if genre else None,
+            difficulty=difficulty or preferences.difficulty,
+            tone=preferences.tone
+        )
+
+        if not await asyncio.to_thread(db_manager.create_kickoff, kickoff):
+            await interaction.response.send_message(
+                "❌ A kickoff is already scheduled in this channel. Cancel it with `/kickoff-status cancel:True`.",
+                ephemeral=True
+            )
+            return
+
+        await job_queue.enqueue(Job(
+            kind=REVEAL_JOB,
+            key=f"kickoff:{kickoff.id}",
+            guild_id=kickoff.guild_id,
+            channel_id=kickoff.channel_id,
+            payload={"kickoff_id": kickoff.id},
+            run_at=kickoff.reveal_at
+        ))
+        await interaction.response.send_message(embed=build_kickoff_embed(kickoff))
+
+    @schedule_kickoff.autocomplete("genre")
+    async def genre_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Suggest built-in and AI-learned genres matching what was typed."""
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in genre_index.complete(current)
+        ]
+
+    @app_commands.command(
+        name="kickoff-status",
+        description="Show how many concepts are ready for this channel's kickoff"
+    )
+    @app_commands.describe(cancel="Cancel the kickoff instead (requires Manage Server)")
+    async def kickoff_status(self, interaction: discord.Interaction, cancel: bool = False):
+        """Show or cancel the kickoff being staged in this channel."""
+        kickoff = await asyncio.to_thread(db_manager.staging_kickoff, interaction.channel_id)
+        if kickoff is None:
+            await interaction.response.send_message(NO_KICKOFF, ephemeral=True)
+            return
+
+        if not cancel:
+            await interaction.response.send_message(
+                embed=build_kickoff_embed(kickoff, "🗓️ Kickoff Status"), ephemeral=True
+            )
+            return
+
+        if not interaction.permissions.manage_guild:
+            await interaction.response.send_message(
+                "❌ You need the Manage Server permission to cancel a kickoff.", ephemeral=True
+            )
+            return
+        if not await asyncio.to_thread(db_manager.set_kickoff_status, kickoff, KICKOFF_CANCELLED):
+            await interaction.response.send_message(NO_KICKOFF, ephemeral=True)
+            return
+        await interaction.response.send_message(f"🛑 Kickoff **{kickoff.name}** cancelled.")
+
+
+async def setup(bot: commands.Bot):
+    """Setup function for loading the cog."""
+    await bot.add_cog(KickoffCog(bot))
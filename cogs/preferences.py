@@ -0,0 +1,138 @@
+"""Preference commands for the Game Jam Assistant bot."""
+
+import asyncio
+from dataclasses import replace
+from typing import Optional
+import discord
+from discord import app_commands
+from discord.ext import commands
+from database.models import Preferences
+from database.preferences import GUILD, USER, preference_store
+from generators.genre_index import genre_index
+from generators.models import Difficulty, Tone
+from config import MAX_FAVORITE_GENRES
+
+
+def _describe(preferences: Optional[Preferences]) -> str:
+    """One line per preference that is set."""
+    if preferences is None:
+        return "Nothing set"
+    lines = []
+    if preferences.tone:
+        lines.append(f"Tone: {preferences.tone.value.title()}")
+    if preferences.difficulty:
+        lines.append(f"Difficulty: {preferences.difficulty.value.title()}")
+    if preferences.favorite_genres:
+        lines.append(f"Favorite genres: {', '.join(preferences.favorite_genres)}")
+    return "\n".join(lines)
+
+
+class PreferencesCog(commands.Cog):
+    """Commands for per-user and per-server defaults."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(
+        name="preferences",
+        description="Show your and this server's preferred tone, difficulty and genres"
+    )
+    async def show_preferences(self, interaction: discord.Interaction):
+        """Show stored and effective preferences."""
+        user = await asyncio.to_thread(preference_store.get, USER, interaction.user.id)
+        guild = await asyncio.to_thread(preference_store.get, GUILD, interaction.guild_id)
+        resolved = preference_store.resolve(interaction.user.id, interaction.guild_id)
+
+        embed = discord.Embed(title="⚙️ Preferences", color=discord.Color.blurple())
+        embed.add_field(name="You", value=_describe(user), inline=True)
+        if interaction.guild_id is not None:
+            embed.add_field(name="This Server", value=_describe(guild), inline=True)
+        embed.add_field(
+            name="In Effect",
+            value=(
+                f"Tone: {resolved.tone.title()}\n"
+                f"Difficulty: {resolved.difficulty.value.title()}\n"
+                f"Genres: {', '.join(resolved.genres) or 'Any'}"
+            ),
+            inline=False
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(
+        name="set-preferences",
+        description="Set your (or this server's) preferred tone, difficulty and genres"
+    )
+    @app_commands.describe(
+        tone="Personality of AI responses",
+        difficulty="Default difficulty for /generate-concept",
+        favorite_genres=f"Comma-separated genres picked when no genre is given (up to {MAX_FAVORITE_GENRES})",
+        server="Set the defaults for the whole server (requires Manage Server)",
+        clear="Remove the stored preferences instead"
+    )
+    async def set_preferences(
+        self,
+        interaction: discord.Interaction,
+        tone: Optional[Tone] = None,
+        difficulty: Optional[Difficulty] = None,
+        favorite_genres: Optional[str] = None,
+        server: bool = False,
+        clear: bool = False
+    ):
+        """Update user or guild preferences."""
+        if server:
+            if interaction.guild_id is None:
+                await interaction.response.send_message(
+                    "❌ Server preferences can only be set inside a server.", ephemeral=True
+                )
+                return
+            if not interaction.permissions.manage_guild:
+                await interaction.response.send_message(
+                    "❌ You need the Manage Server permission to change server preferences.", ephemeral=True
+                )
+                return
+            scope, scope_id = GUILD, interaction.guild_id
+        else:
+            scope, scope_id = USER, interaction.user.id
+
+        stored = await asyncio.to_thread(preference_store.get, scope, scope_id)
+        # Edit a copy; the cached entry is only replaced once the write succeeds
+        current = replace(stored) if stored and not clear else Preferences(scope, scope_id)
+
+        if not clear:
+            if tone is not None:
+                current.tone = tone
+            if difficulty is not None:
+                current.difficulty = difficulty
+            if favorite_genres is not None:
+                genres, unknown = [], []
+                for name in favorite_genres.split(","):
+                    name = name.strip()
+                    if not name:
+                        continue
+                    canonical = genre_index.lookup(name)
+                    if canonical is None:
+                        unknown.append(name)
+                    elif canonical not in genres:
+                        genres.append(canonical)
+                if unknown:
+                    await interaction.response.send_message(
+                        f"❌ Unknown genre(s): {', '.join(unknown)}. "
+                        "Use the genre suggestions from `/generate-concept`.",
+                        ephemeral=True
+                    )
+                    return
+                current.favorite_genres = tuple(genres[:MAX_FAVORITE_GENRES])
+
+        await asyncio.to_thread(preference_store.set, current)
+
+        who = "Server" if scope == GUILD else "Your"
+        summary = _describe(None if current.is_empty else current)
+        await interaction.response.send_message(
+            f"✅ {who} preferences {'cleared' if clear else 'saved'}.\n{summary}",
+            ephemeral=True
+        )
+
+
+async def setup(bot: commands.Bot):
+    """Setup function for loading the cog."""
+    await bot.add_cog(PreferencesCog(bot))
@@ -11,12 +11,13 @@ class UtilityCog(commands.Cog):
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # Rendered once at startup; the help text never changes at runtime
+        self.help_text = format_help_message()
     
     @app_commands.command(name="help", description="Show available commands and usage information")
     async def help_command(self, interaction: discord.Interaction):
         """Display help message with all available commands."""
-        help_text = format_help_message()
-        await interaction.response.send_message(help_text)
+        await interaction.response.send_message(self.help_text)
 
 
 async def setup(bot: commands.Bot):
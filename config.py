@@ -1,37 +1,348 @@
 """Configuration constants and settings for the Game Jam Assistant bot."""
 
 import os
-from dotenv import load_dotenv
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Mapping, Optional
 
-# Load environment variables
-load_dotenv()
+try:
+    from dotenv import load_dotenv
+except ImportError:  # tools and worker environments without the bot's requirements
+    load_dotenv = None
 
-# Discord Configuration
+# Load environment variables (importing this module never fails on missing settings;
+# whatever needs a setting validates it when it is first used)
+if load_dotenv is not None:
+    load_dotenv()
+
+# Discord Configuration (only the bot and launcher need it; see require_discord_token)
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
-if not DISCORD_TOKEN:
-    raise ValueError("DISCORD_TOKEN must be set in .env file")
+
+
+def require_discord_token() -> str:
+    """
+    Return the Discord bot token.
+
+    Raises:
+        ValueError: If DISCORD_TOKEN is not set
+    """
+    if not DISCORD_TOKEN:
+        raise ValueError("DISCORD_TOKEN must be set in .env file")
+    return DISCORD_TOKEN
 
 # Ollama Configuration
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2:3b")
+OLLAMA_TRACE_PATH = os.getenv("OLLAMA_TRACE_PATH") or None  # record every API call as JSONL
+OLLAMA_REPLAY_PATH = os.getenv("OLLAMA_REPLAY_PATH") or None  # serve responses from a trace instead
+OLLAMA_REPLAY_SPEED = 1.0  # 0 = no delay
 
 # Bot Configuration
 BOT_PREFIX = os.getenv("BOT_PREFIX", "!")
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC", "false").lower() == "true"  # sync even if unchanged
 DEFAULT_TONE = os.getenv("DEFAULT_TONE", "encouraging")
 
 # Database Configuration (Phase 3)
 DATABASE_PATH = os.getenv("DATABASE_PATH", "./data/jam_assistant.db")
 
+# User and Guild Preferences
+PREFERENCE_CACHE_SIZE = 10000
+PREFERENCE_REFRESH_INTERVAL = 300  # seconds; cached entries are re-read in the background after this
+MAX_FAVORITE_GENRES = 5
+
+# Shutdown and Warm Restart
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", "./data")  # caches saved on shutdown, restored on start
+SHUTDOWN_DRAIN_TIMEOUT = 20  # seconds to wait for in-flight generations
+
+
+# Sharding Configuration (launcher.py sets SHARD_COUNT, SHARD_IDS and
+# SHARD_PROCESS_INDEX per process; they are read by shard_settings())
+ENABLE_SHARDING = os.getenv("ENABLE_SHARDING", "false").lower() == "true"
+
 # Generation Settings
 MIN_CONSTRAINTS = 3
 MAX_CONSTRAINTS = 7
+SEED_CACHE_SIZE = 5000  # concepts kept by shareable code
+MAX_LEARNED_GENRES = 5000  # genres remembered from AI output for autocomplete
+WARM_POOL_SIZE = 2  # pre-generated AI concepts per (genre, difficulty, tone); 0 disables
+WARM_POOL_MAX_KEYS = 12
+WARM_POOL_INTERVAL = 10.0  # seconds between refill attempts
 DEFAULT_JAM_DURATION = 48  # hours
+CONCEPT_SESSION_SIZE = 10000  # channels whose last concept is remembered for /generate-constraint
+CONCEPT_SESSION_TTL = 12 * 3600  # seconds
+CONCEPT_SESSION_PERSIST = os.getenv("CONCEPT_SESSION_PERSIST", "true").lower() == "true"  # fall back to the database
+CONSTRAINT_CACHE_SIZE = 2000  # concepts with cached AI constraints
+CONSTRAINTS_PER_CONCEPT = 5
 
 # AI Settings
-AI_TIMEOUT = 30  # seconds
+AI_TIMEOUT = 30  # seconds; default for tasks without their own timeout
 AI_MAX_RETRIES = 3
+# Per-task request timeouts in seconds; override one with AI_TIMEOUT_<TASK> (e.g. AI_TIMEOUT_SUMMARY=120)
+AI_TASK_TIMEOUTS = {
+    "concept": 30,
+    "constraint": 15,
+    "commentary": 20,
+    "vibe_check": 20,
+    "summary": 90,  # long output, runs as a background job
+}
 ENABLE_AI_FALLBACK = True
 
+# Per-task Ollama options (num_predict caps generated tokens per response)
+GENERATION_OPTIONS = {
+    "concept": {
+        "num_predict": 160,  # five short fields
+        "temperature": 0.9,
+        "stop": ["\n\n\n", "\nNote:", "\nExplanation:"],
+    },
+    "constraint": {
+        "num_predict": 80,  # 1-2 sentences
+        "temperature": 0.8,
+        "stop": ["\n\n"],
+    },
+    "commentary": {
+        "num_predict": 120,  # 2-3 sentences
+        "temperature": 0.8,
+        "stop": ["\n\n"],
+    },
+    "vibe_check": {
+        "num_predict": 140,  # 2-4 sentences
+        "temperature": 0.8,
+        "stop": ["\n\n"],
+    },
+    "summary": {
+        "num_predict": 320,  # one or two short paragraphs
+        "temperature": 0.7,
+        "stop": ["\n\n\n"],
+    },
+}
+TOKEN_USAGE_LOG_INTERVAL = 50  # log average token usage every N generations
+
+# Generation Workers (defaults for GenerationSettings)
+GENERATION_WORKERS = 0  # 0 = threads in the bot process
+GENERATION_THREADS = 4
+
+# Rate Limiting (token buckets; refill rates are tokens per second)
+RATE_LIMIT_USER_CAPACITY = 6
+RATE_LIMIT_USER_REFILL = 0.05  # 3 tokens per minute
+RATE_LIMIT_GUILD_CAPACITY = 30
+RATE_LIMIT_GUILD_REFILL = 0.25  # 15 tokens per minute
+RATE_LIMIT_GLOBAL_CAPACITY = 60
+RATE_LIMIT_GLOBAL_REFILL = 1.0  # 60 tokens per minute
+RATE_LIMIT_SWEEP_INTERVAL = 60  # seconds between idle bucket sweeps
+RATE_LIMIT_MESSAGE_CHARS_PER_TOKEN = 200  # extra cost for long user messages
+
+# Token cost per command, roughly proportional to expected generation size
+COMMAND_COSTS = {
+    "generate-concept": 3,
+    "generate-constraint": 1,
+    "vibe-check": 2,
+    "update-progress": 2,
+}
+
+# Load Shedding (route AI commands to templates while Ollama is saturated)
+LOAD_SHED_LATENCY_TARGET = 10.0  # seconds; average generation time that counts as full load
+LOAD_SHED_QUEUE_LIMIT = 2  # queued jobs per worker that count as full load
+LOAD_SHED_HIGH_WATERMARK = 1.0  # shed more above this load
+LOAD_SHED_LOW_WATERMARK = 0.6  # shed less below this load (in between: hold)
+LOAD_SHED_STEP_UP = 0.2  # shed fraction added per interval under pressure
+LOAD_SHED_STEP_DOWN = 0.05  # shed fraction removed per interval once recovered
+LOAD_SHED_INTERVAL = 1.0  # seconds between controller updates
+# Shed chance per unit of shed fraction; commands that depend on AI most are
+# shed last. Weights are at least 1.0, so once the shed fraction reaches 1.0
+# under sustained overload every command goes to templates.
+LOAD_SHED_WEIGHTS = {
+    "generate-concept": 1.0,
+    "vibe-check": 2.0,
+    "update-progress": 2.5,
+    "generate-constraint": 3.0,
+}
+
+# Outbound Message Queue (Discord allows ~5 messages per 5s per channel, 50 requests/s globally)
+MESSAGE_QUEUE_WORKERS = 4
+CHANNEL_MESSAGE_BURST = 5
+CHANNEL_MESSAGE_RATE = 1.0  # messages per second
+GLOBAL_MESSAGE_BURST = 40
+GLOBAL_MESSAGE_RATE = 40.0  # messages per second, kept below Discord's global limit
+
+# Background Jobs (post-jam summaries and check-ins, stored in the database)
+JOB_WORKERS = 2
+JOB_POLL_INTERVAL = 5.0  # seconds between checks for due jobs
+JOB_LEASE = 300  # seconds a claimed job is reserved before another process may take it over
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_DELAY = 30  # seconds before the first retry; doubles with every attempt
+JOB_RETRY_MAX_DELAY = 3600
+JOB_RETENTION_DAYS = 7  # delivered jobs are deleted after this
+JAM_SUMMARY_UPDATES = 20  # most recent progress updates fed into the post-jam summary
+
+# Jam Kickoffs (per-team concepts generated ahead of a scheduled reveal)
+MAX_KICKOFF_TEAMS = 50
+MAX_KICKOFF_LEAD_HOURS = 7 * 24  # how far ahead a reveal may be scheduled
+KICKOFF_STAGE_INTERVAL = 3.0  # seconds between staging attempts while the generation pool is idle
+KICKOFF_TEMPLATE_CUTOFF = 600  # seconds before the reveal when missing concepts are filled from templates
+KICKOFF_MAX_FIELD_LENGTH = 200  # AI concepts with longer fields are rejected
+
 # Check-in Intervals (Phase 3)
 CHECKIN_INTERVALS = [6, 12, 24, 36, 48]  # hours
 
+
+def _env_number(name: str, default: float, kind=float):
+    """Read a numeric environment variable, naming it in the error if it is malformed."""
+    value = os.getenv(name)
+    if value is None:
+        return kind(default)
+    try:
+        return kind(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+
+
+@dataclass(frozen=True)
+class OllamaSettings:
+    """
+    Everything one OllamaClient needs, validated when the client is built.
+
+    OllamaSettings.from_env() reads the environment (with the constants above
+    as defaults); use dataclasses.replace() to override single fields, e.g.
+    a benchmark pointing at a replay trace with shorter timeouts.
+    """
+
+    base_url: str = OLLAMA_BASE_URL
+    model: str = OLLAMA_MODEL
+    timeout: float = AI_TIMEOUT
+    task_timeouts: Mapping[str, float] = field(default_factory=lambda: dict(AI_TASK_TIMEOUTS))
+    max_retries: int = AI_MAX_RETRIES
+    generation_options: Mapping[str, Dict[str, Any]] = field(default_factory=lambda: GENERATION_OPTIONS)
+    trace_path: Optional[str] = OLLAMA_TRACE_PATH
+    replay_path: Optional[str] = OLLAMA_REPLAY_PATH
+    replay_speed: float = OLLAMA_REPLAY_SPEED
+
+    def __post_init__(self):
+        if not self.base_url:
+            raise ValueError("OLLAMA_BASE_URL must not be empty")
+        if not self.model:
+            raise ValueError("OLLAMA_MODEL must not be empty")
+        if self.max_retries < 1:
+            raise ValueError("AI_MAX_RETRIES must be at least 1")
+        if self.replay_speed < 0:
+            raise ValueError("OLLAMA_REPLAY_SPEED must not be negative")
+        for task, timeout in {"default": self.timeout, **self.task_timeouts}.items():
+            if timeout <= 0:
+                raise ValueError(f"AI timeout for {task} must be positive, got {timeout}")
+
+    @classmethod
+    def from_env(cls, **overrides) -> "OllamaSettings":
+        """
+        Build settings from the environment.
+
+        Args:
+            **overrides: Fields to set explicitly instead
+
+        Raises:
+            ValueError: If a value is missing, malformed or out of range
+        """
+        settings = cls(
+            timeout=_env_number("AI_TIMEOUT", AI_TIMEOUT),
+            task_timeouts={
+                task: _env_number(f"AI_TIMEOUT_{task.upper()}", default)
+                for task, default in AI_TASK_TIMEOUTS.items()
+            },
+            max_retries=_env_number("AI_MAX_RETRIES", AI_MAX_RETRIES, int),
+            replay_speed=_env_number("OLLAMA_REPLAY_SPEED", OLLAMA_REPLAY_SPEED)
+        )
+        return replace(settings, **overrides) if overrides else settings
+
+    def timeout_for(self, task: Optional[str]) -> float:
+        """Request timeout for a task (the default timeout for unknown tasks)."""
+        return self.task_timeouts.get(task, self.timeout)
+
+    def options_for(self, task: Optional[str]) -> Dict[str, Any]:
+        """A copy of the task's default Ollama options."""
+        return dict(self.generation_options.get(task, {}))
+
+
+@dataclass(frozen=True)
+class GenerationSettings:
+    """Size of the generation worker pool (see generators/worker_pool.py)."""
+
+    workers: int = GENERATION_WORKERS
+    threads: int = GENERATION_THREADS
+
+    def __post_init__(self):
+        if self.workers < 0:
+            raise ValueError("GENERATION_WORKERS must not be negative")
+        if self.threads < 1:
+            raise ValueError("GENERATION_THREADS must be at least 1")
+
+    @classmethod
+    def from_env(cls, **overrides) -> "GenerationSettings":
+        """
+        Build settings from the environment.
+
+        Args:
+            **overrides: Fields to set explicitly instead
+
+        Raises:
+            ValueError: If a value is malformed or out of range
+        """
+        settings = cls(
+            workers=_env_number("GENERATION_WORKERS", GENERATION_WORKERS, int),
+            threads=_env_number("GENERATION_THREADS", GENERATION_THREADS, int)
+        )
+        return replace(settings, **overrides) if overrides else settings
+
+
+def _parse_shard_ids(value: str) -> Optional[List[int]]:
+    """Parse "0,1,2" or "0-3" style shard ID lists."""
+    shard_ids = []
+    try:
+        for part in value.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "-" in part:
+                start, end = part.split("-", 1)
+                shard_ids.extend(range(int(start), int(end) + 1))
+            else:
+                shard_ids.append(int(part))
+    except ValueError:
+        raise ValueError(f"SHARD_IDS must look like \"0,1,2\" or \"0-3\", got {value!r}") from None
+    return shard_ids or None
+
+
+@dataclass(frozen=True)
+class ShardSettings:
+    """The gateway shards run by this process."""
+
+    count: Optional[int] = None  # None = ask Discord
+    ids: Optional[List[int]] = None  # None = all shards
+    process_index: int = 0
+
+    @property
+    def partial(self) -> bool:
+        """Whether this process serves only some of the bot's shards."""
+        return bool(self.count and self.ids)
+
+    @classmethod
+    def from_env(cls) -> "ShardSettings":
+        """
+        Build settings from the environment.
+
+        Raises:
+            ValueError: If a value is malformed
+        """
+        return cls(
+            count=_env_number("SHARD_COUNT", 0, int) or None,
+            ids=_parse_shard_ids(os.getenv("SHARD_IDS", "")),
+            process_index=_env_number("SHARD_PROCESS_INDEX", 0, int)
+        )
+
+
+# Read on first use
+_shard_settings: Optional[ShardSettings] = None
+
+
+def shard_settings() -> ShardSettings:
+    """Return this process's shard settings, reading the environment on first use."""
+    global _shard_settings
+    if _shard_settings is None:
+        _shard_settings = ShardSettings.from_env()
+    return _shard_settings
@@ -0,0 +1,89 @@
+"""Cross-jam statistics read from the incremental counters in jam_counters."""
+
+import json
+import time
+from typing import Any, Dict, Optional
+from database.db_manager import DatabaseManager, GLOBAL_SCOPE, db_manager, guild_scope
+
+SCALAR_METRICS = (
+    "jams_started",
+    "jams_completed",
+    "jams_completed_on_time",
+    "completed_jam_hours",
+    "completed_jam_updates",
+    "updates",
+    "updates_by_hour",
+    "concepts",
+    "constraints",
+)
+
+TOP_LIMIT = 5
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    return round(numerator / denominator, 3) if denominator else None
+
+
+def jam_stats(guild_id: Optional[int] = None, db: DatabaseManager = db_manager) -> Dict[str, Any]:
+    """
+    Summarize jams, progress updates and generations.
+
+    Every figure comes from running counters, so the cost does not grow
+    with the number of jams, updates or concepts stored.
+
+    Args:
+        guild_id: Guild to summarize (None = every guild)
+        db: Database to read from
+
+    Returns:
+        Stats dictionary (ratios are None until there is data for them)
+    """
+    scope = GLOBAL_SCOPE if guild_id is None else guild_scope(guild_id)
+    counters = db.get_counters(scope, SCALAR_METRICS)
+
+    def total(metric: str, key: str = "") -> float:
+        return counters.get(metric, {}).get(key, 0)
+
+    started = total("jams_started")
+    completed = total("jams_completed")
+    concepts_ai = total("concepts", "ai")
+    concepts_template = total("concepts", "template")
+    hours = sorted(
+        ((int(hour), int(count)) for hour, count in counters.get("updates_by_hour", {}).items()),
+        key=lambda item: item[1],
+        reverse=True
+    )
+
+    return {
+        "scope": scope,
+        "jams_started": int(started),
+        "jams_completed": int(completed),
+        "completion_rate": _ratio(completed, started),
+        "on_time_rate": _ratio(total("jams_completed_on_time"), completed),
+        "progress_updates": int(total("updates")),
+        "updates_per_jam_hour": _ratio(total("completed_jam_updates"), total("completed_jam_hours")),
+        "busiest_jam_hours": hours[:TOP_LIMIT],
+        "concepts_ai": int(concepts_ai),
+        "concepts_template": int(concepts_template),
+        "ai_share": _ratio(concepts_ai, concepts_ai + concepts_template),
+        "constraints_ai": int(total("constraints", "ai")),
+        "constraints_template": int(total("constraints", "template")),
+        "top_genres": [(key, int(value)) for key, value in db.top_counters(scope, "genre", TOP_LIMIT)],
+        "top_constraints": [(key, int(value)) for key, value in db.top_counters(scope, "constraint", TOP_LIMIT)],
+    }
+
+
+def export_jam_stats(guild_id: Optional[int] = None, db: DatabaseManager = db_manager) -> str:
+    """
+    Export jam stats as JSON (e.g. for organizer spreadsheets or dashboards).
+
+    Args:
+        guild_id: Guild to export (None = every guild)
+        db: Database to read from
+
+    Returns:
+        Indented JSON document
+    """
+    stats = jam_stats(guild_id, db)
+    stats["exported_at"] = round(time.time(), 3)
+    return json.dumps(stats, indent=2, ensure_ascii=False)
@@ -0,0 +1,1122 @@
+"""SQLite database operations shared by every bot process."""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from config import DATABASE_PATH
+from database.models import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_PENDING,
+    JOB_RUNNING,
+    Job,
+    KICKOFF_STAGING,
+    JamSession,
+    Kickoff,
+    Preferences,
+    ProgressUpdate,
+)
+from generators.models import Concept
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bot_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+-- Never written to; one-off work is deduplicated by the jobs table's idempotency keys
+DROP TABLE IF EXISTS event_claims;
+
+CREATE TABLE IF NOT EXISTS jams (
+    id TEXT PRIMARY KEY,
+    guild_id INTEGER,
+    channel_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    duration_hours INTEGER NOT NULL,
+    created_by INTEGER NOT NULL,
+    start_time REAL NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    completed_time REAL,
+    update_count INTEGER NOT NULL DEFAULT 0
+);
+-- At most one running jam per channel
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jams_active_channel ON jams (channel_id) WHERE completed = 0;
+CREATE INDEX IF NOT EXISTS idx_jams_guild_start ON jams (guild_id, start_time);
+CREATE INDEX IF NOT EXISTS idx_jams_completed ON jams (completed_time) WHERE completed = 1;
+
+CREATE TABLE IF NOT EXISTS progress_updates (
+    id TEXT PRIMARY KEY,
+    jam_id TEXT NOT NULL REFERENCES jams (id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    hours_elapsed REAL NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_progress_updates_jam ON progress_updates (jam_id, timestamp);
+
+CREATE TABLE IF NOT EXISTS generated_concepts (
+    id INTEGER PRIMARY KEY,
+    guild_id INTEGER,
+    channel_id INTEGER,
+    user_id INTEGER,
+    created_at REAL NOT NULL,
+    code TEXT,
+    is_ai INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_generated_concepts_guild ON generated_concepts (guild_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_generated_concepts_created ON generated_concepts (created_at);
+CREATE INDEX IF NOT EXISTS idx_generated_concepts_channel ON generated_concepts (channel_id, created_at);
+
+-- Rows moved out by `jam_history.py archive`; imports skip them so they are
+-- not brought back (and counted) a second time
+CREATE TABLE IF NOT EXISTS archived_jams (
+    id TEXT PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS archived_concepts (
+    channel_id INTEGER,
+    user_id INTEGER,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_archived_concepts ON archived_concepts (created_at, channel_id);
+
+-- Running totals updated alongside every write, so stats never scan history
+CREATE TABLE IF NOT EXISTS jam_counters (
+    scope TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    key TEXT NOT NULL DEFAULT '',
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, metric, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_jam_counters_top ON jam_counters (scope, metric, value);
+
+CREATE TABLE IF NOT EXISTS preferences (
+    scope TEXT NOT NULL,
+    scope_id INTEGER NOT NULL,
+    tone TEXT,
+    difficulty TEXT,
+    favorite_genres TEXT NOT NULL DEFAULT '[]',
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (scope, scope_id)
+);
+
+-- Scheduled jam starts and the concepts staged for each team
+CREATE TABLE IF NOT EXISTS kickoffs (
+    id TEXT PRIMARY KEY,
+    guild_id INTEGER,
+    channel_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    teams INTEGER NOT NULL,
+    reveal_at REAL NOT NULL,
+    created_by INTEGER NOT NULL,
+    genre TEXT,
+    difficulty TEXT NOT NULL,
+    tone TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'staging'
+);
+CREATE INDEX IF NOT EXISTS idx_kickoffs_staging ON kickoffs (reveal_at) WHERE status = 'staging';
+CREATE INDEX IF NOT EXISTS idx_kickoffs_channel ON kickoffs (channel_id, status);
+
+CREATE TABLE IF NOT EXISTS kickoff_concepts (
+    kickoff_id TEXT NOT NULL REFERENCES kickoffs (id) ON DELETE CASCADE,
+    team INTEGER NOT NULL,
+    signature TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kickoff_id, team),
+    UNIQUE (kickoff_id, signature)
+) WITHOUT ROWID;
+
+-- Durable background jobs; a running job whose lease expired is retried
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL UNIQUE,
+    guild_id INTEGER,
+    channel_id INTEGER NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_at REAL NOT NULL,
+    locked_by TEXT,
+    locked_until REAL,
+    result TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs (status, run_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_guild ON jobs (guild_id, status);
+
+-- Per-user rate limit buckets shared by every shard process (see utils/rate_limiter.py)
+CREATE TABLE IF NOT EXISTS rate_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Counter scopes: every event counts globally and for its guild
+GLOBAL_SCOPE = "global"
+
+# Longest constraint text kept as a counter key
+MAX_COUNTER_KEY_LENGTH = 200
+
+
+# Kickoffs with the number of concepts staged so far
+_KICKOFF_SELECT = (
+    "SELECT k.*, (SELECT COUNT(*) FROM kickoff_concepts c WHERE c.kickoff_id = k.id) AS staged "
+    "FROM kickoffs k "
+)
+
+
+def guild_scope(guild_id: int) -> str:
+    """Counter scope for one guild."""
+    return f"guild:{guild_id}"
+
+
+def _scopes(guild_id: Optional[int]) -> Tuple[str, ...]:
+    if guild_id is None:
+        return (GLOBAL_SCOPE,)
+    return (GLOBAL_SCOPE, guild_scope(guild_id))
+
+
+class DatabaseManager:
+    """
+    Thin wrapper around a SQLite connection.
+
+    The database runs in WAL mode with a busy timeout so several bot processes
+    (one per shard range, see launcher.py) can share the same file. Anything
+    that must happen exactly once across processes is a job with an
+    idempotency key (see enqueue_job() and database/job_queue.py).
+    """
+
+    def __init__(self, path: str = DATABASE_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the connection and create the schema on first use."""
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    self._conn = self._connect()
+        return self._conn
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+        logger.info(f"Opened database at {self.path}")
+        return conn
+
+    def get_state(self, key: str) -> Optional[str]:
+        """
+        Read a value from the bot_state key/value table.
+
+        Args:
+            key: State key
+
+        Returns:
+            Stored value, or None if unset
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value FROM bot_state WHERE key = ?", (key,)
+            ).fetchone()
+        return row["value"] if row else None
+
+    def set_state(self, key: str, value: str):
+        """
+        Write a value to the bot_state key/value table.
+
+        Args:
+            key: State key
+            value: Value to store
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO bot_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+
+    def _bump(
+        self,
+        guild_id: Optional[int],
+        metric: str,
+        key: str = "",
+        amount: float = 1
+    ):
+        """Add to a counter in the global and guild scopes (call inside a transaction)."""
+        self.conn.executemany(
+            "INSERT INTO jam_counters (scope, metric, key, value) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(scope, metric, key) DO UPDATE SET value = value + excluded.value",
+            [(scope, metric, key[:MAX_COUNTER_KEY_LENGTH], amount) for scope in _scopes(guild_id)]
+        )
+
+    # Counter updates shared by the live write path and history imports
+    # (call inside a transaction)
+
+    def _count_jam_started(self, jam: JamSession):
+        self._bump(jam.guild_id, "jams_started")
+
+    def _count_jam_completed(self, jam: JamSession):
+        self._bump(jam.guild_id, "jams_completed")
+        if jam.completed_time <= jam.end_time:
+            self._bump(jam.guild_id, "jams_completed_on_time")
+        self._bump(jam.guild_id, "completed_jam_hours", amount=jam.hours_elapsed(jam.completed_time))
+        self._bump(jam.guild_id, "completed_jam_updates", amount=jam.update_count)
+
+    def _count_update(self, guild_id: Optional[int], update: ProgressUpdate):
+        self._bump(guild_id, "updates")
+        self._bump(guild_id, "updates_by_hour", str(int(update.hours_elapsed)))
+
+    def _count_concept(self, guild_id: Optional[int], concept: Concept):
+        self._bump(guild_id, "concepts", "ai" if concept.is_ai else "template")
+        if concept.genre:
+            self._bump(guild_id, "genre", concept.genre)
+        if concept.constraint:
+            self._bump(guild_id, "constraint", concept.constraint)
+
+    def start_jam(self, jam: JamSession) -> bool:
+        """
+        Store a new jam.
+
+        Args:
+            jam: Jam to start
+
+        Returns:
+            True if started, False if the channel already has a running jam
+        """
+        try:
+            with self._lock, self.conn:
+                self.conn.execute(
+                    "INSERT INTO jams (id, guild_id, channel_id, name, duration_hours, created_by, start_time) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (jam.id, jam.guild_id, jam.channel_id, jam.name, jam.duration_hours,
+                     jam.created_by, jam.start_time)
+                )
+                self._count_jam_started(jam)
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def get_active_jam(self, channel_id: int) -> Optional[JamSession]:
+        """
+        Look up the running jam in a channel.
+
+        Args:
+            channel_id: Discord channel ID
+
+        Returns:
+            The running jam, or None
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT * FROM jams WHERE channel_id = ? AND completed = 0", (channel_id,)
+            ).fetchone()
+        return JamSession.from_row(row) if row else None
+
+    def get_jam(self, jam_id: str) -> Optional[JamSession]:
+        """
+        Look up a jam by ID, running or completed.
+
+        Args:
+            jam_id: Jam ID
+
+        Returns:
+            The jam, or None
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM jams WHERE id = ?", (jam_id,)).fetchone()
+        return JamSession.from_row(row) if row else None
+
+    def add_progress_update(self, jam: JamSession, update: ProgressUpdate):
+        """
+        Store a progress update and bump the jam's update count.
+
+        Args:
+            jam: Jam the update belongs to (its update_count is incremented)
+            update: The update to store
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO progress_updates (id, jam_id, user_id, message, hours_elapsed, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (update.id, update.jam_id, update.user_id, update.message,
+                 update.hours_elapsed, update.timestamp)
+            )
+            self.conn.execute(
+                "UPDATE jams SET update_count = update_count + 1 WHERE id = ?", (jam.id,)
+            )
+            self._count_update(jam.guild_id, update)
+        jam.update_count += 1
+
+    def recent_updates(self, jam_id: str, limit: int = 5) -> List[ProgressUpdate]:
+        """
+        Fetch the latest progress updates for a jam.
+
+        Args:
+            jam_id: Jam ID
+            limit: Maximum number of updates
+
+        Returns:
+            Updates, oldest first
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM progress_updates WHERE jam_id = ? ORDER BY timestamp DESC LIMIT ?",
+                (jam_id, limit)
+            ).fetchall()
+        return [ProgressUpdate.from_row(row) for row in reversed(rows)]
+
+    def complete_jam(self, jam: JamSession) -> bool:
+        """
+        Mark a jam as completed.
+
+        Args:
+            jam: Running jam (completed and completed_time are set on success)
+
+        Returns:
+            True if this call completed the jam, False if it was already completed
+        """
+        now = time.time()
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE jams SET completed = 1, completed_time = ? WHERE id = ? AND completed = 0",
+                (now, jam.id)
+            )
+            if cursor.rowcount != 1:
+                return False
+            jam.completed = True
+            jam.completed_time = now
+            self._count_jam_completed(jam)
+        return True
+
+    def record_concept(
+        self,
+        concept: Concept,
+        guild_id: Optional[int],
+        channel_id: Optional[int],
+        user_id: Optional[int]
+    ):
+        """
+        Store a generated concept and count its genre, constraint and source.
+
+        Args:
+            concept: The concept shown to the user
+            guild_id: Guild it was generated in (None in DMs)
+            channel_id: Channel it was generated in
+            user_id: User who requested it
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO generated_concepts (guild_id, channel_id, user_id, created_at, code, is_ai, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (guild_id, channel_id, user_id, time.time(), concept.code,
+                 int(concept.is_ai), concept.to_json())
+            )
+            self._count_concept(guild_id, concept)
+
+    def latest_concept(self, channel_id: int, since: float = 0.0) -> Optional[Concept]:
+        """
+        Most recent concept generated in a channel.
+
+        Args:
+            channel_id: Discord channel ID
+            since: Ignore concepts created before this Unix timestamp
+
+        Returns:
+            The concept, or None if there is none (or it cannot be decoded)
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data FROM generated_concepts WHERE channel_id = ? AND created_at >= ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (channel_id, since)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return Concept.from_json(row["data"])
+        except (TypeError, ValueError):
+            return None
+
+    def record_constraint(self, constraint: str, guild_id: Optional[int], is_ai: bool):
+        """
+        Count an additional constraint rolled with /generate-constraint.
+
+        Args:
+            constraint: Constraint text
+            guild_id: Guild it was generated in (None in DMs)
+            is_ai: Whether it was requested from the AI generator
+        """
+        with self._lock, self.conn:
+            self._bump(guild_id, "constraints", "ai" if is_ai else "template")
+            self._bump(guild_id, "constraint", constraint)
+
+    def import_jams(self, jams: Iterable[JamSession]) -> int:
+        """
+        Store exported jams that are not in the database yet, counting them in the stats.
+
+        Args:
+            jams: Jams with their original IDs
+
+        Returns:
+            Number of jams inserted (existing IDs, archived jams and conflicting
+            running jams are skipped)
+        """
+        inserted = 0
+        with self._lock, self.conn:
+            for jam in jams:
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO jams (id, guild_id, channel_id, name, duration_hours, created_by, "
+                    "start_time, completed, completed_time, update_count) "
+                    "SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ? "
+                    "WHERE NOT EXISTS (SELECT 1 FROM archived_jams WHERE id = ?)",
+                    (jam.id, jam.guild_id, jam.channel_id, jam.name, jam.duration_hours, jam.created_by,
+                     jam.start_time, int(jam.completed), jam.completed_time, jam.update_count,
+                     jam.id)
+                )
+                if cursor.rowcount != 1:
+                    continue
+                inserted += 1
+                self._count_jam_started(jam)
+                if jam.completed and jam.completed_time is not None:
+                    self._count_jam_completed(jam)
+        return inserted
+
+    def import_updates(self, updates: Iterable[ProgressUpdate]) -> int:
+        """
+        Store exported progress updates that are not in the database yet.
+
+        The jam's update_count is left alone: imported jams carry their own.
+
+        Args:
+            updates: Updates with their original IDs
+
+        Returns:
+            Number of updates inserted (existing IDs and updates of unknown jams are skipped)
+        """
+        inserted = 0
+        with self._lock, self.conn:
+            for update in updates:
+                jam = self.conn.execute(
+                    "SELECT guild_id FROM jams WHERE id = ?", (update.jam_id,)
+                ).fetchone()
+                if jam is None:
+                    continue
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO progress_updates (id, jam_id, user_id, message, hours_elapsed, timestamp) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (update.id, update.jam_id, update.user_id, update.message,
+                     update.hours_elapsed, update.timestamp)
+                )
+                if cursor.rowcount == 1:
+                    inserted += 1
+                    self._count_update(jam["guild_id"], update)
+        return inserted
+
+    def import_concepts(self, rows: Iterable[Tuple]) -> int:
+        """
+        Store exported generated_concepts rows under new IDs.
+
+        Concept IDs are per-database integers, so they are reassigned; a row
+        identical to a stored one (same channel, user, time and concept) or
+        to an archived one (same channel, user and time) is skipped instead,
+        which keeps re-imports harmless.
+
+        Args:
+            rows: (guild_id, channel_id, user_id, created_at, code, is_ai, data) tuples
+
+        Returns:
+            Number of concepts inserted
+        """
+        inserted = 0
+        with self._lock, self.conn:
+            for guild_id, channel_id, user_id, created_at, code, is_ai, data in rows:
+                try:
+                    concept = Concept.from_json(data)
+                except (ValueError, TypeError, KeyError):
+                    continue
+                cursor = self.conn.execute(
+                    "INSERT INTO generated_concepts (guild_id, channel_id, user_id, created_at, code, is_ai, data) "
+                    "SELECT ?, ?, ?, ?, ?, ?, ? WHERE NOT EXISTS ("
+                    "SELECT 1 FROM generated_concepts WHERE channel_id IS ? AND created_at = ? "
+                    "AND guild_id IS ? AND user_id IS ? AND data = ?) AND NOT EXISTS ("
+                    "SELECT 1 FROM archived_concepts WHERE created_at = ? AND channel_id IS ? AND user_id IS ?)",
+                    (guild_id, channel_id, user_id, created_at, code, is_ai, data,
+                     channel_id, created_at, guild_id, user_id, data,
+                     created_at, channel_id, user_id)
+                )
+                if cursor.rowcount == 1:
+                    inserted += 1
+                    self._count_concept(guild_id, concept)
+        return inserted
+
+    def get_counters(self, scope: str, metrics: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Read every key of some counter metrics.
+
+        Args:
+            scope: GLOBAL_SCOPE or guild_scope(guild_id)
+            metrics: Metric names
+
+        Returns:
+            {metric: {key: value}} (metrics without data are omitted)
+        """
+        metrics = list(metrics)
+        placeholders = ", ".join("?" * len(metrics))
+        counters: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT metric, key, value FROM jam_counters WHERE scope = ? AND metric IN ({placeholders})",
+                (scope, *metrics)
+            ).fetchall()
+        for row in rows:
+            counters.setdefault(row["metric"], {})[row["key"]] = row["value"]
+        return counters
+
+    def top_counters(self, scope: str, metric: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Highest counters of one metric (e.g. most rolled genres).
+
+        Args:
+            scope: GLOBAL_SCOPE or guild_scope(guild_id)
+            metric: Metric name
+            limit: Number of keys to return
+
+        Returns:
+            (key, value) pairs, highest first
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT key, value FROM jam_counters WHERE scope = ? AND metric = ? "
+                "ORDER BY value DESC LIMIT ?",
+                (scope, metric, limit)
+            ).fetchall()
+        return [(row["key"], row["value"]) for row in rows]
+
+    def get_preferences(self, scope: str, scope_id: int) -> Optional[Preferences]:
+        """
+        Read the preferences of a user or guild.
+
+        Args:
+            scope: "user" or "guild"
+            scope_id: Discord user or guild ID
+
+        Returns:
+            Stored preferences, or None if none were set
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT * FROM preferences WHERE scope = ? AND scope_id = ?", (scope, scope_id)
+            ).fetchone()
+        return Preferences.from_row(row) if row else None
+
+    def set_preferences(self, preferences: Preferences):
+        """
+        Store (or clear, if empty) the preferences of a user or guild.
+
+        Args:
+            preferences: Preferences to store
+        """
+        with self._lock, self.conn:
+            if preferences.is_empty:
+                self.conn.execute(
+                    "DELETE FROM preferences WHERE scope = ? AND scope_id = ?",
+                    (preferences.scope, preferences.scope_id)
+                )
+                return
+            self.conn.execute(
+                "INSERT INTO preferences (scope, scope_id, tone, difficulty, favorite_genres, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(scope, scope_id) DO UPDATE SET tone = excluded.tone, "
+                "difficulty = excluded.difficulty, favorite_genres = excluded.favorite_genres, "
+                "updated_at = excluded.updated_at",
+                (
+                    preferences.scope,
+                    preferences.scope_id,
+                    preferences.tone.value if preferences.tone else None,
+                    preferences.difficulty.value if preferences.difficulty else None,
+                    json.dumps(list(preferences.favorite_genres), ensure_ascii=False),
+                    preferences.updated_at or time.time(),
+                )
+            )
+
+    def recent_preferences(self, scope: str, limit: int) -> List[Preferences]:
+        """
+        Most recently updated preferences of one scope (used to warm caches).
+
+        Args:
+            scope: "user" or "guild"
+            limit: Maximum number of rows
+
+        Returns:
+            Preferences, newest first
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM preferences WHERE scope = ? ORDER BY updated_at DESC LIMIT ?",
+                (scope, limit)
+            ).fetchall()
+        return [Preferences.from_row(row) for row in rows]
+
+    def create_kickoff(self, kickoff: Kickoff) -> bool:
+        """
+        Store a scheduled kickoff.
+
+        Args:
+            kickoff: Kickoff to store
+
+        Returns:
+            True if stored, False if the channel already has one being staged
+        """
+        with self._lock, self.conn:
+            existing = self.conn.execute(
+                "SELECT 1 FROM kickoffs WHERE channel_id = ? AND status = ?",
+                (kickoff.channel_id, KICKOFF_STAGING)
+            ).fetchone()
+            if existing:
+                return False
+            self.conn.execute(
+                "INSERT INTO kickoffs (id, guild_id, channel_id, name, teams, reveal_at, created_by, "
+                "genre, difficulty, tone, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (kickoff.id, kickoff.guild_id, kickoff.channel_id, kickoff.name, kickoff.teams,
+                 kickoff.reveal_at, kickoff.created_by, kickoff.genre, kickoff.difficulty.value,
+                 kickoff.tone.value, kickoff.status)
+            )
+            return True
+
+    def get_kickoff(self, kickoff_id: str) -> Optional[Kickoff]:
+        """Look up a kickoff by ID (with its staged concept count)."""
+        with self._lock:
+            row = self.conn.execute(_KICKOFF_SELECT + "WHERE k.id = ?", (kickoff_id,)).fetchone()
+        return Kickoff.from_row(row) if row else None
+
+    def staging_kickoff(self, channel_id: int) -> Optional[Kickoff]:
+        """The kickoff being staged in a channel, if any."""
+        with self._lock:
+            row = self.conn.execute(
+                _KICKOFF_SELECT + "WHERE k.channel_id = ? AND k.status = ?",
+                (channel_id, KICKOFF_STAGING)
+            ).fetchone()
+        return Kickoff.from_row(row) if row else None
+
+    def staging_kickoffs(self, limit: int = 50) -> List[Kickoff]:
+        """
+        Kickoffs still being staged, earliest reveal first.
+
+        Args:
+            limit: Maximum number of kickoffs
+
+        Returns:
+            Kickoffs with their staged concept counts
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                _KICKOFF_SELECT + "WHERE k.status = ? ORDER BY k.reveal_at LIMIT ?",
+                (KICKOFF_STAGING, limit)
+            ).fetchall()
+        return [Kickoff.from_row(row) for row in rows]
+
+    def add_kickoff_concept(self, kickoff: Kickoff, concept: Concept, signature: str) -> bool:
+        """
+        Stage a concept for the next team without one.
+
+        Args:
+            kickoff: The kickoff (its staged count is updated)
+            concept: Concept to stage
+            signature: Normalized identity used to reject duplicate concepts
+
+        Returns:
+            True if staged, False if it duplicates a staged concept or every team has one
+        """
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO kickoff_concepts (kickoff_id, team, signature, data) "
+                "SELECT ?, COUNT(*) + 1, ?, ? FROM kickoff_concepts WHERE kickoff_id = ? "
+                "HAVING COUNT(*) < ?",
+                (kickoff.id, signature, concept.to_json(), kickoff.id, kickoff.teams)
+            )
+            staged = self.conn.execute(
+                "SELECT COUNT(*) FROM kickoff_concepts WHERE kickoff_id = ?", (kickoff.id,)
+            ).fetchone()[0]
+        kickoff.staged = staged
+        return cursor.rowcount == 1
+
+    def kickoff_concepts(self, kickoff_id: str) -> List[Concept]:
+        """Staged concepts of a kickoff, in team order."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT data FROM kickoff_concepts WHERE kickoff_id = ? ORDER BY team", (kickoff_id,)
+            ).fetchall()
+        return [Concept.from_json(row["data"]) for row in rows]
+
+    def set_kickoff_status(self, kickoff: Kickoff, status: str, expected: str = KICKOFF_STAGING) -> bool:
+        """
+        Move a kickoff to a new state.
+
+        Args:
+            kickoff: The kickoff
+            status: New status
+            expected: Only update if the kickoff is still in this state
+
+        Returns:
+            True if updated
+        """
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE kickoffs SET status = ? WHERE id = ? AND status = ?",
+                (status, kickoff.id, expected)
+            )
+        if cursor.rowcount != 1:
+            return False
+        kickoff.status = status
+        return True
+
+    def enqueue_job(self, job: Job) -> bool:
+        """
+        Store a background job unless one with the same key already exists.
+
+        Args:
+            job: Job to store (its id is set when inserted)
+
+        Returns:
+            True if queued, False if the key was already used
+        """
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO jobs "
+                "(kind, key, guild_id, channel_id, payload, status, run_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.kind, job.key, job.guild_id, job.channel_id, json.dumps(job.payload),
+                 JOB_PENDING, job.run_at, job.created_at, job.updated_at)
+            )
+            if cursor.rowcount != 1:
+                return False
+            job.id = cursor.lastrowid
+            return True
+
+    def due_jobs(
+        self,
+        now: float,
+        kinds: Iterable[str],
+        shards: Optional[Tuple[int, Sequence[int]]] = None,
+        limit: int = 50
+    ) -> List[Job]:
+        """
+        Jobs ready to run: pending and due, or running with an expired lease.
+
+        Filtering happens in the query, so jobs other processes (or paused
+        kinds) are responsible for can never fill the page and hide the
+        jobs this caller can run.
+
+        Args:
+            now: Current Unix timestamp
+            kinds: Job kinds the caller can run right now
+            shards: (shard_count, shard IDs) served by the caller; jobs of other
+                    guilds are left out (None = every guild)
+            limit: Maximum number of jobs
+
+        Returns:
+            Jobs, earliest first (claim each with lock_job() before running it)
+        """
+        kinds = list(kinds)
+        if not kinds:
+            return []
+        condition = f"kind IN ({', '.join('?' * len(kinds))})"
+        params: List[Any] = list(kinds)
+        if shards is not None:
+            shard_count, shard_ids = shards
+            condition += (
+                f" AND (guild_id IS NULL OR (guild_id >> 22) % ? IN ({', '.join('?' * len(shard_ids))}))"
+            )
+            params += [shard_count, *shard_ids]
+
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM jobs WHERE status = ? AND run_at <= ? AND {condition} "
+                "UNION ALL "
+                f"SELECT * FROM jobs WHERE status = ? AND locked_until < ? AND {condition} "
+                "ORDER BY run_at LIMIT ?",
+                (JOB_PENDING, now, *params, JOB_RUNNING, now, *params, limit)
+            ).fetchall()
+        return [Job.from_row(row) for row in rows]
+
+    def lock_job(self, job: Job, owner: str, lease: float) -> bool:
+        """
+        Claim a due job for one process.
+
+        Args:
+            job: Job returned by due_jobs() (its attempts are incremented)
+            owner: Unique identifier of this claim; later updates only apply
+                   while the job is still locked by it
+            lease: Seconds before another worker may take the job over
+                   (extend it with renew_job() while running)
+
+        Returns:
+            True if this caller won the job
+        """
+        now = time.time()
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ?, locked_by = ?, locked_until = ?, "
+                "attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ? AND ((status = ? AND run_at <= ?) OR (status = ? AND locked_until < ?))",
+                (JOB_RUNNING, owner, now + lease, now,
+                 job.id, JOB_PENDING, now, JOB_RUNNING, now)
+            )
+        if cursor.rowcount != 1:
+            return False
+        job.status = JOB_RUNNING
+        job.attempts += 1
+        job.locked_by = owner
+        return True
+
+    # The updates below only apply while the caller still holds the job's
+    # lease; they return False if it expired and another worker took over
+
+    def renew_job(self, job: Job, lease: float) -> bool:
+        """Extend the lease on a running job."""
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET locked_until = ? WHERE id = ? AND status = ? AND locked_by = ?",
+                (time.time() + lease, job.id, JOB_RUNNING, job.locked_by)
+            )
+        return cursor.rowcount == 1
+
+    def save_job_result(self, job: Job, result: str) -> bool:
+        """Keep a job's generated message so a failed delivery can be retried as is."""
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET result = ?, updated_at = ? WHERE id = ? AND status = ? AND locked_by = ?",
+                (result, time.time(), job.id, JOB_RUNNING, job.locked_by)
+            )
+        if cursor.rowcount != 1:
+            return False
+        job.result = result
+        return True
+
+    def finish_job(self, job: Job) -> bool:
+        """Mark a job as delivered."""
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ?, locked_by = NULL, locked_until = NULL, "
+                "last_error = NULL, updated_at = ? WHERE id = ? AND status = ? AND locked_by = ?",
+                (JOB_DONE, time.time(), job.id, JOB_RUNNING, job.locked_by)
+            )
+        if cursor.rowcount != 1:
+            return False
+        job.status = JOB_DONE
+        return True
+
+    def fail_job(self, job: Job, error: str, retry_at: Optional[float] = None) -> bool:
+        """
+        Record a failed attempt.
+
+        Args:
+            job: The job
+            error: Error message
+            retry_at: When to try again (None = give up and mark as failed)
+        """
+        status = JOB_FAILED if retry_at is None else JOB_PENDING
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ?, run_at = COALESCE(?, run_at), last_error = ?, "
+                "locked_by = NULL, locked_until = NULL, updated_at = ? "
+                "WHERE id = ? AND status = ? AND locked_by = ?",
+                (status, retry_at, error[:500], time.time(), job.id, JOB_RUNNING, job.locked_by)
+            )
+        if cursor.rowcount != 1:
+            return False
+        job.status = status
+        job.last_error = error
+        return True
+
+    def release_job(self, job: Job) -> bool:
+        """Hand an interrupted job back without counting the attempt (e.g. on shutdown)."""
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ?, attempts = MAX(0, attempts - 1), "
+                "locked_by = NULL, locked_until = NULL, updated_at = ? "
+                "WHERE id = ? AND status = ? AND locked_by = ?",
+                (JOB_PENDING, time.time(), job.id, JOB_RUNNING, job.locked_by)
+            )
+        return cursor.rowcount == 1
+
+    def job_counts(self, guild_id: Optional[int] = None) -> Dict[str, int]:
+        """
+        Number of jobs per status.
+
+        Args:
+            guild_id: Only count this guild's jobs (None = all guilds)
+
+        Returns:
+            Mapping of status to count (statuses without jobs are left out)
+        """
+        query = "SELECT status, COUNT(*) AS n FROM jobs"
+        params: Tuple = ()
+        if guild_id is not None:
+            query += " WHERE guild_id = ?"
+            params = (guild_id,)
+        with self._lock:
+            rows = self.conn.execute(query + " GROUP BY status", params).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def list_jobs(
+        self,
+        statuses: Iterable[str],
+        guild_id: Optional[int] = None,
+        limit: int = 10
+    ) -> List[Job]:
+        """
+        Jobs in the given states, most recently updated first.
+
+        Args:
+            statuses: Job states to include
+            guild_id: Only list this guild's jobs (None = all guilds)
+            limit: Maximum number of jobs
+
+        Returns:
+            Matching jobs
+        """
+        statuses = list(statuses)
+        query = f"SELECT * FROM jobs WHERE status IN ({', '.join('?' * len(statuses))})"
+        params: list = statuses
+        if guild_id is not None:
+            query += " AND guild_id = ?"
+            params.append(guild_id)
+        with self._lock:
+            rows = self.conn.execute(
+                query + " ORDER BY updated_at DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [Job.from_row(row) for row in rows]
+
+    def retry_failed_jobs(self, guild_id: Optional[int] = None) -> int:
+        """
+        Queue failed jobs again with a fresh set of attempts.
+
+        Args:
+            guild_id: Only retry this guild's jobs (None = all guilds)
+
+        Returns:
+            Number of jobs re-queued
+        """
+        query = "UPDATE jobs SET status = ?, attempts = 0, run_at = ?, updated_at = ? WHERE status = ?"
+        now = time.time()
+        params: Tuple = (JOB_PENDING, now, now, JOB_FAILED)
+        if guild_id is not None:
+            query += " AND guild_id = ?"
+            params += (guild_id,)
+        with self._lock, self.conn:
+            return self.conn.execute(query, params).rowcount
+
+    def prune_jobs(self, before: float) -> int:
+        """
+        Delete delivered jobs last updated before a timestamp.
+
+        Args:
+            before: Unix timestamp
+
+        Returns:
+            Number of jobs deleted
+        """
+        with self._lock, self.conn:
+            return self.conn.execute(
+                "DELETE FROM jobs WHERE status = ? AND updated_at < ?", (JOB_DONE, before)
+            ).rowcount
+
+    def spend_rate_tokens(
+        self,
+        key: str,
+        capacity: float,
+        refill_rate: float,
+        cost: float,
+        now: Optional[float] = None
+    ) -> bool:
+        """
+        Spend tokens from a shared token bucket.
+
+        The refill, the balance check and the spend happen in one upsert, so
+        processes racing on the same bucket can't both spend its last tokens.
+
+        Args:
+            key: Bucket key
+            capacity: Bucket size (a new bucket starts full)
+            refill_rate: Tokens added per second
+            cost: Tokens to spend (at most capacity)
+            now: Unix timestamp (defaults to now)
+
+        Returns:
+            True if the tokens were spent, False if the bucket is short
+        """
+        now = time.time() if now is None else now
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET "
+                "tokens = MIN(?, tokens + MAX(0, excluded.updated - updated) * ?) - ?, "
+                "updated = MAX(updated, excluded.updated) "
+                "WHERE MIN(?, tokens + MAX(0, excluded.updated - updated) * ?) >= ?",
+                (key, capacity - cost, now,
+                 capacity, refill_rate, cost,
+                 capacity, refill_rate, cost)
+            )
+        return cursor.rowcount == 1
+
+    def prune_rate_buckets(self, capacity: float, refill_rate: float, now: Optional[float] = None) -> int:
+        """
+        Delete shared buckets that have refilled completely.
+
+        Args:
+            capacity: Bucket size
+            refill_rate: Tokens added per second
+            now: Unix timestamp (defaults to now)
+
+        Returns:
+            Number of buckets deleted
+        """
+        now = time.time() if now is None else now
+        with self._lock, self.conn:
+            return self.conn.execute(
+                "DELETE FROM rate_buckets WHERE tokens + (? - updated) * ? >= ?",
+                (now, refill_rate, capacity)
+            ).rowcount
+
+    def close(self):
+        """Commit, fold the WAL back into the database file and close the connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+                try:
+                    # Other shard processes may still be reading; PASSIVE never blocks them
+                    self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                except sqlite3.Error as e:
+                    logger.warning(f"WAL checkpoint failed: {e}")
+                self._conn.close()
+                self._conn = None
+                logger.info("Database closed")
+
+
+# Global instance
+db_manager = DatabaseManager()
@@ -0,0 +1,240 @@
+"""Durable background jobs: long generations posted to a channel when done."""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import discord
+from config import (
+    JOB_LEASE,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_INTERVAL,
+    JOB_RETENTION_DAYS,
+    JOB_RETRY_DELAY,
+    JOB_RETRY_MAX_DELAY,
+    JOB_WORKERS,
+)
+from database.db_manager import DatabaseManager, db_manager
+from database.models import Job
+from generators.load_shedder import load_shedder
+from utils.message_queue import message_queue
+
+logger = logging.getLogger(__name__)
+
+# Handler(job, last_attempt) -> message to post, or None if there is nothing to send
+JobHandler = Callable[[Job, bool], Awaitable[Optional[str]]]
+
+PRUNE_INTERVAL = 3600  # seconds
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff before the next attempt."""
+    return min(JOB_RETRY_MAX_DELAY, JOB_RETRY_DELAY * 2 ** max(0, attempts - 1))
+
+
+class JobQueue:
+    """
+    Runs queued jobs from the jobs table and posts their results.
+
+    Jobs are stored before anything runs, so they survive restarts and
+    crashes. Each worker coroutine claims one due job at a time with a lease
+    (JOB_LEASE), renewed every third of the lease while the job runs; if the
+    process dies, the lease runs out and any process that owns the guild
+    picks the job up again. Every claim has its own owner token, and a
+    worker whose lease was taken over cannot save, finish or fail the job.
+    A generated message is saved before it is sent, so delivery retries
+    post the same text.
+
+    Delivery is at-least-once: a crash between sending and marking the job
+    done re-sends the message. Idempotency keys make enqueueing the same
+    job twice (e.g. from two shard processes) a no-op. Failed attempts are
+    retried with exponential backoff up to JOB_MAX_ATTEMPTS, then the job
+    is marked failed (see /jam-jobs).
+
+    While the load shedder is active, workers leave AI jobs waiting so
+    interactive commands get Ollama first.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager = db_manager,
+        workers: int = JOB_WORKERS,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        lease: float = JOB_LEASE,
+        max_attempts: int = JOB_MAX_ATTEMPTS
+    ):
+        self.db = db
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.stats: Counter = Counter()
+        self._handlers: Dict[str, JobHandler] = {}
+        self._ai_kinds = set()
+        self._bot = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._last_prune = 0.0
+        self._claims = itertools.count(1)
+
+    def register(self, kind: str, handler: JobHandler, uses_ai: bool = True):
+        """
+        Set the coroutine that produces the message for a job kind.
+
+        Args:
+            kind: Job kind, e.g. "jam-summary"
+            handler: Called as handler(job, last_attempt); raising schedules a retry
+            uses_ai: Whether the handler generates with Ollama (those jobs wait
+                     while load is being shed; others always run on time)
+        """
+        self._handlers[kind] = handler
+        if uses_ai:
+            self._ai_kinds.add(kind)
+        else:
+            self._ai_kinds.discard(kind)
+
+    def start(self, bot):
+        """Start the workers on the running event loop."""
+        if self._tasks:
+            return
+        self._bot = bot
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-queue-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"Job queue started with {self.workers} worker(s)")
+
+    async def stop(self):
+        """Stop the workers; interrupted jobs go back to pending."""
+        if not self._tasks:
+            return
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info(f"Job queue stopped: {dict(self.stats)}")
+
+    async def enqueue(self, job: Job) -> bool:
+        """
+        Store a job and wake a worker if it is already due.
+
+        Args:
+            job: Job to queue
+
+        Returns:
+            True if queued, False if a job with the same key already exists
+        """
+        queued = await asyncio.to_thread(self.db.enqueue_job, job)
+        if queued and job.run_at <= time.time() and self._wakeup is not None:
+            self._wakeup.set()
+        return queued
+
+    async def _worker(self):
+        # Shard ownership and channel lookups need a connected client
+        await self._bot.wait_until_ready()
+        while True:
+            try:
+                await self._maybe_prune()
+                job = await self._claim()
+            except Exception as e:
+                logger.error(f"Job queue poll failed: {e}", exc_info=True)
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run(job)
+
+    async def _claim(self) -> Optional[Job]:
+        """Lock the next due job this process can run."""
+        kinds = [
+            kind for kind in self._handlers
+            if not (load_shedder.shedding and kind in self._ai_kinds)
+        ]
+        # Only the process serving the guild's shard can post there
+        due = await asyncio.to_thread(self.db.due_jobs, time.time(), kinds, self._bot.owned_shards())
+        for job in due:
+            owner = f"{self._bot.process_name}#{next(self._claims)}"
+            if await asyncio.to_thread(self.db.lock_job, job, owner, self.lease):
+                return job
+        return None
+
+    async def _heartbeat(self, job: Job):
+        """Keep renewing a running job's lease until cancelled or taken over."""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            if not await asyncio.to_thread(self.db.renew_job, job, self.lease):
+                logger.warning(f"Job {job.key}: lease lost to another worker")
+                return
+
+    async def _run(self, job: Job):
+        last_attempt = job.attempts >= self.max_attempts
+        heartbeat = asyncio.create_task(self._heartbeat(job), name=f"job-lease-{job.id}")
+        try:
+            if job.result is None:
+                content = await self._handlers[job.kind](job, last_attempt)
+                if content is None:
+                    # Nothing to post any more (e.g. the jam already ended)
+                    await asyncio.to_thread(self.db.finish_job, job)
+                    self.stats["skipped"] += 1
+                    return
+                if not await asyncio.to_thread(self.db.save_job_result, job, content):
+                    # The lease ran out and another worker owns the job now
+                    self.stats["lost"] += 1
+                    return
+
+            channel = self._bot.get_channel(job.channel_id) or await self._bot.fetch_channel(job.channel_id)
+            await message_queue.send(channel, job.result)
+            if not await asyncio.to_thread(self.db.finish_job, job):
+                logger.warning(f"Job {job.key} was delivered after its lease was taken over")
+            self.stats["delivered"] += 1
+
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back without spending an attempt
+            self.db.release_job(job)
+            raise
+
+        except (discord.NotFound, discord.Forbidden) as e:
+            # The channel is gone or closed to the bot; retrying won't help
+            await asyncio.to_thread(self.db.fail_job, job, f"Cannot post to channel: {e}")
+            self.stats["failed"] += 1
+            logger.warning(f"Job {job.key} failed permanently: {e}")
+
+        except Exception as e:
+            if last_attempt:
+                await asyncio.to_thread(self.db.fail_job, job, str(e) or type(e).__name__)
+                self.stats["failed"] += 1
+                logger.error(f"Job {job.key} failed after {job.attempts} attempt(s): {e}")
+            else:
+                delay = retry_delay(job.attempts)
+                await asyncio.to_thread(self.db.fail_job, job, str(e) or type(e).__name__, time.time() + delay)
+                self.stats["retried"] += 1
+                logger.warning(f"Job {job.key} attempt {job.attempts} failed, retrying in {delay:.0f}s: {e}")
+
+        finally:
+            heartbeat.cancel()
+
+    async def _maybe_prune(self):
+        now = time.time()
+        if now - self._last_prune < PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        pruned = await asyncio.to_thread(self.db.prune_jobs, now - JOB_RETENTION_DAYS * 86400)
+        if pruned:
+            logger.info(f"Pruned {pruned} delivered job(s)")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters for this process (the database holds the queue itself)."""
+        return {"workers": len(self._tasks), **self.stats}
+
+
+# Global instance
+job_queue = JobQueue()
@@ -0,0 +1,228 @@
+"""Typed records for tracked game jams, kickoffs, preferences and background jobs."""
+
+import json
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from generators.models import Difficulty, Tone
+
+
+def new_id() -> str:
+    """Generate a record ID."""
+    return uuid.uuid4().hex
+
+
+@dataclass(slots=True)
+class JamSession:
+    """A game jam tracked in one channel. Times are Unix timestamps."""
+
+    guild_id: Optional[int]
+    channel_id: int
+    name: str
+    duration_hours: int
+    created_by: int
+    start_time: float = 0.0
+    completed: bool = False
+    completed_time: Optional[float] = None
+    update_count: int = 0
+    id: str = ""
+
+    def __post_init__(self):
+        if not self.id:
+            self.id = new_id()
+        if not self.start_time:
+            self.start_time = time.time()
+
+    @property
+    def end_time(self) -> float:
+        """Scheduled end of the jam."""
+        return self.start_time + self.duration_hours * 3600
+
+    def hours_elapsed(self, now: Optional[float] = None) -> float:
+        """Hours since the jam started (frozen once the jam is completed)."""
+        if now is None:
+            now = self.completed_time if self.completed else time.time()
+        return max(0.0, (now - self.start_time) / 3600)
+
+    def progress(self, now: Optional[float] = None) -> float:
+        """Fraction of the scheduled duration that has passed (0.0 - 1.0)."""
+        return min(1.0, self.hours_elapsed(now) / self.duration_hours)
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "JamSession":
+        return cls(
+            id=row["id"],
+            guild_id=row["guild_id"],
+            channel_id=row["channel_id"],
+            name=row["name"],
+            duration_hours=row["duration_hours"],
+            created_by=row["created_by"],
+            start_time=row["start_time"],
+            completed=bool(row["completed"]),
+            completed_time=row["completed_time"],
+            update_count=row["update_count"],
+        )
+
+
+@dataclass(slots=True)
+class ProgressUpdate:
+    """One progress update posted during a jam."""
+
+    jam_id: str
+    user_id: int
+    message: str
+    hours_elapsed: float
+    timestamp: float = 0.0
+    id: str = ""
+
+    def __post_init__(self):
+        if not self.id:
+            self.id = new_id()
+        if not self.timestamp:
+            self.timestamp = time.time()
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "ProgressUpdate":
+        return cls(
+            id=row["id"],
+            jam_id=row["jam_id"],
+            user_id=row["user_id"],
+            message=row["message"],
+            hours_elapsed=row["hours_elapsed"],
+            timestamp=row["timestamp"],
+        )
+
+
+# Kickoff states
+KICKOFF_STAGING = "staging"
+KICKOFF_REVEALED = "revealed"
+KICKOFF_CANCELLED = "cancelled"
+
+
+@dataclass(slots=True)
+class Kickoff:
+    """A scheduled jam start whose per-team concepts are generated ahead of time."""
+
+    guild_id: Optional[int]
+    channel_id: int
+    name: str
+    teams: int
+    reveal_at: float  # Unix timestamp
+    created_by: int
+    genre: Optional[str] = None
+    difficulty: Difficulty = Difficulty.MEDIUM
+    tone: Tone = Tone.ENCOURAGING
+    status: str = KICKOFF_STAGING
+    staged: int = 0  # concepts ready so far (not a column)
+    id: str = ""
+
+    def __post_init__(self):
+        if not self.id:
+            self.id = new_id()
+        self.difficulty = Difficulty.parse(self.difficulty)
+        self.tone = Tone.parse(self.tone)
+
+    @property
+    def missing(self) -> int:
+        """Concepts still to generate."""
+        return max(0, self.teams - self.staged)
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Kickoff":
+        return cls(
+            id=row["id"],
+            guild_id=row["guild_id"],
+            channel_id=row["channel_id"],
+            name=row["name"],
+            teams=row["teams"],
+            reveal_at=row["reveal_at"],
+            created_by=row["created_by"],
+            genre=row["genre"],
+            difficulty=row["difficulty"],
+            tone=row["tone"],
+            status=row["status"],
+            staged=row["staged"] if "staged" in row.keys() else 0,
+        )
+
+
+@dataclass(slots=True)
+class Preferences:
+    """Preferred tone, difficulty and genres of a user or a guild."""
+
+    scope: str  # "user" or "guild"
+    scope_id: int
+    tone: Optional[Tone] = None
+    difficulty: Optional[Difficulty] = None
+    favorite_genres: Tuple[str, ...] = ()
+    updated_at: float = 0.0
+
+    @property
+    def is_empty(self) -> bool:
+        return self.tone is None and self.difficulty is None and not self.favorite_genres
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Preferences":
+        return cls(
+            scope=row["scope"],
+            scope_id=row["scope_id"],
+            tone=Tone.parse(row["tone"]) if row["tone"] else None,
+            difficulty=Difficulty.parse(row["difficulty"]) if row["difficulty"] else None,
+            favorite_genres=tuple(json.loads(row["favorite_genres"] or "[]")),
+            updated_at=row["updated_at"],
+        )
+
+
+# Job states (see database/job_queue.py)
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+@dataclass(slots=True)
+class Job:
+    """A background job that generates a message and posts it to a channel."""
+
+    kind: str
+    key: str  # idempotency key; enqueueing the same key twice is a no-op
+    channel_id: int
+    guild_id: Optional[int] = None
+    payload: Dict[str, Any] = field(default_factory=dict)
+    run_at: float = 0.0
+    status: str = JOB_PENDING
+    attempts: int = 0
+    result: Optional[str] = None  # generated message, kept so delivery retries don't regenerate it
+    last_error: Optional[str] = None
+    locked_by: Optional[str] = None  # lease holder while running
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    id: Optional[int] = None
+
+    def __post_init__(self):
+        if not self.created_at:
+            self.created_at = time.time()
+        if not self.run_at:
+            self.run_at = self.created_at
+        if not self.updated_at:
+            self.updated_at = self.created_at
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        return cls(
+            id=row["id"],
+            kind=row["kind"],
+            key=row["key"],
+            guild_id=row["guild_id"],
+            channel_id=row["channel_id"],
+            payload=json.loads(row["payload"] or "{}"),
+            run_at=row["run_at"],
+            status=row["status"],
+            attempts=row["attempts"],
+            result=row["result"],
+            last_error=row["last_error"],
+            locked_by=row["locked_by"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+        )
@@ -0,0 +1,213 @@
+"""Per-user and per-guild preferences, read through an in-memory cache."""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+from config import (
+    DEFAULT_TONE,
+    PREFERENCE_CACHE_SIZE,
+    PREFERENCE_REFRESH_INTERVAL,
+)
+from database.db_manager import DatabaseManager, db_manager
+from database.models import Preferences
+from generators.models import Difficulty, Tone
+from utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+USER = "user"
+GUILD = "guild"
+
+
+class ResolvedPreferences(NamedTuple):
+    """Effective settings for one command (user overrides guild overrides defaults)."""
+
+    tone: str
+    difficulty: Difficulty
+    genres: Tuple[str, ...]
+
+    def pick_genre(self, seed: int) -> Optional[str]:
+        """Choose a favorite genre deterministically from a concept seed."""
+        if not self.genres:
+            return None
+        return random.Random(seed).choice(self.genres)
+
+
+class PreferenceStore:
+    """
+    Write-through cache over the preferences table.
+
+    Commands resolve their settings from memory only (see resolve()): a
+    miss falls back to the defaults for that one command while the entry
+    is loaded in the background. Misses are cached as empty Preferences.
+    Writes go to the database first and then replace the cached entry, so
+    entries never expire; entries older than `refresh_interval` are
+    re-read in the background to pick up changes made through another
+    shard process.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager = db_manager,
+        maxsize: int = PREFERENCE_CACHE_SIZE,
+        refresh_interval: float = PREFERENCE_REFRESH_INTERVAL
+    ):
+        self.db = db
+        self.refresh_interval = refresh_interval
+        # Values are (loaded_at, Preferences) with loaded_at from time.monotonic()
+        self._cache = LRUCache(maxsize)
+        self._refreshing: Dict[Tuple[str, int], asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        """Number of cached entries (including cached misses)."""
+        return len(self._cache)
+
+    def get(self, scope: str, scope_id: Optional[int]) -> Optional[Preferences]:
+        """
+        Preferences of a user or guild, read from the database if not cached or stale.
+
+        Blocking; call via asyncio.to_thread from the bot.
+
+        Args:
+            scope: USER or GUILD
+            scope_id: Discord ID (None, e.g. the guild of a DM, returns None)
+
+        Returns:
+            Stored preferences, or None if none are set
+        """
+        if scope_id is None:
+            return None
+        key = (scope, scope_id)
+        entry = self._cache.get(key)
+        if entry is None or self._is_stale(entry):
+            preferences = self._load(key)
+        else:
+            preferences = entry[1]
+        return None if preferences.is_empty else preferences
+
+    def cached(self, scope: str, scope_id: Optional[int]) -> Optional[Preferences]:
+        """
+        Preferences of a user or guild from memory only.
+
+        A miss or stale entry schedules a background load when called on the
+        event loop, so the next lookup sees the stored preferences.
+
+        Returns:
+            Cached preferences, or None if none are set or none are cached yet
+        """
+        if scope_id is None:
+            return None
+        key = (scope, scope_id)
+        entry = self._cache.get(key)
+        if entry is None or self._is_stale(entry):
+            self._refresh(key)
+        if entry is None or entry[1].is_empty:
+            return None
+        return entry[1]
+
+    def set(self, preferences: Preferences):
+        """
+        Store preferences and update the cache.
+
+        Args:
+            preferences: New preferences (empty preferences clear the stored ones)
+        """
+        preferences.updated_at = time.time()
+        self.db.set_preferences(preferences)
+        self._cache.put((preferences.scope, preferences.scope_id), (time.monotonic(), preferences))
+
+    def _is_stale(self, entry: Tuple[float, Preferences]) -> bool:
+        return time.monotonic() - entry[0] > self.refresh_interval
+
+    def _load(self, key: Tuple[str, int]) -> Preferences:
+        started = time.monotonic()
+        preferences = self.db.get_preferences(*key) or Preferences(*key)
+        # A set() that finished while this query ran has the newer value
+        current = self._cache.get(key)
+        if current is not None and current[0] > started:
+            return current[1]
+        self._cache.put(key, (time.monotonic(), preferences))
+        return preferences
+
+    def _refresh(self, key: Tuple[str, int]):
+        if key in self._refreshing:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # not on the event loop; the next lookup there loads it
+        self._refreshing[key] = loop.create_task(self._refresh_async(key))
+
+    async def _refresh_async(self, key: Tuple[str, int]):
+        try:
+            await asyncio.to_thread(self._load, key)
+        except Exception as e:
+            logger.warning(f"Failed to load {key[0]} preferences for {key[1]}: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    def resolve(self, user_id: int, guild_id: Optional[int]) -> ResolvedPreferences:
+        """
+        Effective tone, difficulty and favorite genres for a command.
+
+        Never queries the database, so it is safe to call on the event loop
+        before deferring; see cached().
+
+        Args:
+            user_id: Invoking user
+            guild_id: Guild the command was used in (None in DMs)
+
+        Returns:
+            Settings with user preferences taking priority over guild ones
+        """
+        user = self.cached(USER, user_id)
+        guild = self.cached(GUILD, guild_id)
+
+        tone = difficulty = None
+        genres: Tuple[str, ...] = ()
+        for preferences in (user, guild):
+            if preferences is None:
+                continue
+            tone = tone or preferences.tone
+            difficulty = difficulty or preferences.difficulty
+            genres = genres or preferences.favorite_genres
+
+        return ResolvedPreferences(
+            tone=(tone or Tone.parse(DEFAULT_TONE)).value,
+            difficulty=difficulty or Difficulty.MEDIUM,
+            genres=genres
+        )
+
+    def warm(self, limit: int = 1000) -> int:
+        """
+        Preload the most recently updated guild and user preferences.
+
+        Args:
+            limit: Maximum number of entries to load per scope
+
+        Returns:
+            Number of entries loaded
+        """
+        limit = min(limit, self._cache.maxsize // 2)
+        loaded = 0
+        for scope in (USER, GUILD):
+            rows = self.db.recent_preferences(scope, limit)
+            now = time.monotonic()
+            for preferences in reversed(rows):
+                self._cache.put((scope, preferences.scope_id), (now, preferences))
+            loaded += len(rows)
+        logger.info(f"Preloaded {loaded} preference entries")
+        return loaded
+
+    def guild_preferences(self) -> Tuple[Preferences, ...]:
+        """Cached, non-empty guild preferences (most recently used last)."""
+        return tuple(
+            preferences for (scope, _), (_, preferences) in self._cache.items()
+            if scope == GUILD and not preferences.is_empty
+        )
+
+
+# Global instance
+preference_store = PreferenceStore()
@@ -3,10 +3,13 @@
 import logging
 import random
 import re
-from typing import Dict, Optional
-from ai.ollama_client import ollama_client
+import sys
+from typing import Optional
+from ai.ollama_client import OllamaClient, get_ollama_client
 from ai import prompts
-from generators.template_generator import template_generator
+from generators.genre_index import genre_index
+from generators.models import Concept, Difficulty
+from generators.template_generator import TemplateGenerator, template_generator
 from config import DEFAULT_TONE, ENABLE_AI_FALLBACK
 
 logger = logging.getLogger(__name__)
@@ -15,16 +18,26 @@ logger = logging.getLogger(__name__)
 class AIGenerator:
     """Generates game concepts using AI with template fallback."""
     
-    def __init__(self):
-        self.ollama = ollama_client
-        self.template_gen = template_generator
+    def __init__(
+        self,
+        ollama: Optional[OllamaClient] = None,
+        template_gen: Optional[TemplateGenerator] = None
+    ):
+        """
+        Args:
+            ollama: Client to generate with (defaults to the shared client)
+            template_gen: Fallback generator (defaults to the shared one)
+        """
+        self.ollama = ollama or get_ollama_client()
+        self.template_gen = template_gen or template_generator
     
     def generate_concept(
         self,
         genre: Optional[str] = None,
         difficulty: str = "medium",
-        tone: str = None
-    ) -> Dict[str, str]:
+        tone: str = None,
+        seed: Optional[int] = None
+    ) -> Optional[Concept]:
         """
         Generate a game concept using AI, with template fallback.
         
@@ -32,9 +45,11 @@ class AIGenerator:
             genre: Optional specific genre
             difficulty: Difficulty level
             tone: Response tone (defaults to configured tone)
+            seed: Optional seed passed to Ollama (and to the template fallback)
+                  so the concept can be regenerated
         
         Returns:
-            Dictionary containing concept fields
+            Generated concept, or None if AI failed and fallback is disabled
         """
         tone = tone or DEFAULT_TONE
         
@@ -42,13 +57,14 @@ class AIGenerator:
         if not self.ollama.is_available():
             logger.info("Ollama not available, using template generator")
             if ENABLE_AI_FALLBACK:
-                return self.template_gen.generate_concept(genre=genre, difficulty=difficulty)
+                return self.template_gen.generate_concept(genre=genre, difficulty=difficulty, seed=seed)
             else:
-                return {"error": "AI service unavailable"}
+                return None
         
         try:
             # Generate prompt with random duration (like template generator)
-            duration = random.choice([24, 48, 72, 96, 120, 144])
+            rng = random.Random(seed) if seed is not None else random
+            duration = rng.choice([24, 48, 72, 96, 120, 144])
             prompt = prompts.format_concept_prompt(
                 duration=duration,
                 tone=tone,
@@ -57,7 +73,8 @@ class AIGenerator:
             
             # Call AI
             logger.debug("Generating concept with AI")
-            response = self.ollama.generate(prompt)
+            options = {"seed": seed} if seed is not None else None
+            response = self.ollama.generate(prompt, options=options, task="concept")
             
             if response:
                 # Parse AI response into concept dict
@@ -66,17 +83,17 @@ class AIGenerator:
             else:
                 logger.warning("AI generation returned None, falling back to template")
                 if ENABLE_AI_FALLBACK:
-                    return self.template_gen.generate_concept(genre=genre, difficulty=difficulty)
+                    return self.template_gen.generate_concept(genre=genre, difficulty=difficulty, seed=seed)
                 else:
-                    return {"error": "AI generation failed"}
+                    return None
         
         except Exception as e:
             logger.error(f"Error in AI concept generation: {e}", exc_info=True)
             if ENABLE_AI_FALLBACK:
                 logger.info("Falling back to template generator")
-                return self.template_gen.generate_concept(genre=genre, difficulty=difficulty)
+                return self.template_gen.generate_concept(genre=genre, difficulty=difficulty, seed=seed)
             else:
-                return {"error": f"Generation error: {str(e)}"}
+                return None
     
     def generate_constraint(
         self,
@@ -114,7 +131,7 @@ class AIGenerator:
             )
             
             logger.debug("Generating constraint with AI")
-            response = self.ollama.generate(prompt)
+            response = self.ollama.generate(prompt, task="constraint")
             
             if response:
                 # Clean up the response
@@ -168,7 +185,7 @@ class AIGenerator:
             )
             
             logger.debug("Generating commentary with AI")
-            response = self.ollama.generate(prompt)
+            response = self.ollama.generate(prompt, task="commentary")
             
             if response:
                 return response.strip()
@@ -208,7 +225,7 @@ class AIGenerator:
             )
             
             logger.debug("Generating vibe check with AI")
-            response = self.ollama.generate(prompt)
+            response = self.ollama.generate(prompt, task="vibe_check")
             
             if response:
                 return response.strip()
@@ -219,6 +236,53 @@ class AIGenerator:
             logger.error(f"Error in AI vibe check generation: {e}", exc_info=True)
             return "Stay strong and keep coding! 🚀"
     
+    def generate_jam_summary(
+        self,
+        jam_name: str,
+        hours: float,
+        duration: int,
+        update_count: int,
+        updates: str,
+        tone: str = None
+    ) -> Optional[str]:
+        """
+        Generate a post-jam summary from the jam's progress updates.
+        
+        Args:
+            jam_name: Name of the jam
+            hours: Hours the jam actually ran
+            duration: Planned duration in hours
+            update_count: Total number of progress updates
+            updates: Progress updates, one per line
+            tone: Response tone
+        
+        Returns:
+            Summary string, or None if AI is unavailable (the caller retries later)
+        """
+        tone = tone or DEFAULT_TONE
+        
+        if not self.ollama.is_available():
+            logger.warning("Ollama not available for jam summary")
+            return None
+        
+        try:
+            prompt = prompts.format_jam_summary_prompt(
+                jam_name=jam_name,
+                hours=hours,
+                duration=duration,
+                update_count=update_count,
+                updates=updates,
+                tone=tone
+            )
+            
+            logger.debug("Generating jam summary with AI")
+            response = self.ollama.generate(prompt, task="summary")
+            return response.strip() if response else None
+        
+        except Exception as e:
+            logger.error(f"Error in AI jam summary generation: {e}", exc_info=True)
+            return None
+    
     def _parse_ai_concept(
         self,
         response: str,
@@ -226,9 +290,9 @@ class AIGenerator:
         difficulty: str,
         tone: str,
         duration: int
-    ) -> Dict[str, str]:
+    ) -> Concept:
         """
-        Parse AI response into structured concept dictionary.
+        Parse AI response into a structured concept.
         
         Args:
             response: AI-generated text
@@ -238,15 +302,15 @@ class AIGenerator:
             duration: Jam duration
         
         Returns:
-            Concept dictionary
+            Parsed concept (genre_from_ai is set when no genre was requested
+            and the model named one)
         """
-        import re
-        
-        concept = {
-            "difficulty": difficulty,
-            "time_limit": str(duration),
-            "is_ai": True
-        }
+        concept = Concept(
+            time_limit=duration,
+            difficulty=Difficulty.parse(difficulty),
+            tone=tone,
+            is_ai=True
+        )
         
         # Parse structured format: "Field: value"
         lines = response.split('\n')
@@ -262,45 +326,51 @@ class AIGenerator:
                 field_name = match.group(1).strip().lower()
                 field_value = match.group(2).strip()
                 
-                # Map field names to concept keys
+                # Map field names to concept fields
                 if 'genre' in field_name:
-                    concept["genre"] = field_value
+                    concept.genre = field_value
                 elif 'setting' in field_name:
-                    concept["setting"] = field_value
+                    concept.setting = field_value
                 elif 'mechanic' in field_name or 'core' in field_name:
-                    concept["mechanic"] = field_value
+                    concept.mechanic = field_value
                 elif 'theme' in field_name:
-                    concept["theme"] = field_value
+                    concept.theme = field_value
                 elif 'constraint' in field_name or 'special' in field_name:
-                    concept["constraint"] = field_value
+                    concept.constraint = field_value
         
         # If genre was specified, use it (overriding parsed value)
         if genre:
-            concept["genre"] = genre
+            concept.genre = genre
+        concept.genre_from_ai = not genre
         
         # If we didn't get structured format, try fallback parsing
-        if not all(key in concept for key in ["genre", "setting", "mechanic", "theme", "constraint"]):
+        if not (concept.is_complete and concept.constraint):
             logger.warning("AI response not in expected structured format, attempting fallback parsing")
             
-            # Try to extract genre if mentioned
-            if "genre" not in concept:
-                if genre:
-                    concept["genre"] = genre
-                else:
-                    # Try to find genre in response
-                    for g in template_generator.genres:
-                        if g.lower() in response.lower():
-                            concept["genre"] = g
-                            break
+            # Try to find a known genre in the response
+            if not concept.genre:
+                concept.genre = genre_index.find_in(response) or ""
             
             # Store full response as description if parsing failed
-            if not all(key in concept for key in ["genre", "setting", "mechanic", "theme"]):
-                concept["description"] = response
-                concept["is_ai"] = True
+            if not concept.is_complete:
+                concept.description = response
+        
+        if concept.genre:
+            concept.genre = sys.intern(concept.genre)
+        else:
+            concept.genre_from_ai = False
         
         return concept
 
 
-# Global instance
-ai_generator = AIGenerator()
+# Shared instance, created on first use so importing this module stays cheap
+_ai_generator: Optional[AIGenerator] = None
+
+
+def get_ai_generator() -> AIGenerator:
+    """Return the shared AI generator, creating it on first use."""
+    global _ai_generator
+    if _ai_generator is None:
+        _ai_generator = AIGenerator()
+    return _ai_generator
 
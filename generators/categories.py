@@ -0,0 +1,188 @@
+"""Template categories used for concept generation."""
+
+
+# Category lists from design document
+# (concept codes store genres by position, so only append new genres)
+GENRES = [
+    "Platformer", "Puzzle", "RPG", "Roguelike", "Metroidvania", "Visual Novel",
+    "Tower Defense", "Card Game", "Rhythm", "Racing", "Fighting", "Stealth",
+    "Survival", "Strategy", "Adventure", "Point-and-Click", "Idle", "Management",
+    "Simulation", "Horror", "Action", "Shooter", "Sports", "Educational"
+]
+
+SETTINGS = [
+    "Space station", "Medieval castle", "Cyberpunk city", "Underwater",
+    "Post-apocalyptic", "Fantasy forest", "Desert wasteland", "Corporate office",
+    "Haunted mansion", "School", "Laboratory", "Alien planet", "Dream world",
+    "Tiny world (microscopic)", "Giant world (macro)", "Inside a computer",
+    "Ancient ruins", "Suburban neighborhood", "Abandoned factory", "Museum",
+    "Library", "Prison", "Hospital", "Airport", "Shopping mall", "Theme park",
+    "Cemetery", "Beach", "Mountain peak", "Underground cave", "Floating island"
+]
+
+MECHANICS = [
+    "Time loop", "Gravity manipulation", "Portal creation", "Shape-shifting",
+    "Resource management", "Dialogue choices", "Crafting system", "Permadeath",
+    "Procedural generation", "Limited inventory", "One-button control",
+    "Memory-based puzzles", "Physics-based", "Asymmetric multiplayer",
+    "Deck building", "Turn-based combat", "Real-time strategy", "Stealth mechanics",
+    "Parkour movement", "Building/construction", "Trading", "Farming",
+    "Cooking", "Fishing", "Exploration", "Combat", "Puzzle solving"
+]
+
+THEMES = [
+    "Isolation", "Friendship", "Betrayal", "Discovery", "Loss", "Growth",
+    "Rebellion", "Mystery", "Horror", "Comedy", "Nostalgia", "Existential",
+    "Environmental", "Political", "Love", "Fear", "Hope", "Greed", "Redemption",
+    "Sacrifice", "Identity", "Memory", "Time", "Death", "Rebirth"
+]
+
+SPECIAL_CONSTRAINTS = [
+    "No text or dialogue allowed",
+    "Only 3 colors",
+    "Everything is circles",
+    "One-button gameplay",
+    "No jumping",
+    "Reverse controls",
+    "Real-time only (no pause)",
+    "All assets must be ASCII art",
+    "No sound effects",
+    "Enemies are friendly",
+    "You play as the environment",
+    "Speed increases constantly",
+    "Everything moves in slow motion",
+    "Only black and white",
+    "No UI elements",
+    "First-person only",
+    "Top-down only",
+    "Side-scrolling only",
+    "No death/failure state",
+    "Permadeath (one life)",
+    "No save system",
+    "Time limit per level",
+    "Only mouse controls",
+    "Only keyboard controls",
+    "No tutorial",
+    "Silent protagonist",
+    "No inventory",
+    "Infinite respawns",
+    "No health system",
+    "Only one enemy type"
+]
+
+TIME_LIMITS = [24, 48, 72, 96, 120, 144]
+
+VIBE_CHECK_RESPONSES = [
+    "You're doing great! Keep it up! 💪",
+    "Stay strong and keep coding! 🚀",
+    "Every bug you squash is a step closer to shipping. Keep going! 🐛",
+    "Remember to hydrate, stretch, and commit your work. You've got this! 💧",
+    "Scope down, ship something fun, and be proud of it! 🎮",
+]
+
+# Canned vibe check replies by mood and tone, used when the message is a
+# stock phrase that does not need an AI response (see generators/vibe_router.py)
+VIBE_RESPONSE_BANK = {
+    "checking_in": {
+        "encouraging": (
+            "Vibes are good and so are you! Keep that momentum going! 🚀",
+            "Thanks for checking in! You're making progress, even if it doesn't feel like it. 💪",
+            "All systems go! Grab some water and keep building. 🎮",
+        ),
+        "sarcastic": (
+            "Checking in instead of coding? Bold strategy. Let's see if it pays off. 😏",
+            "Still alive? Great. The game won't finish itself, sadly.",
+            "Vibe status: procrastinating via bot commands. Relatable. Now back to work. 🙃",
+        ),
+        "neutral": (
+            "Checked in. Keep going and remember to commit your work.",
+            "Status noted. Pick the next small task and finish it.",
+            "All good. Take a short break if you need one, then continue.",
+        ),
+    },
+    "tired": {
+        "encouraging": (
+            "Tired means you've been putting in the work! A 20-minute nap can do wonders. 😴",
+            "Rest is part of the jam too. Recharge and you'll code twice as fast after. 🔋",
+            "You've come so far! Stretch, hydrate, and take a real break. You've earned it. 💧",
+        ),
+        "sarcastic": (
+            "Ah yes, the classic jam diet: caffeine and regret. Maybe try sleep? Wild idea. ☕",
+            "Your code at 4 AM is not as good as you think it is. Go to bed. 😴",
+            "Exhausted already? The bugs can smell weakness. Nap before they strike.",
+        ),
+        "neutral": (
+            "Fatigue slows you down more than a break does. Consider a short rest.",
+            "Sleep improves debugging. Schedule a break before your next task.",
+            "Take 15 minutes away from the screen, then reassess your priorities.",
+        ),
+    },
+    "stuck": {
+        "encouraging": (
+            "Every bug you squash is a step closer to shipping! Try explaining it to a rubber duck. 🦆",
+            "Stuck is temporary! Step away for five minutes; the answer often shows up in the shower. 🐛",
+            "You'll crack it! Add some logging, check your assumptions, and take it one piece at a time. 🔍",
+        ),
+        "sarcastic": (
+            "Have you tried turning it off and on again? No? Classic. 🙃",
+            "The bug is probably a typo. It's always a typo. Or a missing semicolon. Or both.",
+            "Congratulations, you've discovered a feature. Call it intended and move on. 😏",
+        ),
+        "neutral": (
+            "Isolate the problem: reproduce it in the smallest case you can.",
+            "Check recent changes first. Version control diffs help here.",
+            "If it isn't core to the game, consider cutting it and moving on.",
+        ),
+    },
+    "behind": {
+        "encouraging": (
+            "Scope down, ship something fun, and be proud of it! A finished small game beats an unfinished big one. 🎮",
+            "You've still got time! Pick the one feature that makes it fun and polish that. ✨",
+            "Deadlines are scary, but you've got this. Cut the extras and focus on the core loop! ⏰",
+        ),
+        "sarcastic": (
+            "Behind schedule at a game jam? Unheard of. Truly, you're the first. ⏰",
+            "Remember that inventory system you planned? Yeah, it's time to let it go. 😏",
+            "Good news: nobody will notice the features you didn't make. Cut, cut, cut.",
+        ),
+        "neutral": (
+            "List remaining tasks and cut everything that isn't essential to the core loop.",
+            "Reserve the final hours for building and submitting; plan backwards from the deadline.",
+            "Prioritize a playable build now, then polish if time allows.",
+        ),
+    },
+    "going_well": {
+        "encouraging": (
+            "That's awesome! Keep riding that wave and don't forget to commit! 🌊",
+            "Look at you go! This is shaping up to be something great. 🎉",
+            "Great progress! Celebrate the win, then tackle the next piece. 🚀",
+        ),
+        "sarcastic": (
+            "Things are going well? Suspicious. Save your work before the universe notices. 😏",
+            "Wow, progress. Don't get cocky, the bugs are just regrouping.",
+            "Enjoy it while it lasts. Also, maybe make a backup. Just saying. 🙃",
+        ),
+        "neutral": (
+            "Good progress. Commit your work and move to the next task.",
+            "Nice. Consider playtesting now while things are stable.",
+            "Progress noted. Keep an eye on the remaining time.",
+        ),
+    },
+    "stressed": {
+        "encouraging": (
+            "Take a deep breath. Game jams are about learning and having fun, not perfection. 💙",
+            "You're doing better than you think! Break the next step into something tiny and just do that. 🌱",
+            "It's okay to feel overwhelmed. Step away for a minute; you'll come back clearer. ☕",
+        ),
+        "sarcastic": (
+            "Stressed at a game jam? The system is working as intended. 😅",
+            "Panic is just motivation wearing a scary mask. Breathe, then fix one thing.",
+            "Remember: it's a jam, not a tax audit. Nobody is grading your sanity. 🙃",
+        ),
+        "neutral": (
+            "Write down the next three tasks and do only the first one.",
+            "Short breaks reduce stress. Take five minutes, then continue.",
+            "Focus on what can still be finished in the time left.",
+        ),
+    },
+}
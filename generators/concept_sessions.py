@@ -0,0 +1,114 @@
+"""The last concept generated in each channel, so follow-up constraints fit it."""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
+from config import (
+    CONCEPT_SESSION_PERSIST,
+    CONCEPT_SESSION_SIZE,
+    CONCEPT_SESSION_TTL,
+    CONSTRAINT_CACHE_SIZE,
+    CONSTRAINTS_PER_CONCEPT,
+)
+from database.db_manager import DatabaseManager, db_manager
+from generators.models import Concept
+from utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ConceptSession:
+    """A channel's active concept and the extra constraints already shown there."""
+
+    concept: Concept
+    summary: str
+    shown: Set[str] = field(default_factory=set)
+
+    @property
+    def key(self) -> str:
+        """Concept-level cache key (shared codes share cached constraints)."""
+        return self.concept.code or self.summary
+
+
+class ConceptSessionStore:
+    """
+    Per-channel concept sessions with TTL eviction.
+
+    /generate-concept stores each concept here; /generate-constraint passes
+    the stored concept's summary into the constraint prompt instead of a
+    generic placeholder. After a restart (or in another shard process) a
+    miss falls back to the latest concept recorded in generated_concepts.
+
+    AI constraints are also cached per (concept, tone), so re-rolls in a
+    channel, or other channels using the same concept code, are served
+    constraints they have not seen yet before a new one is generated.
+    """
+
+    def __init__(
+        self,
+        db: Optional[DatabaseManager] = None,
+        maxsize: int = CONCEPT_SESSION_SIZE,
+        ttl: float = CONCEPT_SESSION_TTL,
+        per_concept: int = CONSTRAINTS_PER_CONCEPT
+    ):
+        self.db = db
+        self.ttl = ttl
+        self.per_concept = per_concept
+        self._sessions = LRUCache(maxsize, ttl)
+        self._constraints = LRUCache(CONSTRAINT_CACHE_SIZE, ttl)
+
+    def __len__(self) -> int:
+        """Number of channels with a cached session."""
+        return len(self._sessions)
+
+    def remember(self, channel_id: Optional[int], concept: Concept):
+        """Make a concept the channel's active one."""
+        if channel_id is None:
+            return
+        self._sessions.put(channel_id, ConceptSession(concept, concept.summary()))
+
+    def get(self, channel_id: Optional[int]) -> Optional[ConceptSession]:
+        """
+        Look up a channel's active concept (may query the database on a miss).
+
+        Args:
+            channel_id: Discord channel ID
+
+        Returns:
+            The session, or None if no concept was generated there within the TTL
+        """
+        if channel_id is None:
+            return None
+        session = self._sessions.get(channel_id)
+        if session is not None or self.db is None:
+            return session
+
+        concept = self.db.latest_concept(channel_id, since=time.time() - self.ttl)
+        if concept is None:
+            return None
+        session = ConceptSession(concept, concept.summary())
+        self._sessions.put(channel_id, session)
+        return session
+
+    def cached_constraint(self, session: ConceptSession, tone: str) -> Optional[str]:
+        """Take a cached constraint for the concept that this channel has not seen yet."""
+        for constraint in self._constraints.get((session.key, tone), ()):
+            if constraint not in session.shown:
+                session.shown.add(constraint)
+                return constraint
+        return None
+
+    def add_constraint(self, session: ConceptSession, tone: str, constraint: str):
+        """Cache a newly generated AI constraint and mark it as shown."""
+        session.shown.add(constraint)
+        key = (session.key, tone)
+        constraints: List[str] = list(self._constraints.get(key, ()))
+        if constraint not in constraints:
+            constraints.append(constraint)
+        self._constraints.put(key, tuple(constraints[-self.per_concept:]))
+
+
+# Global instance
+concept_sessions = ConceptSessionStore(db_manager if CONCEPT_SESSION_PERSIST else None)
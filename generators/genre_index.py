@@ -0,0 +1,166 @@
+"""Sorted prefix index over built-in and AI-learned genres."""
+
+import bisect
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+from config import MAX_LEARNED_GENRES
+from generators.categories import GENRES
+
+# Learned genres longer than this are probably not genre names
+MAX_GENRE_LENGTH = 40
+MAX_GENRE_WORDS = 4
+
+_WORD_RE = re.compile(r"[\w'&-]+")
+
+
+def _normalize(name: str) -> str:
+    """Case-fold and collapse whitespace so lookups ignore formatting."""
+    return " ".join(name.casefold().split())
+
+
+class GenreIndex:
+    """
+    Case-insensitive genre index supporting exact, prefix and in-text lookups.
+
+    Keys are kept in sorted lists (one for built-in genres, one for learned
+    ones), so prefix completion is a binary search plus a walk over at most
+    `limit` matches, independent of how many genres are known.
+    Genres learned from AI output are capped at max_learned; the oldest are
+    forgotten first. Built-in genres are never evicted.
+    """
+
+    def __init__(self, builtin: Iterable[str] = GENRES, max_learned: int = MAX_LEARNED_GENRES):
+        self.max_learned = max_learned
+        self._builtin_keys: List[str] = []
+        self._learned_keys: List[str] = []
+        self._names: Dict[str, str] = {}
+        self._builtin = set()
+        self._learned: "OrderedDict[str, None]" = OrderedDict()
+        self._max_words = 1
+        self._lock = threading.Lock()
+
+        for name in builtin:
+            key = _normalize(name)
+            if key not in self._builtin:
+                self._insert(self._builtin_keys, key, name)
+                self._builtin.add(key)
+
+    def _insert(self, keys: List[str], key: str, name: str):
+        bisect.insort(keys, key)
+        self._names[key] = name
+        self._max_words = max(self._max_words, len(key.split()))
+
+    def _remove_learned(self, key: str):
+        index = bisect.bisect_left(self._learned_keys, key)
+        if index < len(self._learned_keys) and self._learned_keys[index] == key:
+            del self._learned_keys[index]
+        self._names.pop(key, None)
+
+    def learn(self, name: str) -> Optional[str]:
+        """
+        Remember a genre seen in AI output.
+
+        Args:
+            name: Genre name as generated
+
+        Returns:
+            Canonical name stored in the index, or None if the name was rejected
+        """
+        name = " ".join(name.split()).strip(" .*\"'")
+        if not name or len(name) > MAX_GENRE_LENGTH or len(name.split()) > MAX_GENRE_WORDS:
+            return None
+
+        key = _normalize(name)
+        with self._lock:
+            if key in self._builtin:
+                return self._names[key]
+
+            if key in self._learned:
+                self._learned.move_to_end(key)
+                return self._names[key]
+
+            self._insert(self._learned_keys, key, name)
+            self._learned[key] = None
+            while len(self._learned) > self.max_learned:
+                oldest, _ = self._learned.popitem(last=False)
+                self._remove_learned(oldest)
+            return name
+
+    def learned(self) -> List[str]:
+        """Genres learned from AI output, least recently seen first."""
+        with self._lock:
+            return [self._names[key] for key in self._learned]
+
+    def lookup(self, name: str, builtin_only: bool = False) -> Optional[str]:
+        """
+        Find the canonical spelling of a genre.
+
+        Args:
+            name: Genre name in any case
+            builtin_only: Ignore genres learned from AI output
+
+        Returns:
+            Canonical genre name, or None if unknown
+        """
+        key = _normalize(name)
+        if builtin_only and key not in self._builtin:
+            return None
+        return self._names.get(key)
+
+    def complete(self, prefix: str, limit: int = 25) -> List[str]:
+        """
+        Autocomplete genres starting with a prefix.
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of suggestions (Discord allows 25)
+
+        Returns:
+            Matching genre names, built-in genres first
+        """
+        key = _normalize(prefix)
+        with self._lock:
+            matches = self._complete_in(self._builtin_keys, key, limit)
+            if len(matches) < limit:
+                matches += self._complete_in(self._learned_keys, key, limit - len(matches))
+            return matches
+
+    def _complete_in(self, keys: List[str], prefix: str, limit: int) -> List[str]:
+        """Collect up to limit names from a sorted key list."""
+        matches = []
+        index = bisect.bisect_left(keys, prefix)
+        while index < len(keys) and len(matches) < limit:
+            candidate = keys[index]
+            if not candidate.startswith(prefix):
+                break
+            matches.append(self._names[candidate])
+            index += 1
+        return matches
+
+    def find_in(self, text: str) -> Optional[str]:
+        """
+        Find the first known genre mentioned in free text.
+
+        Args:
+            text: Text to scan (e.g. an unstructured AI response)
+
+        Returns:
+            Canonical name of the earliest mentioned genre (preferring the
+            longest match at that position), or None
+        """
+        words = [word.casefold() for word in _WORD_RE.findall(text)]
+        for start in range(len(words)):
+            for size in range(min(self._max_words, len(words) - start), 0, -1):
+                name = self._names.get(" ".join(words[start:start + size]))
+                if name is not None:
+                    return name
+        return None
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+# Global instance
+genre_index = GenreIndex()
@@ -0,0 +1,198 @@
+"""Generate per-team concepts for scheduled kickoffs ahead of the reveal."""
+
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+from config import (
+    KICKOFF_MAX_FIELD_LENGTH,
+    KICKOFF_STAGE_INTERVAL,
+    KICKOFF_TEMPLATE_CUTOFF,
+)
+from database.db_manager import DatabaseManager, db_manager
+from database.models import Kickoff
+from generators.load_shedder import load_shedder
+from generators.models import STRUCTURED_FIELDS, Concept
+from generators.seeds import ConceptCode, new_seed
+from generators.template_generator import template_generator
+from generators.worker_pool import generation_pool
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def concept_signature(concept: Concept) -> str:
+    """
+    Normalized identity of a concept, used to reject duplicates in a kickoff.
+
+    Two concepts with the same setting and core mechanic (ignoring case,
+    punctuation and word spacing) count as the same concept.
+    """
+    return "|".join(
+        " ".join(_WORD_RE.findall(value.lower()))
+        for value in (concept.setting, concept.mechanic)
+    )
+
+
+def validation_error(concept: Optional[Concept]) -> Optional[str]:
+    """
+    Check that a generated concept can be revealed as is.
+
+    Returns:
+        Reason the concept is rejected, or None if it is usable
+    """
+    if concept is None:
+        return "failed"
+    if not concept.is_ai:
+        return "template"
+    if not concept.is_complete:
+        return "incomplete"
+    for field in STRUCTURED_FIELDS:
+        value = getattr(concept, field)
+        if len(value) > KICKOFF_MAX_FIELD_LENGTH or "\n" in value:
+            return "malformed"
+    return None
+
+
+def _encode(concept: Concept, seed: int, kickoff: Kickoff) -> Concept:
+    concept.code = ConceptCode(
+        seed=seed,
+        difficulty=kickoff.difficulty,
+        genre=kickoff.genre,
+        is_ai=concept.is_ai
+    ).encode()
+    return concept
+
+
+class KickoffStager:
+    """
+    Fills scheduled kickoffs with validated, de-duplicated concepts.
+
+    A background task generates one AI concept at a time, only while the
+    generation pool is idle and no load is being shed, so staging soaks up
+    spare Ollama capacity in the hours before a reveal instead of every team
+    generating in the same minute. Concepts are stored in kickoff_concepts,
+    so staging resumes after a restart. Within KICKOFF_TEMPLATE_CUTOFF of
+    the reveal, teams still without a concept get template concepts.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager = db_manager,
+        interval: float = KICKOFF_STAGE_INTERVAL,
+        template_cutoff: float = KICKOFF_TEMPLATE_CUTOFF
+    ):
+        self.db = db
+        self.interval = interval
+        self.template_cutoff = template_cutoff
+        self._bot = None
+        self._task: Optional[asyncio.Task] = None
+        self.staged: Counter = Counter()
+        self.rejected: Counter = Counter()
+
+    def start(self, bot):
+        """Start the staging task on the running event loop."""
+        if self._task is not None:
+            return
+        self._bot = bot
+        self._task = asyncio.create_task(self._run(), name="kickoff-stager")
+
+    async def stop(self):
+        """Stop staging (staged concepts are already in the database)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self):
+        await self._bot.wait_until_ready()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self._stage_once()
+            except Exception as e:
+                logger.warning(f"Kickoff staging failed: {e}")
+
+    async def _stage_once(self):
+        kickoffs = [
+            kickoff for kickoff in await asyncio.to_thread(self.db.staging_kickoffs)
+            if kickoff.missing and (kickoff.guild_id is None or self._bot.owns_guild(kickoff.guild_id))
+        ]
+        if not kickoffs:
+            return
+
+        # Running out of time: the reveal must never wait on Ollama
+        now = time.time()
+        for kickoff in kickoffs:
+            if kickoff.reveal_at - now <= self.template_cutoff:
+                filled = await asyncio.to_thread(self.fill_with_templates, kickoff)
+                if filled:
+                    logger.info(f"Kickoff {kickoff.id}: filled {filled} team(s) with template concepts")
+
+        load_shedder.update()
+        if generation_pool.in_flight or load_shedder.shedding:
+            return
+        kickoff = next((kickoff for kickoff in kickoffs if kickoff.missing), None)
+        if kickoff is not None:
+            await self._stage_ai(kickoff)
+
+    async def _stage_ai(self, kickoff: Kickoff):
+        """Generate, validate and store one AI concept for a kickoff."""
+        seed = new_seed()
+        concept = await generation_pool.submit(
+            "generate_concept",
+            genre=kickoff.genre,
+            difficulty=kickoff.difficulty.value,
+            tone=kickoff.tone.value,
+            seed=seed
+        )
+        reason = validation_error(concept)
+        if reason is not None:
+            self.rejected[reason] += 1
+            return
+
+        _encode(concept, seed, kickoff)
+        if await asyncio.to_thread(self.db.add_kickoff_concept, kickoff, concept, concept_signature(concept)):
+            self.staged["ai"] += 1
+        else:
+            self.rejected["duplicate"] += 1
+
+    def fill_with_templates(self, kickoff: Kickoff) -> int:
+        """
+        Give every team still without a concept a template concept.
+
+        Blocking (database writes); call via asyncio.to_thread from the bot.
+
+        Returns:
+            Number of concepts added
+        """
+        added = 0
+        # Templates repeat now and then, so allow a few duplicate rolls per team
+        for _ in range(kickoff.missing * 10):
+            if not kickoff.missing:
+                break
+            seed = new_seed()
+            concept = _encode(
+                template_generator.generate_concept(
+                    genre=kickoff.genre,
+                    difficulty=kickoff.difficulty.value,
+                    seed=seed
+                ),
+                seed,
+                kickoff
+            )
+            if self.db.add_kickoff_concept(kickoff, concept, concept_signature(concept)):
+                added += 1
+        self.staged["template"] += added
+        return added
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"staged": dict(self.staged), "rejected": dict(self.rejected)}
+
+
+# Global instance
+kickoff_stager = KickoffStager()
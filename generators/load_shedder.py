@@ -0,0 +1,127 @@
+"""Adaptive load shedding: answer from templates while Ollama is saturated."""
+
+import logging
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+from config import (
+    LOAD_SHED_HIGH_WATERMARK,
+    LOAD_SHED_INTERVAL,
+    LOAD_SHED_LATENCY_TARGET,
+    LOAD_SHED_LOW_WATERMARK,
+    LOAD_SHED_QUEUE_LIMIT,
+    LOAD_SHED_STEP_DOWN,
+    LOAD_SHED_STEP_UP,
+    LOAD_SHED_WEIGHTS,
+)
+from generators.worker_pool import GenerationWorkerPool, generation_pool
+
+logger = logging.getLogger(__name__)
+
+# With no finished jobs for this long, the latency average is treated as stale
+LATENCY_STALE_AFTER = 15.0
+
+
+class LoadShedder:
+    """
+    Decides per command whether to use AI or degrade to templates.
+
+    Load is the larger of queue depth (relative to LOAD_SHED_QUEUE_LIMIT
+    queued jobs per worker) and average generation latency (relative to
+    LOAD_SHED_LATENCY_TARGET). Every interval, load above the high
+    watermark raises the shed fraction quickly; load below the low
+    watermark lowers it slowly; anything in between holds it, so the
+    controller does not flap around a single threshold.
+
+    Each command is shed with probability shed_fraction * its weight (capped
+    at 1), so cheap-to-replace commands (constraints) go to templates first
+    and concept generation keeps AI the longest. No weight is below 1, so at
+    a shed fraction of 1.0 every command is shed.
+    """
+
+    def __init__(
+        self,
+        pool: GenerationWorkerPool = generation_pool,
+        latency_target: float = LOAD_SHED_LATENCY_TARGET,
+        queue_limit: float = LOAD_SHED_QUEUE_LIMIT,
+        interval: float = LOAD_SHED_INTERVAL
+    ):
+        self.pool = pool
+        self.latency_target = latency_target
+        self.queue_limit = queue_limit
+        self.interval = interval
+        self.shed_fraction = 0.0
+        self.load = 0.0
+        self._last_update = 0.0
+        self._random = random.Random()
+        self.admitted: Counter = Counter()
+        self.shed: Counter = Counter()
+
+    def current_load(self, now: float) -> float:
+        """Load relative to capacity (1.0 = saturated)."""
+        queue_load = self.pool.queued / (self.queue_limit * self.pool.capacity)
+        latency = self.pool.latency
+        if self.pool.in_flight == 0 and now - self.pool.last_finished > LATENCY_STALE_AFTER:
+            # Nothing has run lately (e.g. everything was shed), so the old
+            # average says nothing about the current load
+            latency = 0.0
+        return max(queue_load, latency / self.latency_target)
+
+    def update(self, now: Optional[float] = None):
+        """Re-evaluate the load (at most once per interval)."""
+        if now is None:
+            now = time.monotonic()
+        if now - self._last_update < self.interval:
+            return
+        self._last_update = now
+        self.load = self.current_load(now)
+        previous = self.shed_fraction
+
+        if self.load > LOAD_SHED_HIGH_WATERMARK:
+            self.shed_fraction = min(1.0, self.shed_fraction + LOAD_SHED_STEP_UP)
+        elif self.load < LOAD_SHED_LOW_WATERMARK:
+            self.shed_fraction = max(0.0, self.shed_fraction - LOAD_SHED_STEP_DOWN)
+
+        if previous == 0.0 and self.shed_fraction > 0.0:
+            logger.warning(f"AI load {self.load:.2f}, starting to route commands to templates")
+        elif previous > 0.0 and self.shed_fraction == 0.0:
+            logger.info(f"AI load {self.load:.2f}, all commands back on AI")
+
+    def admit(self, command: str) -> bool:
+        """
+        Decide whether a command may use AI right now.
+
+        Args:
+            command: Slash command name (looked up in LOAD_SHED_WEIGHTS)
+
+        Returns:
+            True to use AI, False to answer from templates or cache instead
+        """
+        self.update()
+        chance = min(1.0, self.shed_fraction * max(1.0, LOAD_SHED_WEIGHTS.get(command, 1.0)))
+        if chance > 0 and self._random.random() < chance:
+            self.shed[command] += 1
+            return False
+        self.admitted[command] += 1
+        return True
+
+    @property
+    def shedding(self) -> bool:
+        return self.shed_fraction > 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current controller state and per-command counts."""
+        return {
+            "load": round(self.load, 2),
+            "shed_fraction": round(self.shed_fraction, 2),
+            "queued": self.pool.queued,
+            "in_flight": self.pool.in_flight,
+            "latency": round(self.pool.latency, 2),
+            "admitted": dict(self.admitted),
+            "shed": dict(self.shed),
+        }
+
+
+# Global instance
+load_shedder = LoadShedder()
@@ -0,0 +1,240 @@
+"""Typed records for generated game concepts."""
+
+import json
+import sys
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+class Difficulty(str, Enum):
+    """Concept difficulty levels."""
+
+    EASY = "easy"
+    MEDIUM = "medium"
+    HARD = "hard"
+    INSANE = "insane"
+
+    @classmethod
+    def parse(cls, value: Any, default: "Difficulty" = None) -> "Difficulty":
+        """
+        Convert user or stored input into a Difficulty.
+
+        Args:
+            value: A Difficulty, or a case-insensitive difficulty name
+            default: Returned when the value is not a known difficulty
+
+        Returns:
+            Matching Difficulty (MEDIUM if unknown and no default given)
+        """
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls(str(value).strip().lower())
+        except ValueError:
+            return default or cls.MEDIUM
+
+
+class Tone(str, Enum):
+    """Personality used for AI responses."""
+
+    ENCOURAGING = "encouraging"
+    SARCASTIC = "sarcastic"
+    NEUTRAL = "neutral"
+
+    @classmethod
+    def parse(cls, value: Any, default: "Tone" = None) -> "Tone":
+        """
+        Convert user or stored input into a Tone.
+
+        Args:
+            value: A Tone, or a case-insensitive tone name
+            default: Returned when the value is not a known tone
+
+        Returns:
+            Matching Tone (ENCOURAGING if unknown and no default given)
+        """
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls(str(value).strip().lower())
+        except ValueError:
+            return default or cls.ENCOURAGING
+
+
+# Fields every structured concept has
+STRUCTURED_FIELDS = ("genre", "setting", "mechanic", "theme")
+
+# Longest concept summary passed into follow-up prompts
+SUMMARY_MAX_LENGTH = 400
+
+# Bump when the serialized layout below changes
+SERIAL_VERSION = 2
+
+
+@dataclass(slots=True)
+class Concept:
+    """
+    A generated game concept.
+
+    Genres repeat across concepts, so they are interned; difficulty and tone
+    are enums. AI responses that could not be parsed into fields keep the raw
+    text in description instead.
+    """
+
+    genre: str = ""
+    setting: str = ""
+    mechanic: str = ""
+    theme: str = ""
+    constraint: str = ""
+    time_limit: int = 48  # hours
+    difficulty: Difficulty = Difficulty.MEDIUM
+    tone: Optional[Tone] = None
+    is_ai: bool = False
+    description: Optional[str] = None
+    code: Optional[str] = None  # shareable concept code (see generators/seeds.py)
+    # True if the model chose the genre itself; not serialized, only used to
+    # decide which genres are learned for autocomplete
+    genre_from_ai: bool = field(default=False, compare=False)
+
+    def __post_init__(self):
+        if self.genre:
+            self.genre = sys.intern(self.genre)
+        self.time_limit = int(self.time_limit)
+        self.difficulty = Difficulty.parse(self.difficulty)
+        if self.tone is not None:
+            self.tone = Tone.parse(self.tone)
+
+    @property
+    def is_complete(self) -> bool:
+        """True if all structured fields are present."""
+        return bool(self.genre and self.setting and self.mechanic and self.theme)
+
+    def summary(self, max_length: int = SUMMARY_MAX_LENGTH) -> str:
+        """
+        Compact one-line description for prompts that build on this concept.
+
+        Args:
+            max_length: Maximum summary length in characters
+
+        Returns:
+            "Genre: ...; Setting: ...; ..." (or the raw description if unparsed)
+        """
+        if self.is_complete:
+            parts = [
+                f"{field.title()}: {getattr(self, field)}"
+                for field in STRUCTURED_FIELDS
+            ]
+            if self.constraint:
+                parts.append(f"Constraint: {self.constraint}")
+            text = "; ".join(parts)
+        else:
+            text = " ".join((self.description or "").split())
+        if len(text) > max_length:
+            text = text[:max_length - 3].rstrip() + "..."
+        return text
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to a plain dictionary (enums become their string values).
+
+        Returns:
+            Dictionary of concept fields
+        """
+        return {
+            "genre": self.genre,
+            "setting": self.setting,
+            "mechanic": self.mechanic,
+            "theme": self.theme,
+            "constraint": self.constraint,
+            "time_limit": self.time_limit,
+            "difficulty": self.difficulty.value,
+            "tone": self.tone.value if self.tone else None,
+            "is_ai": self.is_ai,
+            "description": self.description,
+            "code": self.code,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Concept":
+        """
+        Build a concept from a dictionary produced by to_dict().
+
+        Args:
+            data: Dictionary of concept fields (unknown keys are ignored)
+
+        Returns:
+            Concept instance
+        """
+        return cls(
+            genre=data.get("genre", ""),
+            setting=data.get("setting", ""),
+            mechanic=data.get("mechanic", ""),
+            theme=data.get("theme", ""),
+            constraint=data.get("constraint", ""),
+            time_limit=data.get("time_limit", 48),
+            difficulty=data.get("difficulty", Difficulty.MEDIUM),
+            tone=data.get("tone"),
+            is_ai=bool(data.get("is_ai", False)),
+            description=data.get("description"),
+            code=data.get("code"),
+        )
+
+    def to_json(self) -> str:
+        """
+        Serialize to a compact positional JSON array.
+
+        Returns:
+            JSON string (field names are not repeated per record)
+        """
+        return json.dumps(
+            [
+                SERIAL_VERSION,
+                self.genre,
+                self.setting,
+                self.mechanic,
+                self.theme,
+                self.constraint,
+                self.time_limit,
+                self.difficulty.value,
+                self.tone.value if self.tone else None,
+                int(self.is_ai),
+                self.description,
+                self.code,
+            ],
+            ensure_ascii=False,
+            separators=(",", ":")
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> "Concept":
+        """
+        Deserialize a concept produced by to_json().
+
+        Args:
+            data: JSON string
+
+        Returns:
+            Concept instance
+        """
+        values = json.loads(data)
+        version = values[0]
+        if version == 1:
+            values.append(None)  # version 1 had no code
+        elif version != SERIAL_VERSION:
+            raise ValueError(f"Unsupported concept serialization version: {version}")
+        (_, genre, setting, mechanic, theme, constraint,
+         time_limit, difficulty, tone, is_ai, description, code) = values
+        return cls(
+            genre=genre,
+            setting=setting,
+            mechanic=mechanic,
+            theme=theme,
+            constraint=constraint,
+            time_limit=time_limit,
+            difficulty=difficulty,
+            tone=tone,
+            is_ai=bool(is_ai),
+            description=description,
+            code=code,
+        )
@@ -0,0 +1,150 @@
+"""Short shareable codes for reproducible concept generation."""
+
+import random
+from dataclasses import dataclass
+from typing import List, Optional
+from config import SEED_CACHE_SIZE
+from generators.models import Concept, Difficulty
+from generators.categories import GENRES
+from utils.cache import LRUCache
+
+# Crockford-style base32 (no i, l, o, u) so codes are easy to read aloud
+CODE_ALPHABET = "0123456789abcdefghjkmnpqrstvwxyz"
+CODE_LENGTH = 8  # 40 bits
+
+SEED_BITS = 31
+DIFFICULTY_ORDER = list(Difficulty)
+# Genres are encoded by position in GENRES, so new genres must be appended
+GENRE_BITS = 6
+
+_system_random = random.SystemRandom()
+
+
+def new_seed() -> int:
+    """Pick a fresh random seed for a concept."""
+    return _system_random.getrandbits(SEED_BITS)
+
+
+@dataclass(frozen=True)
+class ConceptCode:
+    """
+    Everything needed to regenerate a concept: the seed, the requested
+    difficulty and genre, and whether it was generated by AI or templates.
+
+    Only genres from the built-in GENRES list can be encoded; a concept
+    requested with a custom genre is encoded as "any genre".
+    """
+
+    seed: int
+    difficulty: Difficulty = Difficulty.MEDIUM
+    genre: Optional[str] = None
+    is_ai: bool = False
+
+    def encode(self) -> str:
+        """
+        Pack the code into a short base32 string.
+
+        Returns:
+            CODE_LENGTH character code
+        """
+        genre_index = 0
+        if self.genre:
+            lowered = self.genre.lower()
+            for index, name in enumerate(GENRES, start=1):
+                if name.lower() == lowered:
+                    genre_index = index
+                    break
+
+        value = self.seed & ((1 << SEED_BITS) - 1)
+        value |= DIFFICULTY_ORDER.index(self.difficulty) << SEED_BITS
+        value |= genre_index << (SEED_BITS + 2)
+        value |= int(self.is_ai) << (SEED_BITS + 2 + GENRE_BITS)
+
+        chars = []
+        for _ in range(CODE_LENGTH):
+            value, digit = divmod(value, 32)
+            chars.append(CODE_ALPHABET[digit])
+        return "".join(reversed(chars))
+
+    @classmethod
+    def decode(cls, code: str) -> Optional["ConceptCode"]:
+        """
+        Unpack a code produced by encode().
+
+        Args:
+            code: Concept code (case-insensitive, surrounding spaces ignored)
+
+        Returns:
+            Decoded ConceptCode, or None if the code is malformed
+        """
+        code = code.strip().lower()
+        if len(code) != CODE_LENGTH:
+            return None
+
+        value = 0
+        for char in code:
+            digit = CODE_ALPHABET.find(char)
+            if digit < 0:
+                return None
+            value = value * 32 + digit
+
+        seed = value & ((1 << SEED_BITS) - 1)
+        difficulty_index = (value >> SEED_BITS) & 0b11
+        genre_index = (value >> (SEED_BITS + 2)) & ((1 << GENRE_BITS) - 1)
+        is_ai = bool(value >> (SEED_BITS + 2 + GENRE_BITS))
+
+        if genre_index > len(GENRES):
+            return None
+
+        return cls(
+            seed=seed,
+            difficulty=DIFFICULTY_ORDER[difficulty_index],
+            genre=GENRES[genre_index - 1] if genre_index else None,
+            is_ai=is_ai
+        )
+
+
+class SeedCache:
+    """Concepts keyed by (code, tone), so re-shared codes cost a lookup."""
+
+    def __init__(self, maxsize: int = SEED_CACHE_SIZE):
+        self._cache = LRUCache(maxsize)
+
+    def get(self, code: str, tone: str) -> Optional[Concept]:
+        return self._cache.get((code.strip().lower(), tone))
+
+    def put(self, concept: Concept, tone: str):
+        if concept.code:
+            self._cache.put((concept.code, tone), concept)
+
+    @property
+    def cache(self) -> LRUCache:
+        return self._cache
+
+    def dump(self) -> List[list]:
+        """Cached entries as [code, tone, concept JSON], oldest first."""
+        return [[code, tone, concept.to_json()] for (code, tone), concept in self._cache.items()]
+
+    def restore(self, entries: List[list]) -> int:
+        """
+        Reload entries produced by dump().
+
+        Args:
+            entries: [code, tone, concept JSON] triples, oldest first
+
+        Returns:
+            Number of entries restored (malformed ones are skipped)
+        """
+        restored = 0
+        for entry in entries:
+            try:
+                code, tone, data = entry
+                self._cache.put((code, tone), Concept.from_json(data))
+            except (TypeError, ValueError, IndexError):
+                continue
+            restored += 1
+        return restored
+
+
+# Global instance
+seed_cache = SeedCache()
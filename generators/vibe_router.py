@@ -0,0 +1,256 @@
+"""Answer stock vibe check messages locally instead of calling the LLM."""
+
+import logging
+import math
+import random
+import re
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+from config import DEFAULT_TONE, TOKEN_USAGE_LOG_INTERVAL
+from generators.categories import VIBE_RESPONSE_BANK
+from generators.models import Tone
+
+logger = logging.getLogger(__name__)
+
+# Keywords and phrases per mood bucket (matched on lowercased words)
+MOOD_KEYWORDS = {
+    "checking_in": (
+        "checking in", "check in", "just checking", "hi", "hello", "hey", "sup", "yo",
+        "vibe check", "vibes", "status", "how am i doing", "what's up",
+    ),
+    "tired": (
+        "tired", "exhausted", "sleepy", "sleep", "no sleep", "need sleep", "burnt out",
+        "burned out", "burnout", "coffee", "caffeine", "drained", "zombie", "awake",
+        "all nighter", "all-nighter",
+    ),
+    "stuck": (
+        "stuck", "bug", "bugs", "buggy", "broken", "crash", "crashing", "error", "errors",
+        "not working", "doesn't work", "won't work", "debugging", "cant figure", "can't figure",
+        "no idea why", "confused",
+    ),
+    "behind": (
+        "behind", "late", "deadline", "running out of time", "out of time", "no time",
+        "too much scope", "scope", "scope creep", "won't finish", "not going to finish",
+        "time crunch", "hours left",
+    ),
+    "going_well": (
+        "good", "great", "going well", "awesome", "done", "finished", "working", "it works",
+        "progress", "happy", "on track", "nailed it", "shipped", "productive",
+    ),
+    "stressed": (
+        "stressed", "stress", "anxious", "overwhelmed", "panic", "panicking", "freaking out",
+        "give up", "giving up", "quit", "hate", "frustrated", "ugh", "help",
+    ),
+}
+
+# Words that flip the mood of what follows ("not good", "nothing is working").
+# A message with a negator outside a matched phrase ("not working" is a
+# phrase) goes to the LLM, as does any word ending in "n't".
+NEGATORS = frozenset((
+    "not", "no", "never", "nothing", "nobody", "none", "nowhere", "neither", "nor",
+    "cannot", "cant", "dont", "doesnt", "didnt", "isnt", "wasnt", "arent", "wont",
+    "aint", "havent", "hasnt", "couldnt", "shouldnt", "wouldnt", "barely", "hardly",
+))
+
+# Expected routing for representative messages (None = goes to the LLM);
+# run `python -m generators.vibe_router` after changing the keyword lists
+EXAMPLE_ROUTES = (
+    ("", "checking_in"),
+    ("vibe check", "checking_in"),
+    ("so tired", "tired"),
+    ("no sleep", "tired"),
+    ("stuck on bugs", "stuck"),
+    ("it's not working", "stuck"),
+    ("running out of time", "behind"),
+    ("going well", "going_well"),
+    ("feeling great", "going_well"),
+    ("overwhelmed", "stressed"),
+    ("nothing is working", None),
+    ("not good", None),
+    ("no progress", None),
+    ("not happy", None),
+    ("not done", None),
+    ("never finished", None),
+    ("i dont feel good", None),
+    ("i don't feel good", None),
+    ("not tired", None),
+    ("isn't going well", None),
+)
+
+# Filler words that do not change a message's mood
+STOPWORDS = frozenset((
+    "i", "im", "i'm", "am", "a", "an", "the", "so", "very", "really", "just", "and", "is",
+    "it", "its", "it's", "my", "me", "feeling", "feel", "bit", "kinda", "kind", "of",
+    "super", "too", "on", "with", "again", "still", "all", "this", "to", "been", "have",
+    "getting", "now", "pretty", "lol", "lmao", "rn", "right", "today", "tonight", "quite",
+    "somewhat", "extremely", "totally", "but", "are", "we", "our", "us", "be",
+))
+
+# Messages with more content words than this are "rich" and go to the LLM
+MAX_TRIVIAL_WORDS = 6
+# Share of content words a mood's keywords must cover
+MIN_COVERAGE = 0.5
+# Best mood score must beat the runner-up by this factor
+MIN_MARGIN = 1.5
+MAX_PHRASE_WORDS = 4
+
+_WORD_RE = re.compile(r"[a-z0-9']+(?:-[a-z0-9']+)*")
+
+
+def _build_weights() -> Dict[str, Dict[str, float]]:
+    """Inverse-document-frequency weight of each phrase per mood it appears in."""
+    document_frequency = Counter(
+        phrase for phrases in MOOD_KEYWORDS.values() for phrase in set(phrases)
+    )
+    moods = len(MOOD_KEYWORDS)
+    weights: Dict[str, Dict[str, float]] = {}
+    for mood, phrases in MOOD_KEYWORDS.items():
+        for phrase in phrases:
+            # Multi-word phrases are more specific than single words
+            idf = math.log(1 + moods / document_frequency[phrase])
+            weights.setdefault(phrase, {})[mood] = idf * len(phrase.split())
+    return weights
+
+
+PHRASE_WEIGHTS = _build_weights()
+
+
+def _is_negator(word: str) -> bool:
+    return word in NEGATORS or word.endswith("n't")
+
+
+class VibeRouterStats:
+    """How many vibe checks were answered locally versus by the LLM."""
+
+    def __init__(self):
+        self.total = 0
+        self.local = Counter()
+        self.escalated = 0
+        self.llm_calls = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        local = sum(self.local.values())
+        return {
+            "vibe_checks": self.total,
+            "answered_locally": local,
+            "escalated": self.escalated,
+            "llm_calls": self.llm_calls,
+            "hit_rate": round(local / self.total, 3) if self.total else None,
+            "llm_calls_per_check": round(self.llm_calls / self.total, 3) if self.total else None,
+            "by_mood": dict(self.local),
+        }
+
+
+class VibeRouter:
+    """
+    Keyword/IDF classifier that sorts vibe check messages into mood buckets.
+
+    Empty messages and short stock phrases ("tired", "stuck on bugs") that
+    clearly match one mood are answered from VIBE_RESPONSE_BANK for the
+    caller's tone. Longer, mixed or unfamiliar messages return None and
+    should go to the LLM.
+    """
+
+    def __init__(self, bank: Dict[str, Dict[str, Tuple[str, ...]]] = VIBE_RESPONSE_BANK):
+        self.bank = bank
+        self.stats = VibeRouterStats()
+        self._random = random.Random()
+
+    def classify(self, message: str) -> Optional[str]:
+        """
+        Find the mood of a trivial message.
+
+        Args:
+            message: Vibe check text (may be empty)
+
+        Returns:
+            Mood bucket name, or None if the message needs the LLM
+        """
+        words = _WORD_RE.findall(message.lower())
+        content = [word for word in words if word not in STOPWORDS]
+        if not content:
+            return "checking_in"
+        if len(content) > MAX_TRIVIAL_WORDS:
+            return None
+
+        scores: Counter = Counter()
+        covered = set()
+        for start in range(len(words)):
+            for size in range(min(MAX_PHRASE_WORDS, len(words) - start), 0, -1):
+                phrase = " ".join(words[start:start + size])
+                moods = PHRASE_WEIGHTS.get(phrase)
+                if moods:
+                    scores.update(moods)
+                    covered.update(range(start, start + size))
+                    break
+
+        if not scores:
+            return None
+        # A negator the matched phrases do not account for may invert the mood
+        if any(_is_negator(word) for index, word in enumerate(words) if index not in covered):
+            return None
+        matched = sum(1 for index in covered if words[index] not in STOPWORDS)
+        if matched / len(content) < MIN_COVERAGE:
+            return None
+
+        ranked = scores.most_common(2)
+        if len(ranked) > 1 and ranked[0][1] < ranked[1][1] * MIN_MARGIN:
+            return None
+        return ranked[0][0]
+
+    def route(self, message: str, tone: str = DEFAULT_TONE) -> Optional[str]:
+        """
+        Answer a vibe check locally if it is trivial.
+
+        Args:
+            message: Vibe check text
+            tone: Response tone
+
+        Returns:
+            Canned response, or None if the message should go to the LLM
+        """
+        self.stats.total += 1
+        mood = self.classify(message)
+        if mood is None:
+            self.stats.escalated += 1
+            self._maybe_log()
+            return None
+
+        self.stats.local[mood] += 1
+        self._maybe_log()
+        responses = self.bank[mood][Tone.parse(tone).value]
+        return self._random.choice(responses)
+
+    def record_llm_call(self):
+        """Count an escalated vibe check that actually reached the LLM."""
+        self.stats.llm_calls += 1
+
+    def _maybe_log(self):
+        if self.stats.total % TOKEN_USAGE_LOG_INTERVAL == 0:
+            logger.info(f"Vibe check routing: {self.stats.snapshot()}")
+
+
+# Global instance
+vibe_router = VibeRouter()
+
+
+def check_examples(router: Optional[VibeRouter] = None) -> int:
+    """
+    Classify every EXAMPLE_ROUTES message and print the mismatches.
+
+    Returns:
+        Number of messages routed differently than expected
+    """
+    router = router or vibe_router
+    failures = 0
+    for message, expected in EXAMPLE_ROUTES:
+        mood = router.classify(message)
+        if mood != expected:
+            failures += 1
+            print(f"{message!r}: expected {expected}, got {mood}")
+    print(f"{len(EXAMPLE_ROUTES) - failures}/{len(EXAMPLE_ROUTES)} example messages routed as expected")
+    return failures
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if check_examples() else 0)
@@ -0,0 +1,219 @@
+"""Pre-generated AI concepts, so common requests are answered instantly."""
+
+import asyncio
+import logging
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional, Tuple
+from config import (
+    DEFAULT_TONE,
+    WARM_POOL_INTERVAL,
+    WARM_POOL_MAX_KEYS,
+    WARM_POOL_SIZE,
+)
+from database.preferences import preference_store
+from generators.genre_index import genre_index
+from generators.load_shedder import load_shedder
+from generators.models import Concept, Difficulty, Tone
+from generators.seeds import ConceptCode, new_seed
+from generators.worker_pool import generation_pool
+
+logger = logging.getLogger(__name__)
+
+# (genre or None for "any", difficulty, tone)
+WarmKey = Tuple[Optional[str], str, str]
+
+# Demand counts are halved this often (in refill ticks) so old requests fade
+DEMAND_DECAY_TICKS = 30
+
+
+def warm_key(genre: Optional[str], difficulty, tone) -> Optional[WarmKey]:
+    """
+    Pool key for a concept request.
+
+    Args:
+        genre: Requested genre (None = any)
+        difficulty: Difficulty or difficulty name
+        tone: Tone or tone name
+
+    Returns:
+        Key, or None for custom genres (those are never pre-generated)
+    """
+    if genre:
+        genre = genre_index.lookup(genre, builtin_only=True)
+        if genre is None:
+            return None
+    return (genre, Difficulty.parse(difficulty).value, Tone.parse(tone).value)
+
+
+class WarmPool:
+    """
+    Keeps a few AI concepts ready for the most wanted (genre, difficulty, tone) keys.
+
+    Keys come from the default settings, every cached guild preference and
+    recent demand. A background task tops up one concept at a time, and only
+    while no user generation is running, so prefilling never competes with
+    real requests for Ollama.
+    """
+
+    def __init__(
+        self,
+        per_key: int = WARM_POOL_SIZE,
+        max_keys: int = WARM_POOL_MAX_KEYS,
+        interval: float = WARM_POOL_INTERVAL
+    ):
+        self.per_key = per_key
+        self.max_keys = max_keys
+        self.interval = interval
+        self._concepts: Dict[WarmKey, Deque[Concept]] = {}
+        self._demand: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+        self._ticks = 0
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+
+    def start(self):
+        """Start the refill task on the running event loop."""
+        if self.per_key <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="warm-pool")
+        logger.info(f"Warm pool started ({self.per_key} concept(s) for up to {self.max_keys} keys)")
+
+    async def stop(self):
+        """Stop refilling (pooled concepts are kept for the checkpoint)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def __len__(self) -> int:
+        """Number of pre-generated concepts held."""
+        return sum(len(concepts) for concepts in self._concepts.values())
+
+    def take(self, key: Optional[WarmKey]) -> Optional[Concept]:
+        """
+        Take a ready concept for a request.
+
+        Args:
+            key: Key from warm_key() (None never matches)
+
+        Returns:
+            A pre-generated concept (its code is already set), or None
+        """
+        if key is None:
+            return None
+        self._demand[key] += 1
+        concepts = self._concepts.get(key)
+        if concepts:
+            self.hits += 1
+            return concepts.popleft()
+        self.misses += 1
+        return None
+
+    def wanted_keys(self) -> List[WarmKey]:
+        """Keys to keep filled, most important first."""
+        keys = [warm_key(None, Difficulty.MEDIUM, DEFAULT_TONE)]
+
+        # What each guild has asked for by default
+        for preferences in preference_store.guild_preferences():
+            tone = preferences.tone or DEFAULT_TONE
+            difficulty = preferences.difficulty or Difficulty.MEDIUM
+            for genre in preferences.favorite_genres or (None,):
+                keys.append(warm_key(genre, difficulty, tone))
+
+        keys.extend(key for key, _ in self._demand.most_common(self.max_keys))
+
+        wanted = []
+        for key in keys:
+            if key is not None and key not in wanted:
+                wanted.append(key)
+        return wanted[:self.max_keys]
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self._refill_once()
+            except Exception as e:
+                logger.warning(f"Warm pool refill failed: {e}")
+
+    async def _refill_once(self):
+        self._ticks += 1
+        if self._ticks % DEMAND_DECAY_TICKS == 0:
+            self._decay_demand()
+
+        # Users first: only prefill while the generation pool is idle and
+        # nothing is being shed (updating here lets shedding wind down
+        # even when no commands arrive)
+        load_shedder.update()
+        if generation_pool.in_flight or load_shedder.shedding:
+            return
+
+        for key in self.wanted_keys():
+            if len(self._concepts.get(key, ())) < self.per_key:
+                await self._generate(key)
+                return
+
+    async def _generate(self, key: WarmKey):
+        genre, difficulty, tone = key
+        seed = new_seed()
+        concept = await generation_pool.submit(
+            "generate_concept",
+            genre=genre,
+            difficulty=difficulty,
+            tone=tone,
+            seed=seed
+        )
+        # Template fallbacks are instant anyway, so only AI concepts are pooled
+        if concept is None or not concept.is_ai:
+            return
+        concept.code = ConceptCode(
+            seed=seed,
+            difficulty=Difficulty.parse(difficulty),
+            genre=genre,
+            is_ai=True
+        ).encode()
+        self._concepts.setdefault(key, deque()).append(concept)
+        self.generated += 1
+
+    def _decay_demand(self):
+        for key in list(self._demand):
+            self._demand[key] //= 2
+            if not self._demand[key]:
+                del self._demand[key]
+
+    def dump(self) -> List[list]:
+        """Pooled concepts as [genre, difficulty, tone, concept JSON]."""
+        return [
+            [genre, difficulty, tone, concept.to_json()]
+            for (genre, difficulty, tone), concepts in self._concepts.items()
+            for concept in concepts
+        ]
+
+    def restore(self, entries: List[list]) -> int:
+        """
+        Reload concepts produced by dump().
+
+        Returns:
+            Number of concepts restored (malformed entries are skipped)
+        """
+        restored = 0
+        for entry in entries:
+            try:
+                genre, difficulty, tone, data = entry
+                key = warm_key(genre, difficulty, tone)
+                concept = Concept.from_json(data)
+            except (TypeError, ValueError, IndexError):
+                continue
+            if key is None:
+                continue
+            concepts = self._concepts.setdefault(key, deque())
+            if len(concepts) < self.per_key:
+                concepts.append(concept)
+                restored += 1
+        return restored
+
+
+# Global instance
+warm_pool = WarmPool()
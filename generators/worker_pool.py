@@ -0,0 +1,214 @@
+"""Generation worker pool that keeps AI calls off the gateway event loop."""
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from ai.ollama_client import TokenUsage, get_ollama_client
+from config import GenerationSettings, TOKEN_USAGE_LOG_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the job latency moving average
+LATENCY_SMOOTHING = 0.2
+
+# AIGenerator methods that may be run as jobs
+ALLOWED_JOBS = {
+    "generate_concept",
+    "generate_constraint",
+    "generate_commentary",
+    "generate_vibe_check",
+    "generate_jam_summary",
+}
+
+
+def _init_worker():
+    """Prepare a worker process (Ctrl+C is handled by the bot process)."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - worker - %(name)s - %(levelname)s - %(message)s'
+    )
+
+
+def _run_job(method: str, kwargs: dict) -> Any:
+    """Run one generation job. Executes inside the worker process or thread."""
+    from generators.ai_generator import get_ai_generator
+    return getattr(get_ai_generator(), method)(**kwargs)
+
+
+def _run_worker_job(method: str, kwargs: dict) -> Tuple[Any, Dict[str, Dict[str, float]]]:
+    """
+    Run one job in a worker process and hand back the tokens it used.
+
+    A worker runs one job at a time, so what its client recorded since the
+    last job belongs to this one.
+    """
+    result = _run_job(method, kwargs)
+    return result, get_ollama_client().usage.drain()
+
+
+class GenerationWorkerPool:
+    """
+    Runs AIGenerator jobs in worker processes (or threads).
+
+    With GENERATION_WORKERS > 0, jobs are pickled onto a multiprocessing queue
+    and executed by separate worker processes, so a slow or misbehaving
+    generation can never delay gateway heartbeats. With GENERATION_WORKERS = 0
+    jobs run on a thread pool inside the bot process instead.
+    """
+
+    def __init__(self, settings: Optional[GenerationSettings] = None):
+        """
+        Args:
+            settings: Pool size (read from the environment on first use if omitted)
+        """
+        self._settings = settings
+        self._executor: Optional[Executor] = None
+        self._idle: Optional[asyncio.Event] = None
+        # Token counts sent back by worker processes (unused in thread mode)
+        self.usage = TokenUsage()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        # Exponential moving average of submit-to-result time (queueing included)
+        self.latency = 0.0
+        self.last_finished = 0.0
+
+    @property
+    def settings(self) -> GenerationSettings:
+        if self._settings is None:
+            self._settings = GenerationSettings.from_env()
+        return self._settings
+
+    @property
+    def workers(self) -> int:
+        return self.settings.workers
+
+    @property
+    def threads(self) -> int:
+        return self.settings.threads
+
+    @property
+    def mode(self) -> str:
+        return "process" if self.workers > 0 else "thread"
+
+    @property
+    def capacity(self) -> int:
+        """Number of jobs that can run at once."""
+        return self.workers if self.workers > 0 else self.threads
+
+    @property
+    def queued(self) -> int:
+        """Jobs waiting for a free worker."""
+        return max(0, self.in_flight - self.capacity)
+
+    def start(self):
+        """Create the underlying executor (safe to call more than once)."""
+        if self._executor is not None:
+            return
+
+        if self.workers > 0:
+            # "spawn" avoids forking the gateway connection and event loop
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.threads,
+                thread_name_prefix="generation"
+            )
+        logger.info(f"Generation pool started ({self.mode} mode, {self.workers or self.threads} workers)")
+
+    async def submit(self, method: str, **kwargs) -> Any:
+        """
+        Run an AIGenerator method in the pool and wait for its result.
+
+        Args:
+            method: Name of the AIGenerator method (e.g. "generate_concept")
+            **kwargs: Keyword arguments for the method (must be picklable)
+
+        Returns:
+            Whatever the generator method returns
+        """
+        if method not in ALLOWED_JOBS:
+            raise ValueError(f"Unknown generation job: {method}")
+
+        self.start()
+        loop = asyncio.get_running_loop()
+        if self._idle is None:
+            self._idle = asyncio.Event()
+        self.in_flight += 1
+        self._idle.clear()
+        start = time.monotonic()
+        try:
+            if self.mode == "process":
+                result, usage = await loop.run_in_executor(self._executor, _run_worker_job, method, kwargs)
+                self._merge_usage(usage)
+            else:
+                result = await loop.run_in_executor(self._executor, _run_job, method, kwargs)
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self._idle.set()
+            self.last_finished = time.monotonic()
+            elapsed = self.last_finished - start
+            self.latency += LATENCY_SMOOTHING * (elapsed - self.latency)
+
+    def _merge_usage(self, usage: Dict[str, Dict[str, float]]):
+        """Add a worker job's token counts, logging the averages now and then."""
+        before = self.usage.requests
+        self.usage.merge(usage)
+        if self.usage.requests // TOKEN_USAGE_LOG_INTERVAL > before // TOKEN_USAGE_LOG_INTERVAL:
+            logger.info(f"Ollama token usage: {self.usage.snapshot()}")
+
+    def token_usage(self) -> Dict[str, Dict[str, float]]:
+        """
+        Average Ollama token usage per task, across every worker.
+
+        Returns:
+            TokenUsage.snapshot() of the jobs run so far
+        """
+        if self.mode == "process":
+            return self.usage.snapshot()
+        return get_ollama_client().usage.snapshot()
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Wait for jobs that are already running to finish.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the pool is idle, False if jobs were still running at the deadline
+        """
+        if self.in_flight == 0:
+            return True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.in_flight} generation(s) still running after {timeout}s")
+            return False
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info("Generation pool stopped")
+
+
+# Global instance
+generation_pool = GenerationWorkerPool()
@@ -0,0 +1,374 @@
+"""Export, import and archive jam history stored in DATABASE_PATH.
+
+Usage:
+    python jam_history.py export --output history.ndjson
+    python jam_history.py export --format csv --table updates --guild 1234 --since 2024-01-01
+    python jam_history.py import history.ndjson
+    python jam_history.py archive --older-than 90 --archive ./data/jam_archive.db
+
+Exports stream rows straight from a database cursor, so memory use stays
+flat however much history there is. NDJSON exports hold every table (one
+object per line, tagged with "table") and can be fed back to `import`; CSV
+exports hold one table. Filters apply to a jam's start time, a concept's
+creation time and (for updates) the jam they belong to.
+
+`archive` moves completed jams (with their updates) and generated concepts
+older than the cutoff into a separate database file, keeping the live
+tables small. Jam stats are unaffected: they come from running counters,
+which keep archived history. The live database remembers which rows were
+archived, so importing an export taken before the archive run skips them
+instead of restoring them and counting them twice.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+from config import DATABASE_PATH
+from database.db_manager import DatabaseManager
+from database.models import JamSession, ProgressUpdate
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - jam_history - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stderr)]
+)
+logger = logging.getLogger(__name__)
+
+# Import order matters: updates reference jams
+TABLES = ("jams", "updates", "concepts")
+TABLE_COLUMNS = {
+    "jams": ("id", "guild_id", "channel_id", "name", "duration_hours", "created_by",
+             "start_time", "completed", "completed_time", "update_count"),
+    "updates": ("id", "jam_id", "user_id", "message", "hours_elapsed", "timestamp"),
+    "concepts": ("id", "guild_id", "channel_id", "user_id", "created_at", "code", "is_ai", "data"),
+}
+
+DEFAULT_BATCH_SIZE = 500
+FETCH_SIZE = 1000
+
+
+def parse_date(value: str) -> float:
+    """Parse YYYY-MM-DD (or a full ISO timestamp, UTC if no offset) into a Unix timestamp."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _filters(
+    table: str,
+    guild_id: Optional[int],
+    since: Optional[float],
+    until: Optional[float]
+) -> Tuple[str, List[Any]]:
+    """Build the FROM/WHERE part of an export query for one table."""
+    if table == "updates":
+        # Updates are filtered by the jam they belong to
+        source = "progress_updates AS u JOIN jams AS j ON j.id = u.jam_id"
+        time_column, guild_column = "j.start_time", "j.guild_id"
+    elif table == "jams":
+        source = "jams AS j"
+        time_column, guild_column = "j.start_time", "j.guild_id"
+    else:
+        source = "generated_concepts AS c"
+        time_column, guild_column = "c.created_at", "c.guild_id"
+
+    clauses, params = [], []
+    if guild_id is not None:
+        clauses.append(f"{guild_column} = ?")
+        params.append(guild_id)
+    if since is not None:
+        clauses.append(f"{time_column} >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append(f"{time_column} < ?")
+        params.append(until)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return source + where, params
+
+
+def iter_rows(
+    conn: sqlite3.Connection,
+    table: str,
+    guild_id: Optional[int] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None
+) -> Iterator[sqlite3.Row]:
+    """
+    Stream rows of one table, FETCH_SIZE at a time.
+
+    Args:
+        conn: Database connection
+        table: "jams", "updates" or "concepts"
+        guild_id: Only rows from this guild
+        since: Only rows at or after this Unix timestamp
+        until: Only rows before this Unix timestamp
+
+    Yields:
+        Rows in TABLE_COLUMNS[table] order
+    """
+    alias = {"jams": "j", "updates": "u", "concepts": "c"}[table]
+    columns = ", ".join(f"{alias}.{column}" for column in TABLE_COLUMNS[table])
+    source, params = _filters(table, guild_id, since, until)
+    cursor = conn.execute(f"SELECT {columns} FROM {source}", params)
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            return
+        yield from rows
+
+
+def export_ndjson(
+    conn: sqlite3.Connection,
+    output: TextIO,
+    tables: Tuple[str, ...] = TABLES,
+    **filters
+) -> Dict[str, int]:
+    """
+    Write tables as NDJSON, one {"table": ..., <columns>} object per line.
+
+    Returns:
+        Rows written per table
+    """
+    counts = {}
+    for table in tables:
+        counts[table] = 0
+        for row in iter_rows(conn, table, **filters):
+            record = {"table": table}
+            record.update(zip(TABLE_COLUMNS[table], row))
+            output.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            counts[table] += 1
+    return counts
+
+
+def export_csv(conn: sqlite3.Connection, output: TextIO, table: str, **filters) -> Dict[str, int]:
+    """
+    Write one table as CSV with a header row.
+
+    Returns:
+        Rows written
+    """
+    writer = csv.writer(output)
+    writer.writerow(TABLE_COLUMNS[table])
+    count = 0
+    for row in iter_rows(conn, table, **filters):
+        writer.writerow(tuple(row))
+        count += 1
+    return {table: count}
+
+
+def _parse_record(table: str, record: Dict[str, Any]) -> Any:
+    """Turn an NDJSON record into what DatabaseManager's import methods take."""
+    values = {column: record[column] for column in TABLE_COLUMNS[table]}
+    if table == "jams":
+        return JamSession(**values)
+    if table == "updates":
+        return ProgressUpdate(**values)
+    # Concept IDs are reassigned on import
+    return tuple(values[column] for column in TABLE_COLUMNS[table] if column != "id")
+
+
+def _insert_batch(db: DatabaseManager, table: str, rows: List[Any]) -> int:
+    if table == "jams":
+        return db.import_jams(rows)
+    if table == "updates":
+        return db.import_updates(rows)
+    return db.import_concepts(rows)
+
+
+def import_ndjson(
+    db: DatabaseManager,
+    source: TextIO,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    Load an NDJSON export, batch_size rows per transaction.
+
+    Jams and updates that already exist (same ID), concepts identical to a
+    stored one and rows moved out by archive() are skipped, so re-importing
+    a file is harmless. Concepts
+    get new IDs. Imported rows are added to the jam stats counters. Jams
+    must appear before their updates, as they do in export_ndjson() output.
+
+    Returns:
+        Rows inserted per table
+    """
+    counts = {table: 0 for table in TABLES}
+    batches: Dict[str, List[Any]] = {table: [] for table in TABLES}
+
+    for line_number, line in enumerate(source, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            table = record["table"]
+            row = _parse_record(table, record)
+        except (json.JSONDecodeError, KeyError, TypeError):
+            logger.warning(f"Skipping malformed line {line_number}")
+            continue
+
+        batch = batches[table]
+        batch.append(row)
+        if len(batch) >= batch_size:
+            # Flush parents first so foreign keys resolve
+            for name in TABLES[:TABLES.index(table) + 1]:
+                if batches[name]:
+                    counts[name] += _insert_batch(db, name, batches[name])
+                    batches[name] = []
+
+    for table in TABLES:
+        if batches[table]:
+            counts[table] += _insert_batch(db, table, batches[table])
+    return counts
+
+
+def archive(
+    conn: sqlite3.Connection,
+    archive_path: str,
+    cutoff: float,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    Move completed jams and concepts older than cutoff into another database.
+
+    Each batch is copied and deleted in one transaction, so an interrupted
+    run never loses or duplicates rows and can simply be restarted.
+
+    Args:
+        conn: Live database connection
+        archive_path: Archive database file (created if missing)
+        cutoff: Unix timestamp; jams completed and concepts created before it are moved
+        batch_size: Rows moved per transaction
+
+    Returns:
+        Rows moved per table
+    """
+    # Opening the archive creates its schema; then attach it to the live connection
+    archive_db = DatabaseManager(archive_path)
+    archive_db.conn.commit()
+    archive_db.close()
+    conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+    moved = {table: 0 for table in TABLES}
+    jam_columns = ", ".join(TABLE_COLUMNS["jams"])
+    update_columns = ", ".join(TABLE_COLUMNS["updates"])
+    concept_columns = ", ".join(TABLE_COLUMNS["concepts"])
+
+    try:
+        while True:
+            with conn:
+                ids = [row[0] for row in conn.execute(
+                    "SELECT id FROM jams WHERE completed = 1 AND completed_time < ? LIMIT ?",
+                    (cutoff, batch_size)
+                )]
+                if not ids:
+                    break
+                placeholders = ", ".join("?" * len(ids))
+                conn.execute(
+                    f"INSERT OR IGNORE INTO archive.jams ({jam_columns}) "
+                    f"SELECT {jam_columns} FROM main.jams WHERE id IN ({placeholders})", ids
+                )
+                cursor = conn.execute(
+                    f"INSERT OR IGNORE INTO archive.progress_updates ({update_columns}) "
+                    f"SELECT {update_columns} FROM main.progress_updates WHERE jam_id IN ({placeholders})", ids
+                )
+                moved["updates"] += cursor.rowcount
+                conn.executemany("INSERT OR IGNORE INTO main.archived_jams (id) VALUES (?)", [(jam_id,) for jam_id in ids])
+                # progress_updates rows go with their jam (ON DELETE CASCADE)
+                conn.execute(f"DELETE FROM main.jams WHERE id IN ({placeholders})", ids)
+                moved["jams"] += len(ids)
+
+        while True:
+            with conn:
+                ids = [row[0] for row in conn.execute(
+                    "SELECT id FROM generated_concepts WHERE created_at < ? LIMIT ?",
+                    (cutoff, batch_size)
+                )]
+                if not ids:
+                    break
+                placeholders = ", ".join("?" * len(ids))
+                conn.execute(
+                    f"INSERT OR IGNORE INTO archive.generated_concepts ({concept_columns}) "
+                    f"SELECT {concept_columns} FROM main.generated_concepts WHERE id IN ({placeholders})", ids
+                )
+                conn.execute(
+                    f"INSERT INTO main.archived_concepts (channel_id, user_id, created_at) "
+                    f"SELECT channel_id, user_id, created_at FROM main.generated_concepts WHERE id IN ({placeholders})", ids
+                )
+                conn.execute(f"DELETE FROM main.generated_concepts WHERE id IN ({placeholders})", ids)
+                moved["concepts"] += len(ids)
+    finally:
+        conn.execute("DETACH DATABASE archive")
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export, import and archive jam history")
+    parser.add_argument("--database", default=DATABASE_PATH, help="Database file (default: DATABASE_PATH)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Stream jam history as NDJSON or CSV")
+    export_parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    export_parser.add_argument("--table", choices=TABLES, help="Table to export (required for CSV)")
+    export_parser.add_argument("--guild", type=int, help="Only this guild ID")
+    export_parser.add_argument("--since", type=parse_date, help="Only from this date (YYYY-MM-DD, UTC)")
+    export_parser.add_argument("--until", type=parse_date, help="Only before this date (YYYY-MM-DD, UTC)")
+    export_parser.add_argument("--output", "-o", help="Output file (default: stdout)")
+
+    import_parser = subparsers.add_parser("import", help="Load an NDJSON export")
+    import_parser.add_argument("file", help="NDJSON file ('-' for stdin)")
+    import_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    archive_parser = subparsers.add_parser("archive", help="Move old completed jams out of the live database")
+    archive_parser.add_argument("--older-than", type=float, required=True, metavar="DAYS")
+    archive_parser.add_argument("--archive", default="./data/jam_archive.db", help="Archive database file")
+    archive_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    args = parser.parse_args()
+    db = DatabaseManager(args.database)
+    start = time.perf_counter()
+
+    try:
+        if args.command == "export":
+            if args.format == "csv" and not args.table:
+                parser.error("--table is required for CSV exports")
+            filters = {"guild_id": args.guild, "since": args.since, "until": args.until}
+            output = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+            try:
+                if args.format == "csv":
+                    counts = export_csv(db.conn, output, args.table, **filters)
+                else:
+                    tables = (args.table,) if args.table else TABLES
+                    counts = export_ndjson(db.conn, output, tables, **filters)
+            finally:
+                if output is not sys.stdout:
+                    output.close()
+            logger.info(f"Exported {counts}")
+
+        elif args.command == "import":
+            source = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+            try:
+                counts = import_ndjson(db, source, args.batch_size)
+            finally:
+                if source is not sys.stdin:
+                    source.close()
+            logger.info(f"Imported {counts}")
+
+        elif args.command == "archive":
+            cutoff = time.time() - args.older_than * 86400
+            moved = archive(db.conn, args.archive, cutoff, args.batch_size)
+            logger.info(f"Archived {moved} to {args.archive}")
+    finally:
+        db.close()
+
+    logger.info(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Multi-process launcher that spreads gateway shards across bot processes.
+
+Usage:
+    python launcher.py --processes 4
+    python launcher.py --processes 2 --shard-count 8
+
+Each child runs main.py as an AutoShardedBot with its own contiguous shard
+range. Shared state (jam data, background jobs) lives in the SQLite
+database at DATABASE_PATH, which every child opens in WAL mode.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict, List
+import requests
+from config import require_discord_token
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - launcher - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+RESTART_BACKOFF = [1, 5, 15, 60]  # seconds, capped at the last value
+
+
+def fetch_recommended_shards(token: str) -> int:
+    """
+    Ask Discord how many shards the bot should use.
+
+    Args:
+        token: Discord bot token
+
+    Returns:
+        Recommended shard count (1 if the request fails)
+    """
+    try:
+        response = requests.get(
+            "https://discord.com/api/v10/gateway/bot",
+            headers={"Authorization": f"Bot {token}"},
+            timeout=10
+        )
+        if response.status_code == 200:
+            return int(response.json().get("shards", 1))
+        logger.warning(f"Gateway lookup returned status {response.status_code}")
+    except Exception as e:
+        logger.warning(f"Gateway lookup failed: {e}")
+    return 1
+
+
+def split_shards(shard_count: int, processes: int) -> List[List[int]]:
+    """
+    Split shard IDs into contiguous, evenly sized ranges.
+
+    Args:
+        shard_count: Total number of shards
+        processes: Number of processes to spread them over
+
+    Returns:
+        One list of shard IDs per process (never empty)
+    """
+    processes = max(1, min(processes, shard_count))
+    base, extra = divmod(shard_count, processes)
+    ranges = []
+    start = 0
+    for index in range(processes):
+        size = base + (1 if index < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+def spawn(index: int, shard_ids: List[int], shard_count: int) -> subprocess.Popen:
+    """Start one bot process for the given shard range."""
+    env = dict(os.environ)
+    env.update({
+        "ENABLE_SHARDING": "true",
+        "SHARD_COUNT": str(shard_count),
+        "SHARD_IDS": f"{shard_ids[0]}-{shard_ids[-1]}",
+        "SHARD_PROCESS_INDEX": str(index),
+    })
+    logger.info(f"Starting process {index} for shards {shard_ids[0]}-{shard_ids[-1]} of {shard_count}")
+    return subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")],
+        env=env
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the bot as several sharded processes")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                        help="Number of bot processes (default: CPU count)")
+    parser.add_argument("--shard-count", type=int, default=0,
+                        help="Total shards (default: Discord's recommendation)")
+    args = parser.parse_args()
+
+    try:
+        token = require_discord_token()
+    except ValueError as e:
+        parser.error(str(e))
+
+    shard_count = args.shard_count or fetch_recommended_shards(token)
+    ranges = split_shards(shard_count, args.processes)
+    logger.info(f"Launching {len(ranges)} process(es) for {shard_count} shard(s)")
+
+    children: Dict[int, subprocess.Popen] = {
+        index: spawn(index, shard_ids, shard_count)
+        for index, shard_ids in enumerate(ranges)
+    }
+    restarts = {index: 0 for index in children}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        logger.info("Stopping all bot processes...")
+        for child in children.values():
+            if child.poll() is None:
+                child.terminate()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    # Supervise children, restarting any that crash
+    while not stopping:
+        for index, child in list(children.items()):
+            code = child.poll()
+            if code is None:
+                continue
+            delay = RESTART_BACKOFF[min(restarts[index], len(RESTART_BACKOFF) - 1)]
+            logger.warning(f"Process {index} exited with code {code}, restarting in {delay}s")
+            time.sleep(delay)
+            if stopping:
+                break
+            restarts[index] += 1
+            children[index] = spawn(index, ranges[index], shard_count)
+        time.sleep(1)
+
+    for child in children.values():
+        try:
+            child.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            child.kill()
+    logger.info("All bot processes stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,90 @@
 """Main entry point for the Game Jam Assistant Discord bot."""
 
 import asyncio
+import hashlib
+import json
 import logging
+import os
+import signal
 import sys
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
 import discord
+from discord import app_commands
 from discord.ext import commands
-from config import DISCORD_TOKEN
+from database.db_manager import db_manager
+from database.job_queue import job_queue
+from database.preferences import preference_store
+from generators.kickoff_stager import kickoff_stager
+from generators.warm_pool import warm_pool
+from generators.worker_pool import generation_pool
+from utils.checkpoint import restore_checkpoint, save_checkpoint
+from utils.message_queue import message_queue
+from config import (
+    CHECKPOINT_DIR,
+    ENABLE_SHARDING,
+    FORCE_COMMAND_SYNC,
+    SHUTDOWN_DRAIN_TIMEOUT,
+    require_discord_token,
+    shard_settings,
+)
+
+PROCESS_START = time.perf_counter()
+
+# Each shard process started by launcher.py gets its own log and checkpoint file
+SHARDS = shard_settings()
+LOG_FILE = f'bot-{SHARDS.process_index}.log' if ENABLE_SHARDING else 'bot.log'
+CHECKPOINT_FILE = os.path.join(
+    CHECKPOINT_DIR,
+    f'checkpoint-{SHARDS.process_index}.json' if ENABLE_SHARDING else 'checkpoint.json'
+)
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('bot.log'),
+        logging.FileHandler(LOG_FILE),
         logging.StreamHandler(sys.stdout)
     ]
 )
 logger = logging.getLogger(__name__)
 
+# Cogs loaded at startup
+EXTENSIONS = ["cogs.utility", "cogs.concept", "cogs.jam_tracking", "cogs.kickoff", "cogs.preferences", "cogs.admin"]
+
+
+@contextmanager
+def timed_phase(name: str, timings: dict):
+    """Record how long a startup phase takes, in milliseconds."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = (time.perf_counter() - start) * 1000
+
+
+class GameJamTree(app_commands.CommandTree):
+    """Command tree that turns away new commands while the bot shuts down."""
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if not self.client.shutting_down:
+            return True
+        if interaction.type == discord.InteractionType.application_command:
+            await interaction.response.send_message(
+                "🔄 The bot is restarting, please try again in a minute.",
+                ephemeral=True
+            )
+        return False
+
 
-class GameJamBot(commands.Bot):
+# AutoShardedBot runs several gateway shards in one process; launcher.py
+# spreads shard ranges across processes on top of that.
+BotBase = commands.AutoShardedBot if ENABLE_SHARDING else commands.Bot
+
+
+class GameJamBot(BotBase):
     """Main bot class for Game Jam Assistant."""
     
     def __init__(self):
@@ -29,41 +94,166 @@ class GameJamBot(commands.Bot):
         intents = discord.Intents.default()
         # intents.message_content = True  # Not needed for slash commands only
         
+        shard_options = {}
+        if ENABLE_SHARDING:
+            shard_options["shard_count"] = SHARDS.count
+            if SHARDS.ids:
+                shard_options["shard_ids"] = SHARDS.ids
+        
         super().__init__(
             command_prefix='!',
             intents=intents,
-            help_command=None  # We have our own help command
+            help_command=None,  # We have our own help command
+            tree_cls=GameJamTree,
+            **shard_options
         )
+        
+        # Identifies this process when claiming cross-process events
+        self.process_name = f"shard-process-{SHARDS.process_index}"
+        
+        # Set once shutdown starts; GameJamTree rejects new commands from then on
+        self.shutting_down = False
+        self._shutdown_task: Optional[asyncio.Task] = None
+    
+    def owns_guild(self, guild_id: int) -> bool:
+        """
+        Check whether a guild is served by this process.
+        
+        Scheduled work (check-ins, reminders) must only run in the process
+        that owns the guild's shard, otherwise every process would send it.
+        
+        Args:
+            guild_id: Discord guild ID
+        
+        Returns:
+            True if this process handles the guild's shard
+        """
+        shards = self.owned_shards()
+        if shards is None:
+            return True
+        shard_count, shard_ids = shards
+        return (guild_id >> 22) % shard_count in shard_ids
+    
+    def owned_shards(self) -> Optional[Tuple[int, List[int]]]:
+        """
+        Shards served by this process, for filtering guilds in SQL.
+        
+        Returns:
+            (shard_count, shard IDs), or None if this process serves every guild
+        """
+        if not ENABLE_SHARDING or not SHARDS.ids or not self.shard_count:
+            return None
+        return self.shard_count, SHARDS.ids
     
     async def setup_hook(self):
         """Called when the bot is starting up."""
+        timings = {}
+        
+        # Warm the caches from the previous run's checkpoint
+        with timed_phase("restore", timings):
+            restore_checkpoint(CHECKPOINT_FILE)
+            preference_store.warm()
+        
+        # Start generation workers before any command can be invoked
+        with timed_phase("workers", timings):
+            generation_pool.start()
+            message_queue.start()
+            warm_pool.start()
+            kickoff_stager.start(self)
+            job_queue.start(self)
+        
         logger.info("Loading cogs...")
+        with timed_phase("cogs", timings):
+            for extension in EXTENSIONS:
+                try:
+                    await self.load_extension(extension)
+                    logger.info(f"Loaded {extension}")
+                except Exception as e:
+                    logger.error(f"Failed to load {extension}: {e}")
         
-        # Load cogs
-        try:
-            await self.load_extension("cogs.utility")
-            logger.info("Loaded utility cog")
-        except Exception as e:
-            logger.error(f"Failed to load utility cog: {e}")
+        # Sync slash commands (the command tree is global, so only the
+        # first shard process uploads it)
+        with timed_phase("sync", timings):
+            if SHARDS.process_index != 0:
+                logger.info("Skipping command sync in secondary shard process")
+            else:
+                await self.sync_commands_if_changed()
         
-        try:
-            await self.load_extension("cogs.concept")
-            logger.info("Loaded concept cog")
-        except Exception as e:
-            logger.error(f"Failed to load concept cog: {e}")
+        total = (time.perf_counter() - PROCESS_START) * 1000
+        phases = ", ".join(f"{name} {ms:.0f}ms" for name, ms in timings.items())
+        logger.info(f"Startup phases: {phases} (total {total:.0f}ms since launch)")
+    
+    def command_tree_hash(self) -> str:
+        """
+        Hash the definitions of every registered slash command.
+        
+        Returns:
+            Hex digest that changes whenever a command, option or description changes
+        """
+        payload = []
+        for command in sorted(self.tree.get_commands(), key=lambda c: c.name):
+            try:
+                payload.append(command.to_dict(self.tree))
+            except TypeError:
+                # discord.py < 2.4 takes no tree argument
+                payload.append(command.to_dict())
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+    
+    async def sync_commands_if_changed(self):
+        """Upload the command tree only when its definitions have changed."""
+        state_key = f"command_tree_hash:{self.application_id}"
+        tree_hash = self.command_tree_hash()
+        
+        if not FORCE_COMMAND_SYNC and db_manager.get_state(state_key) == tree_hash:
+            logger.info("Command tree unchanged, skipping sync")
+            return
         
-        # Sync slash commands
         try:
             synced = await self.tree.sync()
+            db_manager.set_state(state_key, tree_hash)
             logger.info(f"Synced {len(synced)} command(s)")
         except Exception as e:
             logger.error(f"Failed to sync commands: {e}")
     
+    def request_shutdown(self) -> asyncio.Task:
+        """
+        Start the graceful shutdown sequence (only runs once).
+        
+        Returns:
+            Task that completes when the bot has closed
+        """
+        if self._shutdown_task is None:
+            self._shutdown_task = asyncio.create_task(self._shutdown())
+        return self._shutdown_task
+    
+    async def _shutdown(self):
+        """Stop taking commands, finish in-flight work, checkpoint, then disconnect."""
+        self.shutting_down = True
+        deadline = time.monotonic() + SHUTDOWN_DRAIN_TIMEOUT
+        logger.info(f"Shutting down: draining {generation_pool.in_flight} in-flight generation(s)")
+        
+        # The gateway stays connected while draining so replies still arrive
+        await warm_pool.stop()
+        await kickoff_stager.stop()
+        await job_queue.stop()  # unfinished jobs stay queued in the database
+        await generation_pool.drain(SHUTDOWN_DRAIN_TIMEOUT)
+        await message_queue.stop(max(1.0, deadline - time.monotonic()))
+        
+        try:
+            save_checkpoint(CHECKPOINT_FILE)
+        except Exception as e:
+            logger.error(f"Failed to save checkpoint: {e}", exc_info=True)
+        
+        await self.close()
+    
     async def on_ready(self):
         """Called when the bot is ready and connected to Discord."""
         logger.info(f"Bot is ready! Logged in as {self.user}")
         logger.info(f"Bot ID: {self.user.id}")
         logger.info(f"Connected to {len(self.guilds)} server(s)")
+        if ENABLE_SHARDING:
+            logger.info(f"Running shards {sorted(self.shards)} of {self.shard_count}")
         
         # Set bot status
         activity = discord.Game(name="Game Jams | /help")
@@ -84,21 +274,34 @@ class GameJamBot(commands.Bot):
 
 async def main():
     """Main async function to run the bot."""
-    if not DISCORD_TOKEN:
+    try:
+        token = require_discord_token()
+    except ValueError:
         logger.error("DISCORD_TOKEN not found in environment variables!")
         logger.error("Please create a .env file with your Discord bot token.")
         sys.exit(1)
     
     bot = GameJamBot()
     
+    # SIGTERM (deploys, launcher.py) and Ctrl+C both shut down gracefully
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, bot.request_shutdown)
+        except (NotImplementedError, AttributeError, ValueError):
+            # Windows has no loop signal handlers; Ctrl+C raises KeyboardInterrupt instead
+            pass
+    
     try:
-        await bot.start(DISCORD_TOKEN)
+        await bot.start(token)
     except KeyboardInterrupt:
         logger.info("Bot shutdown requested by user")
     except Exception as e:
         logger.error(f"Bot crashed: {e}", exc_info=True)
     finally:
-        await bot.close()
+        await bot.request_shutdown()
+        generation_pool.shutdown()
+        db_manager.close()
         logger.info("Bot closed")
 
 
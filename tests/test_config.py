@@ -0,0 +1,42 @@
+"""Reading numeric settings from the environment."""
+
+import importlib
+import pytest
+import config
+from config import GenerationSettings, OllamaSettings, ShardSettings
+
+
+def test_import_does_not_parse_numeric_settings(monkeypatch):
+    for name in ("OLLAMA_REPLAY_SPEED", "SHARD_COUNT", "SHARD_PROCESS_INDEX", "GENERATION_WORKERS"):
+        monkeypatch.setenv(name, "lots")
+    monkeypatch.setenv("SHARD_IDS", "0-x")
+    importlib.reload(config)
+
+
+def test_replay_speed_is_read_by_from_env(monkeypatch):
+    monkeypatch.setenv("OLLAMA_REPLAY_SPEED", "0")
+    assert OllamaSettings.from_env().replay_speed == 0
+
+
+@pytest.mark.parametrize("name, build", [
+    ("OLLAMA_REPLAY_SPEED", OllamaSettings.from_env),
+    ("GENERATION_WORKERS", GenerationSettings.from_env),
+    ("GENERATION_THREADS", GenerationSettings.from_env),
+    ("SHARD_COUNT", ShardSettings.from_env),
+    ("SHARD_PROCESS_INDEX", ShardSettings.from_env),
+    ("SHARD_IDS", ShardSettings.from_env),
+])
+def test_malformed_setting_is_named(monkeypatch, name, build):
+    monkeypatch.setenv(name, "lots")
+    with pytest.raises(ValueError, match=name):
+        build()
+
+
+def test_shard_settings(monkeypatch):
+    monkeypatch.setenv("SHARD_COUNT", "8")
+    monkeypatch.setenv("SHARD_IDS", "4-7")
+    monkeypatch.setenv("SHARD_PROCESS_INDEX", "1")
+    shards = ShardSettings.from_env()
+    assert shards == ShardSettings(count=8, ids=[4, 5, 6, 7], process_index=1)
+    assert shards.partial
+    assert not ShardSettings().partial
@@ -0,0 +1,37 @@
+"""Exporting, archiving and re-importing jam history."""
+
+import io
+import time
+import pytest
+from database.db_manager import GLOBAL_SCOPE, DatabaseManager
+from database.models import JamSession, ProgressUpdate
+from generators.models import Concept
+from jam_history import archive, export_ndjson, import_ndjson
+
+METRICS = ("jams_started", "jams_completed", "updates", "concepts")
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "live.db"))
+    yield manager
+    manager.close()
+
+
+def test_reimport_after_archive_does_not_restore_archived_rows(db, tmp_path):
+    jam = JamSession(guild_id=1, channel_id=2, name="Old jam", duration_hours=48, created_by=3)
+    db.start_jam(jam)
+    db.add_progress_update(jam, ProgressUpdate(jam_id=jam.id, user_id=3, message="done", hours_elapsed=1.0))
+    db.complete_jam(jam)
+    db.record_concept(Concept(genre="puzzle", constraint="one button"), 1, 2, 3)
+
+    export = io.StringIO()
+    export_ndjson(db.conn, export)
+    counters = db.get_counters(GLOBAL_SCOPE, METRICS)
+
+    moved = archive(db.conn, str(tmp_path / "archive.db"), time.time() + 1)
+    assert moved == {"jams": 1, "updates": 1, "concepts": 1}
+
+    export.seek(0)
+    assert import_ndjson(db, export) == {"jams": 0, "updates": 0, "concepts": 0}
+    assert db.get_counters(GLOBAL_SCOPE, METRICS) == counters
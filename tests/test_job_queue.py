@@ -0,0 +1,61 @@
+"""Claiming background jobs from the shared jobs table."""
+
+import time
+import pytest
+from database.db_manager import DatabaseManager
+from database.models import Job
+
+SHARD_COUNT = 2
+
+
+def guild_on_shard(shard_id: int, index: int) -> int:
+    """A guild ID whose shard is shard_id (Discord: (guild_id >> 22) % shard_count)."""
+    return ((index * SHARD_COUNT + shard_id) << 22) + 1
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "jobs.db"))
+    yield manager
+    manager.close()
+
+
+def test_first_page_of_unclaimable_jobs_does_not_hide_later_jobs(db):
+    now = time.time()
+    # The earliest due jobs are summaries for guilds on shard 1 ...
+    for index in range(60):
+        db.enqueue_job(Job(
+            kind="jam-summary",
+            key=f"jam-summary:{index}",
+            channel_id=1,
+            guild_id=guild_on_shard(1, index),
+            run_at=now - 100 + index
+        ))
+    # ... and a paused AI kind on this process's shard
+    for index in range(60):
+        db.enqueue_job(Job(
+            kind="checkin",
+            key=f"checkin:{index}",
+            channel_id=1,
+            guild_id=guild_on_shard(0, index),
+            run_at=now - 100 + index
+        ))
+    db.enqueue_job(Job(
+        kind="kickoff-reveal",
+        key="kickoff:1",
+        channel_id=2,
+        guild_id=guild_on_shard(0, 0),
+        run_at=now - 1
+    ))
+
+    due = db.due_jobs(now, ["jam-summary", "kickoff-reveal"], (SHARD_COUNT, [0]), limit=50)
+
+    assert [job.key for job in due] == ["kickoff:1"]
+
+
+def test_jobs_without_a_guild_are_claimable_by_every_shard(db):
+    now = time.time()
+    db.enqueue_job(Job(kind="jam-summary", key="dm", channel_id=1, run_at=now - 1))
+
+    assert [job.key for job in db.due_jobs(now, ["jam-summary"], (SHARD_COUNT, [1]))] == ["dm"]
+    assert db.due_jobs(now, ["checkin"], None) == []
@@ -0,0 +1,27 @@
+"""Load shedding under sustained overload."""
+
+import pytest
+
+pytest.importorskip("requests")
+
+from config import LOAD_SHED_WEIGHTS, GenerationSettings
+from generators.load_shedder import LoadShedder
+from generators.worker_pool import GenerationWorkerPool
+
+
+def test_every_command_is_shed_at_full_shed_fraction():
+    shedder = LoadShedder(pool=GenerationWorkerPool(GenerationSettings(workers=1)))
+    shedder.shed_fraction = 1.0
+    shedder._last_update = float("inf")  # hold the fraction
+
+    for command in [*LOAD_SHED_WEIGHTS, "some-new-command"]:
+        assert not any(shedder.admit(command) for _ in range(200)), command
+
+
+def test_constraints_are_shed_before_concepts():
+    shedder = LoadShedder(pool=GenerationWorkerPool(GenerationSettings(workers=1)))
+    shedder.shed_fraction = 0.4
+    shedder._last_update = float("inf")
+
+    assert not any(shedder.admit("generate-constraint") for _ in range(200))
+    assert any(shedder.admit("generate-concept") for _ in range(200))
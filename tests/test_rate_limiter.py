@@ -0,0 +1,41 @@
+"""Rate limiting across shard processes."""
+
+import asyncio
+import pytest
+from database.db_manager import DatabaseManager
+from utils.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "rate.db"))
+    yield manager
+    manager.close()
+
+
+def test_user_budget_is_shared_between_processes(db):
+    # One limiter per shard process, each serving a different guild
+    limiters = [RateLimiter(user_capacity=6, user_refill=0.001, shared=db) for _ in range(2)]
+
+    async def spend():
+        results = []
+        for _ in range(2):
+            for guild_id, limiter in enumerate(limiters):
+                results.append(await limiter.try_acquire(42, guild_id, 2))
+        return results
+
+    assert asyncio.run(spend()) == [True, True, True, False]
+
+
+def test_refused_user_does_not_drain_guild_bucket(db):
+    limiter = RateLimiter(user_capacity=2, user_refill=0.001, guild_capacity=4, shared=db)
+
+    async def spend():
+        return [
+            await limiter.try_acquire(1, 7, 2),
+            await limiter.try_acquire(1, 7, 2),
+            await limiter.try_acquire(2, 7, 2),
+            await limiter.try_acquire(3, 7, 2),
+        ]
+
+    assert asyncio.run(spend()) == [True, False, True, False]
@@ -0,0 +1,32 @@
+"""Token usage reported by generation workers."""
+
+import pytest
+
+pytest.importorskip("requests")
+
+from ai.ollama_client import TokenUsage
+from config import GenerationSettings
+from generators.worker_pool import GenerationWorkerPool
+
+
+def response(prompt_tokens: int, eval_tokens: int) -> dict:
+    return {"prompt_eval_count": prompt_tokens, "eval_count": eval_tokens, "eval_duration": 1e9}
+
+
+def test_worker_usage_is_aggregated_in_the_bot_process():
+    # Two worker processes, each sending back the usage of one job
+    workers = [TokenUsage(), TokenUsage()]
+    workers[0].record("concept", response(100, 40))
+    workers[1].record("concept", response(200, 60))
+    workers[1].record("summary", response(500, 300))
+
+    pool = GenerationWorkerPool(GenerationSettings(workers=2))
+    for usage in workers:
+        pool._merge_usage(usage.drain())
+
+    assert pool.token_usage() == {
+        "concept": {"requests": 2, "avg_prompt_tokens": 150.0, "avg_eval_tokens": 50.0, "tokens_per_second": 50.0},
+        "summary": {"requests": 1, "avg_prompt_tokens": 500.0, "avg_eval_tokens": 300.0, "tokens_per_second": 300.0},
+    }
+    # Each job's counts are sent once
+    assert workers[1].drain() == {}
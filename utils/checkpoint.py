@@ -0,0 +1,84 @@
+"""Save in-memory caches on shutdown and restore them on the next start."""
+
+import json
+import logging
+import os
+import time
+from typing import Any, Dict
+from generators.genre_index import genre_index
+from generators.seeds import seed_cache
+from generators.warm_pool import warm_pool
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path: str):
+    """
+    Write the seed cache, warm pool and learned genres to a JSON file.
+
+    The file is written next to its final location and renamed into place,
+    so a crash mid-write never leaves a truncated checkpoint behind.
+
+    Args:
+        path: Checkpoint file path
+    """
+    start = time.perf_counter()
+    state: Dict[str, Any] = {
+        "version": CHECKPOINT_VERSION,
+        "saved_at": time.time(),
+        "seed_cache": seed_cache.dump(),
+        "warm_pool": warm_pool.dump(),
+        "learned_genres": genre_index.learned(),
+    }
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as checkpoint_file:
+        json.dump(state, checkpoint_file, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+    elapsed = (time.perf_counter() - start) * 1000
+    logger.info(
+        f"Saved checkpoint to {path}: {len(state['seed_cache'])} cached concept(s), "
+        f"{len(state['warm_pool'])} pre-generated concept(s), "
+        f"{len(state['learned_genres'])} learned genre(s) in {elapsed:.0f}ms"
+    )
+
+
+def restore_checkpoint(path: str):
+    """
+    Reload a checkpoint written by save_checkpoint().
+
+    A missing, unreadable or outdated checkpoint is ignored; the bot then
+    simply starts with empty caches.
+
+    Args:
+        path: Checkpoint file path
+    """
+    if not os.path.exists(path):
+        logger.info("No checkpoint found, starting with empty caches")
+        return
+
+    try:
+        with open(path, encoding="utf-8") as checkpoint_file:
+            state = json.load(checkpoint_file)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+        return
+
+    if state.get("version") != CHECKPOINT_VERSION:
+        logger.warning(f"Ignoring checkpoint {path} with version {state.get('version')}")
+        return
+
+    concepts = seed_cache.restore(state.get("seed_cache", []))
+    pooled = warm_pool.restore(state.get("warm_pool", []))
+    genres = sum(1 for name in state.get("learned_genres", []) if genre_index.learn(name))
+    age = time.time() - state.get("saved_at", time.time())
+    logger.info(
+        f"Restored checkpoint from {path} (saved {age:.0f}s ago): "
+        f"{concepts} cached concept(s), {pooled} pre-generated concept(s), {genres} learned genre(s)"
+    )
@@ -1,136 +1,525 @@
 """Message formatting helpers for Discord bot responses."""
 
-from typing import Dict, Optional
+from functools import lru_cache
+from random import choice
+from typing import Any, Dict, List
+import discord
+from database.models import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_PENDING,
+    JOB_RUNNING,
+    Job,
+    JamSession,
+    Kickoff,
+    ProgressUpdate,
+)
+from generators.models import Concept
 
 
-def format_concept_message(concept: Dict[str, str], is_ai: bool = False) -> str:
+# Closing lines, chosen at random per message
+CONCEPT_CLOSING_MESSAGES = (
+    "Good luck, you'll need it! 🎲",
+    "Now stop reading and start coding! ⏰",
+    "Time to make something awesome! 🚀",
+)
+
+CONSTRAINT_CLOSING_MESSAGES = (
+    "May the odds be ever in your favor... 📐",
+    "Just when you thought it couldn't get harder... 😏",
+    "Because why make it easy? 🎯",
+    "Your game just got more interesting! 🎨",
+)
+
+CONCEPT_TITLE = "🎮 Game Jam Concept Generator 🎮"
+
+# Precompiled templates (bound str.format methods, parsed once at import)
+_render_structured_concept = (
+    CONCEPT_TITLE + "\n\n"
+    "**Genre:** {genre}\n"
+    "**Setting:** {setting}\n"
+    "**Core Mechanic:** {mechanic}\n"
+    "**Theme:** {theme}\n"
+    "{constraint_line}"
+    "**Time Limit:** {time_limit} hours\n"
+    "{code_line}"
+    "\n{closing}"
+).format
+
+_render_constraint_line = "**Special Constraint:** {}\n".format
+
+_render_code_line = "**Concept Code:** `{}`\n".format
+
+_render_described_concept = (
+    CONCEPT_TITLE + "\n\n"
+    "{description}\n\n"
+    "Time Limit: {time_limit} hours\n"
+    "Difficulty: {difficulty}\n"
+    "{code_line}\n"
+    "{closing}"
+).format
+
+_render_constraint = "**Additional Constraint:** {constraint}\n\n{closing}".format
+
+# Discord embed limits
+EMBED_DESCRIPTION_LIMIT = 4096
+EMBED_FIELD_LIMIT = 1024
+EMBED_COLOR = discord.Color.blurple()
+
+
+def _clip(text: str, limit: int) -> str:
+    """Truncate text to a Discord length limit."""
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def format_concept_message(concept: Concept) -> str:
     """
     Format a game concept into a Discord message.
-    
+
     Args:
-        concept: Dictionary containing concept fields (genre, setting, mechanic, theme, constraint, time_limit)
-        is_ai: Whether this is an AI-generated concept (affects formatting)
-    
+        concept: The concept to format (AI-generated concepts that could not be
+                 parsed into fields are shown as their raw description)
+
     Returns:
         Formatted message string
     """
-    # Check if we have structured fields (both AI and template use this format)
-    has_structured_fields = all(key in concept for key in ["genre", "setting", "mechanic", "theme"])
-    
-    if is_ai and "description" in concept and not has_structured_fields:
+    if concept.is_ai and concept.description and not concept.is_complete:
         # Legacy AI format with full description (fallback)
-        message = "🎮 Game Jam Concept Generator 🎮\n\n"
-        message += concept.get("description", "")
-        
-        if "explanation" in concept:
-            message += f"\n\n{concept['explanation']}"
-        
-        if "time_limit" in concept:
-            message += f"\n\nTime Limit: {concept['time_limit']} hours"
-        
-        if "difficulty" in concept:
-            message += f"\nDifficulty: {concept['difficulty'].title()}"
-        
-        # Add closing message
-        closing_messages = [
-            "Now stop reading and start coding! ⏰",
-            "Good luck, you'll need it! 🎲",
-            "Time to make something awesome! 🚀",
-        ]
-        import random
-        message += f"\n\n{random.choice(closing_messages)}"
-        
-        return message
-    else:
-        # Structured format (used by both template and AI)
-        message = "🎮 Game Jam Concept Generator 🎮\n\n"
-        message += f"**Genre:** {concept.get('genre', 'Unknown')}\n"
-        message += f"**Setting:** {concept.get('setting', 'Unknown')}\n"
-        message += f"**Core Mechanic:** {concept.get('mechanic', 'Unknown')}\n"
-        message += f"**Theme:** {concept.get('theme', 'Unknown')}\n"
-        
-        if "constraint" in concept:
-            message += f"**Special Constraint:** {concept['constraint']}\n"
-        
-        if "time_limit" in concept:
-            message += f"**Time Limit:** {concept['time_limit']} hours\n"
-        
-        # Add closing message
-        closing_messages = [
-            "Good luck, you'll need it! 🎲",
-            "Now stop reading and start coding! ⏰",
-            "Time to make something awesome! 🚀",
-        ]
-        import random
-        message += f"\n{random.choice(closing_messages)}"
-        
-        return message
+        return _render_described_concept(
+            description=concept.description,
+            time_limit=concept.time_limit,
+            difficulty=concept.difficulty.value.title(),
+            code_line=_render_code_line(concept.code) if concept.code else "",
+            closing=choice(CONCEPT_CLOSING_MESSAGES)
+        )
+
+    # Structured format (used by both template and AI)
+    return _render_structured_concept(
+        genre=concept.genre or "Unknown",
+        setting=concept.setting or "Unknown",
+        mechanic=concept.mechanic or "Unknown",
+        theme=concept.theme or "Unknown",
+        constraint_line=_render_constraint_line(concept.constraint) if concept.constraint else "",
+        time_limit=concept.time_limit,
+        code_line=_render_code_line(concept.code) if concept.code else "",
+        closing=choice(CONCEPT_CLOSING_MESSAGES)
+    )
 
 
 def format_constraint_message(constraint: str) -> str:
     """
     Format an additional constraint message.
-    
+
     Args:
         constraint: The constraint text
-    
+
     Returns:
         Formatted message string
     """
-    message = f"**Additional Constraint:** {constraint}\n\n"
-    
-    closing_messages = [
-        "May the odds be ever in your favor... 📐",
-        "Just when you thought it couldn't get harder... 😏",
-        "Because why make it easy? 🎯",
-        "Your game just got more interesting! 🎨",
-    ]
-    import random
-    message += random.choice(closing_messages)
-    
+    return _render_constraint(
+        constraint=constraint,
+        closing=choice(CONSTRAINT_CLOSING_MESSAGES)
+    )
+
+
+def build_concept_embed(concept: Concept) -> discord.Embed:
+    """
+    Build a Discord embed for a game concept.
+
+    Args:
+        concept: The concept to display
+
+    Returns:
+        Embed with one field per concept element
+    """
+    embed = discord.Embed(title=CONCEPT_TITLE, color=EMBED_COLOR)
+
+    if concept.is_ai and concept.description and not concept.is_complete:
+        embed.description = _clip(concept.description, EMBED_DESCRIPTION_LIMIT)
+    else:
+        embed.add_field(name="Genre", value=_clip(concept.genre or "Unknown", EMBED_FIELD_LIMIT), inline=True)
+        embed.add_field(name="Setting", value=_clip(concept.setting or "Unknown", EMBED_FIELD_LIMIT), inline=True)
+        embed.add_field(name="Core Mechanic", value=_clip(concept.mechanic or "Unknown", EMBED_FIELD_LIMIT), inline=True)
+        embed.add_field(name="Theme", value=_clip(concept.theme or "Unknown", EMBED_FIELD_LIMIT), inline=True)
+        if concept.constraint:
+            embed.add_field(name="Special Constraint", value=_clip(concept.constraint, EMBED_FIELD_LIMIT), inline=False)
+
+    embed.add_field(name="Time Limit", value=f"{concept.time_limit} hours", inline=True)
+    embed.add_field(name="Difficulty", value=concept.difficulty.value.title(), inline=True)
+    if concept.code:
+        embed.add_field(name="Concept Code", value=f"`{concept.code}`", inline=True)
+    embed.set_footer(text=choice(CONCEPT_CLOSING_MESSAGES))
+    return embed
+
+
+def build_constraint_embed(constraint: str) -> discord.Embed:
+    """
+    Build a Discord embed for an additional constraint.
+
+    Args:
+        constraint: The constraint text
+
+    Returns:
+        Embed containing the constraint
+    """
+    embed = discord.Embed(
+        title="Additional Constraint",
+        description=_clip(constraint, EMBED_DESCRIPTION_LIMIT),
+        color=EMBED_COLOR
+    )
+    embed.set_footer(text=choice(CONSTRAINT_CLOSING_MESSAGES))
+    return embed
+
+
+def _format_percent(value) -> str:
+    return "n/a" if value is None else f"{value:.0%}"
+
+
+def build_jam_started_embed(jam: JamSession) -> discord.Embed:
+    """
+    Build the announcement for a newly started jam.
+
+    Args:
+        jam: The jam that was started
+
+    Returns:
+        Embed with duration and end time (shown in each reader's timezone)
+    """
+    embed = discord.Embed(title=f"🏁 {jam.name} has begun! 🏁", color=EMBED_COLOR)
+    embed.add_field(name="Duration", value=f"{jam.duration_hours} hours", inline=True)
+    embed.add_field(name="Ends", value=f"<t:{int(jam.end_time)}:F>", inline=True)
+    embed.set_footer(text="Use /update-progress to log your updates.")
+    return embed
+
+
+def format_progress_logged(jam: JamSession, update: ProgressUpdate, commentary: str = "") -> str:
+    """
+    Format the reply to a progress update.
+
+    Args:
+        jam: Jam the update belongs to
+        update: The logged update
+        commentary: Optional AI commentary on the update
+
+    Returns:
+        Formatted message string
+    """
+    message = (
+        "Progress logged! ✅\n\n"
+        f"Time elapsed: {update.hours_elapsed:.1f} hours / {jam.duration_hours} hours "
+        f"({jam.progress(update.timestamp):.1%})\n"
+        f"Last update: \"{update.message}\""
+    )
+    if commentary:
+        message += f"\n\n{commentary}"
     return message
 
 
+def build_jam_status_embed(jam: JamSession, updates: List[ProgressUpdate]) -> discord.Embed:
+    """
+    Build the status overview of a running jam.
+
+    Args:
+        jam: The running jam
+        updates: Most recent progress updates, oldest first
+
+    Returns:
+        Embed with timing and recent updates
+    """
+    embed = discord.Embed(title=f"📊 {jam.name}", color=EMBED_COLOR)
+    embed.add_field(
+        name="Time Elapsed",
+        value=f"{jam.hours_elapsed():.1f} / {jam.duration_hours} hours ({jam.progress():.0%})",
+        inline=True
+    )
+    embed.add_field(name="Ends", value=f"<t:{int(jam.end_time)}:R>", inline=True)
+    embed.add_field(name="Updates", value=str(jam.update_count), inline=True)
+    if updates:
+        lines = "\n".join(
+            f"**{update.hours_elapsed:.1f}h** - {update.message}" for update in updates
+        )
+        embed.add_field(name="Recent Updates", value=_clip(lines, EMBED_FIELD_LIMIT), inline=False)
+    return embed
+
+
+def build_jam_complete_embed(jam: JamSession, summary_queued: bool = False) -> discord.Embed:
+    """
+    Build the wrap-up for a completed jam.
+
+    Args:
+        jam: The completed jam
+        summary_queued: Whether a post-jam summary will follow
+
+    Returns:
+        Embed with final statistics
+    """
+    embed = discord.Embed(title=f"🎉 {jam.name} is complete! 🎉", color=EMBED_COLOR)
+    embed.add_field(name="Duration", value=f"{jam.hours_elapsed():.1f} hours", inline=True)
+    embed.add_field(name="Updates", value=str(jam.update_count), inline=True)
+    if summary_queued:
+        embed.description = "📝 A summary of your jam will be posted here shortly."
+    embed.set_footer(text="Now go share your game with the world! 🚀")
+    return embed
+
+
+def format_checkin(jam: JamSession, hour: int, commentary: str = "") -> str:
+    """
+    Format a scheduled check-in message.
+
+    Args:
+        jam: The running jam
+        hour: Check-in hour (hours since the start)
+        commentary: Optional AI commentary
+
+    Returns:
+        Formatted message string
+    """
+    if hour >= jam.duration_hours:
+        message = f"⏰ **{jam.name}**: time's up! Wrap it up and run `/jam-complete` when you're done."
+    else:
+        message = (
+            f"⏰ **{jam.name}** check-in: {hour} of {jam.duration_hours} hours "
+            f"({hour / jam.duration_hours:.0%}), {jam.update_count} update(s) so far."
+        )
+    if commentary:
+        message += f"\n\n{commentary}"
+    return message
+
+
+def format_jam_summary(jam: JamSession, updates: List[ProgressUpdate], summary: str = "") -> str:
+    """
+    Format the post-jam summary.
+
+    Args:
+        jam: The completed jam
+        updates: Its progress updates, oldest first
+        summary: AI-written summary (a plain recap of the updates is used if empty)
+
+    Returns:
+        Formatted message string
+    """
+    message = f"📝 **{jam.name}: Post-Jam Summary**\n\n"
+    if summary:
+        return message + summary
+    message += f"{jam.hours_elapsed():.1f} hours, {jam.update_count} update(s)."
+    if updates:
+        message += "\n" + "\n".join(
+            f"- **{update.hours_elapsed:.1f}h** {update.message}" for update in updates
+        )
+    return message
+
+
+def build_kickoff_embed(kickoff: Kickoff, title: str = "🗓️ Kickoff Scheduled") -> discord.Embed:
+    """
+    Build the overview of a scheduled kickoff.
+
+    Args:
+        kickoff: The kickoff
+        title: Embed title
+
+    Returns:
+        Embed with reveal time and staging progress
+    """
+    embed = discord.Embed(title=f"{title}: {kickoff.name}", color=EMBED_COLOR)
+    embed.add_field(name="Reveal", value=f"<t:{int(kickoff.reveal_at)}:F> (<t:{int(kickoff.reveal_at)}:R>)", inline=False)
+    embed.add_field(name="Teams", value=str(kickoff.teams), inline=True)
+    embed.add_field(name="Concepts Ready", value=f"{kickoff.staged} / {kickoff.teams}", inline=True)
+    embed.add_field(
+        name="Settings",
+        value=f"{kickoff.genre or 'Any genre'}, {kickoff.difficulty.value.title()}, {kickoff.tone.value.title()}",
+        inline=True
+    )
+    embed.set_footer(text="Concepts are generated in the background and posted here at the reveal.")
+    return embed
+
+
+def format_kickoff_reveal(kickoff: Kickoff, concepts: List[Concept]) -> str:
+    """
+    Format the reveal of every team's concept.
+
+    Args:
+        kickoff: The kickoff being revealed
+        concepts: One concept per team, in team order
+
+    Returns:
+        Formatted message string (one short block per team)
+    """
+    blocks = [f"🎬 **{kickoff.name} has begun!** Here is every team's concept:"]
+    for team, concept in enumerate(concepts, start=1):
+        if concept.is_complete:
+            block = (
+                f"**Team {team}:** {concept.genre} · {concept.setting}\n"
+                f"Mechanic: {concept.mechanic} · Theme: {concept.theme}"
+            )
+            if concept.constraint:
+                block += f"\nConstraint: {concept.constraint}"
+        else:
+            block = f"**Team {team}:** {_clip(concept.description or 'Unknown', 600)}"
+        if concept.code:
+            block += f"\nCode: `{concept.code}`"
+        blocks.append(block)
+    blocks.append(choice(CONCEPT_CLOSING_MESSAGES))
+    return "\n\n".join(blocks)
+
+
+def build_jobs_embed(counts: Dict[str, int], jobs: List[Job]) -> discord.Embed:
+    """
+    Build the embed for /jam-jobs.
+
+    Args:
+        counts: Jobs per status
+        jobs: Recent pending and failed jobs
+
+    Returns:
+        Embed with queue counts and job details
+    """
+    embed = discord.Embed(title="🗂️ Background Jobs", color=EMBED_COLOR)
+    embed.add_field(
+        name="Queue",
+        value=", ".join(
+            f"{counts.get(status, 0)} {status}" for status in (JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_FAILED)
+        ),
+        inline=False
+    )
+    for job in jobs:
+        if job.status == JOB_FAILED:
+            detail = f"Failed after {job.attempts} attempt(s): {job.last_error or 'unknown error'}"
+        else:
+            detail = f"Runs <t:{int(job.run_at)}:R>"
+            if job.attempts:
+                detail += f" (attempt {job.attempts + 1}, last error: {job.last_error or 'n/a'})"
+        embed.add_field(name=f"{job.kind} · {job.status}", value=_clip(detail, EMBED_FIELD_LIMIT), inline=False)
+    return embed
+
+
+def build_jam_stats_embed(stats: Dict[str, Any], title: str) -> discord.Embed:
+    """
+    Build the embed for /jam-stats.
+
+    Args:
+        stats: Output of database.analytics.jam_stats()
+        title: Embed title
+
+    Returns:
+        Embed with jam, update and generation statistics
+    """
+    embed = discord.Embed(title=title, color=EMBED_COLOR)
+    embed.add_field(
+        name="Jams",
+        value=(
+            f"{stats['jams_started']} started, {stats['jams_completed']} completed\n"
+            f"Completion rate: {_format_percent(stats['completion_rate'])}\n"
+            f"Finished on time: {_format_percent(stats['on_time_rate'])}"
+        ),
+        inline=True
+    )
+    rate = stats["updates_per_jam_hour"]
+    busiest = ", ".join(f"hour {hour}" for hour, _ in stats["busiest_jam_hours"][:3]) or "n/a"
+    embed.add_field(
+        name="Progress Updates",
+        value=(
+            f"{stats['progress_updates']} total\n"
+            f"Per jam hour: {'n/a' if rate is None else f'{rate:.2f}'}\n"
+            f"Busiest: {busiest}"
+        ),
+        inline=True
+    )
+    embed.add_field(
+        name="Concepts",
+        value=(
+            f"{stats['concepts_ai']} AI, {stats['concepts_template']} template\n"
+            f"AI share: {_format_percent(stats['ai_share'])}"
+        ),
+        inline=True
+    )
+    if stats["top_genres"]:
+        genres = "\n".join(f"{name} ({count})" for name, count in stats["top_genres"])
+        embed.add_field(name="Most Rolled Genres", value=_clip(genres, EMBED_FIELD_LIMIT), inline=False)
+    if stats["top_constraints"]:
+        constraints = "\n".join(f"{count}× {text}" for text, count in stats["top_constraints"])
+        embed.add_field(name="Most Rolled Constraints", value=_clip(constraints, EMBED_FIELD_LIMIT), inline=False)
+    return embed
+
+
 def format_error_message(error: str) -> str:
     """
     Format an error message for the user.
-    
+
     Args:
         error: Error description
-    
+
     Returns:
         Formatted error message
     """
     return f"❌ **Error:** {error}\n\nPlease try again or use `/help` for assistance."
 
 
+HELP_SECTIONS = (
+    "🎮 **Game Jam Assistant Bot** 🎮\n\n",
+    "**Available Commands:**\n\n",
+
+    "`/generate-concept [genre] [difficulty] [seed]`\n"
+    "Generate a random game concept with constraints.\n"
+    "• `genre` (optional): Specify a genre (platformer, rpg, puzzle, etc.)\n"
+    "• `difficulty` (optional): Easy, Medium, Hard, Insane (defaults to your preference)\n"
+    "• `seed` (optional): A concept code to regenerate a shared concept\n\n",
+
+    "`/generate-constraint`\n"
+    "Add one more constraint to your existing concept.\n\n",
+
+    "`/vibe-check [message]`\n"
+    "Get AI commentary on your current progress/mood.\n"
+    "• `message` (optional): Your current status or situation\n\n",
+
+    "`/start-jam <name> [duration_hours]`\n"
+    "Start tracking a game jam in this channel.\n\n",
+
+    "`/update-progress <message>`\n"
+    "Log a progress update for the running jam.\n\n",
+
+    "`/jam-status`\n"
+    "Show time remaining and recent updates.\n\n",
+
+    "`/jam-complete`\n"
+    "Mark the running jam as complete (a summary is posted afterwards).\n\n",
+
+    "`/jam-stats [all_servers] [export]`\n"
+    "Show jam statistics for this server.\n"
+    "• `all_servers` (optional): Include every server\n"
+    "• `export` (optional): Attach the stats as a JSON file\n\n",
+
+    "`/jam-jobs [retry_failed]`\n"
+    "Show pending and failed check-ins and summaries for this server.\n\n",
+
+    "`/schedule-kickoff <name> <teams> <minutes_until_reveal> [genre] [difficulty]`\n"
+    "Pre-generate one concept per team and reveal them all at once (Manage Server).\n\n",
+
+    "`/kickoff-status [cancel]`\n"
+    "Show how many kickoff concepts are ready, or cancel the kickoff.\n\n",
+
+    "`/preferences`\n"
+    "Show your and this server's preferred tone, difficulty and genres.\n\n",
+
+    "`/set-preferences [tone] [difficulty] [favorite_genres] [server] [clear]`\n"
+    "Set defaults used when you leave options out.\n"
+    "• `server` (optional): Set them for the whole server (Manage Server)\n\n",
+
+    "`/help`\n"
+    "Show this help message.\n\n",
+
+    "---\n"
+    "Need help? The bot uses AI to generate creative concepts and provide encouragement during your game jams!",
+)
+
+
+@lru_cache(maxsize=1)
 def format_help_message() -> str:
     """
     Format the help message with all available commands.
-    
+
+    The text is static, so it is rendered once and reused.
+
     Returns:
         Formatted help message
     """
-    message = "🎮 **Game Jam Assistant Bot** 🎮\n\n"
-    message += "**Available Commands:**\n\n"
-    
-    message += "`/generate-concept [genre] [difficulty]`\n"
-    message += "Generate a random game concept with constraints.\n"
-    message += "• `genre` (optional): Specify a genre (platformer, rpg, puzzle, etc.)\n"
-    message += "• `difficulty` (optional): Easy, Medium, Hard, Insane\n\n"
-    
-    message += "`/generate-constraint`\n"
-    message += "Add one more constraint to your existing concept.\n\n"
-    
-    message += "`/vibe-check [message]`\n"
-    message += "Get AI commentary on your current progress/mood.\n"
-    message += "• `message` (optional): Your current status or situation\n\n"
-    
-    message += "`/help`\n"
-    message += "Show this help message.\n\n"
-    
-    message += "---\n"
-    message += "Need help? The bot uses AI to generate creative concepts and provide encouragement during your game jams!"
-    
-    return message
-
+    return "".join(HELP_SECTIONS)
@@ -0,0 +1,287 @@
+"""Rate-limit-aware outbound message queue for channel messages."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+import discord
+from config import (
+    MESSAGE_QUEUE_WORKERS,
+    CHANNEL_MESSAGE_BURST,
+    CHANNEL_MESSAGE_RATE,
+    GLOBAL_MESSAGE_BURST,
+    GLOBAL_MESSAGE_RATE,
+)
+from utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+DISCORD_MESSAGE_LIMIT = 2000
+MERGE_SEPARATOR = "\n\n"
+MAX_SEND_ATTEMPTS = 5
+
+
+def split_message(content: str, limit: int = DISCORD_MESSAGE_LIMIT) -> List[str]:
+    """
+    Split text into chunks that fit in a Discord message.
+
+    Splits at the last newline before the limit, then the last space, and
+    only cuts mid-word when a single word is longer than the limit.
+
+    Args:
+        content: Message text
+        limit: Maximum characters per chunk
+
+    Returns:
+        List of chunks (a single chunk if the text already fits)
+    """
+    chunks = []
+    while len(content) > limit:
+        cut = content.rfind("\n", 0, limit + 1)
+        if cut <= 0:
+            cut = content.rfind(" ", 0, limit + 1)
+        if cut <= 0:
+            cut = limit
+        chunks.append(content[:cut].rstrip())
+        content = content[cut:].lstrip()
+    if content or not chunks:
+        chunks.append(content)
+    return chunks
+
+
+@dataclass
+class OutboundMessage:
+    """A message waiting to be delivered."""
+
+    channel: discord.abc.Messageable
+    content: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class DeliveryStats:
+    """Delivery latency (enqueue to send) over a rolling window."""
+
+    def __init__(self, window: int = 1000):
+        self.delivered = 0
+        self.failed = 0
+        self.merged = 0
+        self.rate_limited = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+    def record(self, latency: float):
+        self.delivered += 1
+        self._latencies.append(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current counters and latency percentiles (seconds)."""
+        latencies = sorted(self._latencies)
+        if latencies:
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            worst = latencies[-1]
+        else:
+            p50 = p95 = worst = 0.0
+        return {
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "merged": self.merged,
+            "rate_limited": self.rate_limited,
+            "latency_p50": round(p50, 3),
+            "latency_p95": round(p95, 3),
+            "latency_max": round(worst, 3),
+        }
+
+
+class MessageQueue:
+    """
+    Outbound delivery queue with per-channel and global token buckets.
+
+    Messages are queued per channel. When a channel's turn comes up, every
+    message waiting for it is merged into as few Discord messages as
+    possible (each at most 2000 characters), so a burst of check-ins to one
+    channel costs one or two sends instead of dozens. A channel is only
+    handled by one worker at a time, which keeps its messages in order.
+    """
+
+    def __init__(
+        self,
+        workers: int = MESSAGE_QUEUE_WORKERS,
+        channel_burst: float = CHANNEL_MESSAGE_BURST,
+        channel_rate: float = CHANNEL_MESSAGE_RATE,
+        global_burst: float = GLOBAL_MESSAGE_BURST,
+        global_rate: float = GLOBAL_MESSAGE_RATE
+    ):
+        self.workers = workers
+        self.channel_burst = channel_burst
+        self.channel_rate = channel_rate
+        self.stats = DeliveryStats()
+
+        self._global = TokenBucket(global_burst, global_rate)
+        self._channel_buckets: Dict[int, TokenBucket] = {}
+        self._last_sweep = time.monotonic()
+        self._pending: Dict[int, Deque[OutboundMessage]] = {}
+        self._ready: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """Start the delivery workers on the running event loop."""
+        if self._tasks:
+            return
+        self._ready = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"message-queue-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"Message queue started with {self.workers} worker(s)")
+
+    @property
+    def pending(self) -> int:
+        """Number of messages waiting to be sent."""
+        return sum(len(messages) for messages in self._pending.values())
+
+    def enqueue(self, channel: discord.abc.Messageable, content: str) -> asyncio.Future:
+        """
+        Queue a message for delivery without waiting for it.
+
+        Args:
+            channel: Channel (or other messageable) to send to
+            content: Message text (split automatically if too long)
+
+        Returns:
+            Future resolving to the list of sent discord.Message objects
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        channel_id = channel.id
+        messages = self._pending.get(channel_id)
+        if messages is None:
+            messages = self._pending[channel_id] = deque()
+            self._ready.put_nowait(channel_id)
+        messages.append(OutboundMessage(channel, content, future))
+        return future
+
+    async def send(self, channel: discord.abc.Messageable, content: str) -> List[discord.Message]:
+        """Queue a message and wait until it has been delivered."""
+        return await self.enqueue(channel, content)
+
+    async def _worker(self):
+        while True:
+            channel_id = await self._ready.get()
+            try:
+                await self._deliver_channel(channel_id)
+            except Exception as e:
+                logger.error(f"Message queue worker error for channel {channel_id}: {e}", exc_info=True)
+            finally:
+                self._ready.task_done()
+
+    async def _deliver_channel(self, channel_id: int):
+        """Send everything queued for one channel, merging where possible."""
+        while True:
+            messages = self._pending.get(channel_id)
+            if not messages:
+                self._pending.pop(channel_id, None)
+                return
+
+            batch = list(messages)
+            messages.clear()
+            if len(batch) > 1:
+                self.stats.merged += len(batch) - 1
+
+            channel = batch[0].channel
+            try:
+                sent = []
+                for chunk in self._merge(batch):
+                    sent.append(await self._send_chunk(channel, chunk))
+            except Exception as e:
+                logger.warning(f"Failed to deliver {len(batch)} message(s) to channel {channel_id}: {e}")
+                self.stats.failed += len(batch)
+                for message in batch:
+                    if not message.future.done():
+                        message.future.set_exception(e)
+                continue
+
+            now = time.monotonic()
+            for message in batch:
+                self.stats.record(now - message.enqueued_at)
+                if not message.future.done():
+                    message.future.set_result(sent)
+
+    def _merge(self, batch: List[OutboundMessage]) -> List[str]:
+        """Combine consecutive messages into as few <=2000 character chunks as possible."""
+        chunks: List[str] = []
+        for message in batch:
+            for part in split_message(message.content):
+                if chunks and len(chunks[-1]) + len(MERGE_SEPARATOR) + len(part) <= DISCORD_MESSAGE_LIMIT:
+                    chunks[-1] += MERGE_SEPARATOR + part
+                else:
+                    chunks.append(part)
+        return chunks
+
+    async def _send_chunk(self, channel: discord.abc.Messageable, content: str) -> discord.Message:
+        """Send one chunk once both buckets allow it, retrying on 429s."""
+        self._sweep_buckets()
+        bucket = self._channel_buckets.get(channel.id)
+        if bucket is None:
+            bucket = self._channel_buckets[channel.id] = TokenBucket(self.channel_burst, self.channel_rate)
+
+        for attempt in range(MAX_SEND_ATTEMPTS):
+            while True:
+                now = time.monotonic()
+                wait = max(bucket.wait_time(1, now), self._global.wait_time(1, now))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            bucket.consume(1, now)
+            self._global.consume(1, now)
+
+            try:
+                return await channel.send(content)
+            except discord.RateLimited as e:
+                # discord.py gave up waiting on a long rate limit
+                retry_after = e.retry_after
+            except discord.HTTPException as e:
+                if e.status != 429:
+                    raise
+                retry_after = 2 ** attempt
+
+            if attempt == MAX_SEND_ATTEMPTS - 1:
+                raise RuntimeError(f"Still rate limited after {MAX_SEND_ATTEMPTS} attempts")
+            self.stats.rate_limited += 1
+            logger.warning(f"Rate limited sending to channel {channel.id}, retrying in {retry_after:.1f}s")
+            await asyncio.sleep(retry_after)
+
+    def _sweep_buckets(self, interval: float = 60.0):
+        """Forget channel buckets that have refilled completely."""
+        now = time.monotonic()
+        if now - self._last_sweep < interval:
+            return
+        self._last_sweep = now
+        idle = [key for key, bucket in self._channel_buckets.items() if bucket.is_full(now)]
+        for key in idle:
+            del self._channel_buckets[key]
+
+    async def stop(self, timeout: float = 10.0):
+        """
+        Deliver what is already queued (up to timeout seconds), then stop.
+
+        Args:
+            timeout: Maximum seconds to spend draining the queue
+        """
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._ready.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Message queue stopped with {self.pending} message(s) undelivered")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info(f"Message queue stopped: {self.stats.snapshot()}")
+
+
+# Global instance
+message_queue = MessageQueue()
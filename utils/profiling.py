@@ -0,0 +1,218 @@
+"""In-process CPU profiling and memory snapshots for diagnosing a live bot."""
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Dict, Optional
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+# Frames recorded per allocation while tracemalloc is on (more = slower)
+TRACEMALLOC_FRAMES = 10
+
+# Allocations made by the profiling machinery itself are left out of diffs
+_IGNORED_FILES = (
+    tracemalloc.__file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+)
+
+
+def _location(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of every Python thread at a fixed interval.
+
+    Unlike cProfile, which only sees the thread it was enabled on, this
+    covers the event loop and the generation worker threads at once and
+    adds almost no overhead. Worker processes (GENERATION_WORKERS > 0) are
+    not visible from the bot process.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self.own: Counter = Counter()  # (thread, function) at the top of the stack
+        self.total: Counter = Counter()  # (thread, function) anywhere in the stack
+
+    def run(self, duration: float):
+        """Sample for duration seconds (blocking; run it in a thread)."""
+        me = threading.get_ident()
+        names: Dict[int, str] = {}
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                if thread_id not in names:
+                    names.update((thread.ident, thread.name) for thread in threading.enumerate())
+                name = names.get(thread_id, str(thread_id))
+                self.own[(name, _location(frame))] += 1
+                seen = set()
+                while frame is not None:
+                    location = _location(frame)
+                    if location not in seen:
+                        seen.add(location)
+                        self.total[(name, location)] += 1
+                    frame = frame.f_back
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def report(self, top: int) -> str:
+        """Hotspots by self and inclusive sample share."""
+        if not self.samples:
+            return "No samples collected."
+        lines = [f"{self.samples} samples every {self.interval * 1000:.0f}ms", "", "Self time (top of stack):"]
+        for (thread, location), count in self.own.most_common(top):
+            lines.append(f"  {count / self.samples:6.1%}  [{thread}] {location}")
+        lines += ["", "Inclusive time (anywhere in stack):"]
+        for (thread, location), count in self.total.most_common(top):
+            lines.append(f"  {count / self.samples:6.1%}  [{thread}] {location}")
+        return "\n".join(lines)
+
+
+async def sample_profile(duration: float, top: int = 20) -> str:
+    """
+    Sample every thread for a while and report the hotspots.
+
+    Args:
+        duration: Seconds to sample
+        top: Number of hotspots per table
+
+    Returns:
+        Plain-text report
+    """
+    profiler = SamplingProfiler()
+    await asyncio.to_thread(profiler.run, duration)
+    return profiler.report(top)
+
+
+async def cprofile_event_loop(duration: float, top: int = 20) -> str:
+    """
+    Run cProfile on the event loop thread for a while.
+
+    Every callback and coroutine step the loop runs in that window is
+    profiled with exact call counts. Work in executor threads shows up only
+    as the time spent waiting for it; use sample_profile() for those.
+
+    Args:
+        duration: Seconds to profile
+        top: Number of functions to list
+
+    Returns:
+        pstats report sorted by cumulative time, then by own time
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        profiler.disable()
+
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output).strip_dirs()
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    return output.getvalue()
+
+
+class MemoryTracker:
+    """
+    tracemalloc snapshots diffed against the previous one.
+
+    Tracing slows allocations down, so it only runs between start() and
+    stop(). Alongside the allocation diff, the sizes reported by the given
+    probes (cache entries, pooled concepts, sessions...) are diffed too,
+    so growth can be tied to a specific store.
+    """
+
+    def __init__(self, probes: Optional[Dict[str, Callable[[], int]]] = None):
+        self.probes = probes or {}
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._sizes: Dict[str, int] = {}
+        self._taken_at = 0.0
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self) -> str:
+        """Start tracing and take the baseline snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._take()
+        current, _ = tracemalloc.get_traced_memory()
+        return f"Tracing started, baseline taken ({current / 1024:.0f} KiB traced)."
+
+    def stop(self) -> str:
+        """Stop tracing and drop the snapshots."""
+        self._snapshot = None
+        self._sizes = {}
+        if not tracemalloc.is_tracing():
+            return "Tracing was not running."
+        tracemalloc.stop()
+        return "Tracing stopped."
+
+    def diff(self, top: int = 20) -> str:
+        """
+        Compare a new snapshot with the previous one (which it then replaces).
+
+        Args:
+            top: Number of source lines to list
+
+        Returns:
+            Plain-text report of the largest growth, by source line and by store
+        """
+        if self._snapshot is None:
+            return "No baseline yet: start tracing first."
+        previous, previous_sizes, previous_at = self._snapshot, self._sizes, self._taken_at
+        self._take()
+
+        lines = [f"Changes over the last {self._taken_at - previous_at:.0f}s", ""]
+        sizes = self._sizes
+        lines.append("Stores:")
+        for name in sorted(sizes):
+            before = previous_sizes.get(name, 0)
+            lines.append(f"  {name:<24} {sizes[name]:>8} ({sizes[name] - before:+d})")
+
+        stats = self._snapshot.compare_to(previous, "lineno")
+        current, peak = tracemalloc.get_traced_memory()
+        lines += ["", f"Traced memory: {current / 1024:.0f} KiB (peak {peak / 1024:.0f} KiB)", "Top growth:"]
+        for stat in stats[:top]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"  {stat.size_diff / 1024:+9.1f} KiB {stat.count_diff:+7d} blocks  "
+                f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            )
+        return "\n".join(lines)
+
+    def _take(self):
+        snapshot = tracemalloc.take_snapshot()
+        self._snapshot = snapshot.filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_FILES]
+        )
+        self._sizes = self.sizes()
+        self._taken_at = time.monotonic()
+
+    def sizes(self) -> Dict[str, int]:
+        """Current value of every probe (failing probes report -1)."""
+        sizes = {}
+        for name, probe in self.probes.items():
+            try:
+                sizes[name] = probe()
+            except Exception:
+                sizes[name] = -1
+        return sizes
+
@@ -0,0 +1,208 @@
+"""Token-bucket rate limiting for AI-backed commands."""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Hashable, Optional
+from config import (
+    RATE_LIMIT_USER_CAPACITY,
+    RATE_LIMIT_USER_REFILL,
+    RATE_LIMIT_GUILD_CAPACITY,
+    RATE_LIMIT_GUILD_REFILL,
+    RATE_LIMIT_GLOBAL_CAPACITY,
+    RATE_LIMIT_GLOBAL_REFILL,
+    RATE_LIMIT_SWEEP_INTERVAL,
+    RATE_LIMIT_MESSAGE_CHARS_PER_TOKEN,
+    COMMAND_COSTS,
+    shard_settings,
+)
+from database.db_manager import DatabaseManager, db_manager
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """A single token bucket that refills continuously over time."""
+
+    __slots__ = ("capacity", "refill_rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, refill_rate: float, now: Optional[float] = None):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.updated = time.monotonic() if now is None else now
+
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last update."""
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            self.updated = now
+
+    def has(self, cost: float, now: float) -> bool:
+        """Check whether the bucket can currently pay the given cost."""
+        self._refill(now)
+        return self.tokens >= cost
+
+    def consume(self, cost: float, now: float):
+        """Remove tokens from the bucket (call has() first)."""
+        self._refill(now)
+        self.tokens -= cost
+
+    def wait_time(self, cost: float, now: float) -> float:
+        """Seconds until the bucket can pay the given cost (0 if it already can)."""
+        self._refill(now)
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.refill_rate
+
+    def is_full(self, now: float) -> bool:
+        """A full bucket is indistinguishable from a fresh one."""
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class RateLimiter:
+    """
+    Per-user, per-guild and global token-bucket limiter.
+
+    Buckets are only kept for callers that have spent tokens recently. Once a
+    bucket has refilled completely it is dropped during the next sweep, so
+    memory stays proportional to the number of active users.
+
+    A guild lives on a single shard, so guild buckets are always kept in
+    memory. A user can call the bot through every shard process, so when a
+    shared database is given the user tier is kept there instead.
+    """
+
+    def __init__(
+        self,
+        user_capacity: float = RATE_LIMIT_USER_CAPACITY,
+        user_refill: float = RATE_LIMIT_USER_REFILL,
+        guild_capacity: float = RATE_LIMIT_GUILD_CAPACITY,
+        guild_refill: float = RATE_LIMIT_GUILD_REFILL,
+        global_capacity: float = RATE_LIMIT_GLOBAL_CAPACITY,
+        global_refill: float = RATE_LIMIT_GLOBAL_REFILL,
+        sweep_interval: float = RATE_LIMIT_SWEEP_INTERVAL,
+        shared: Optional[DatabaseManager] = None
+    ):
+        self.user_capacity = user_capacity
+        self.user_refill = user_refill
+        self.guild_capacity = guild_capacity
+        self.guild_refill = guild_refill
+        self.sweep_interval = sweep_interval
+        self.shared = shared
+
+        self._users: Dict[Hashable, TokenBucket] = {}
+        self._guilds: Dict[Hashable, TokenBucket] = {}
+        self._global = TokenBucket(global_capacity, global_refill)
+        self._last_sweep = time.monotonic()
+
+    def command_cost(self, command: str, message: str = "") -> float:
+        """
+        Estimate the cost of a command in tokens.
+
+        Args:
+            command: Slash command name
+            message: Free-form user text sent along with the command
+
+        Returns:
+            Token cost, capped so a single call always fits an empty user bucket
+        """
+        cost = COMMAND_COSTS.get(command, 1)
+        if message:
+            cost += len(message) // RATE_LIMIT_MESSAGE_CHARS_PER_TOKEN
+        return min(cost, self.user_capacity)
+
+    async def try_acquire(
+        self,
+        user_id: Hashable,
+        guild_id: Optional[Hashable],
+        cost: float
+    ) -> bool:
+        """
+        Spend tokens from every tier, or from none if any tier is short.
+
+        Args:
+            user_id: Discord user ID
+            guild_id: Discord guild ID (None for DMs)
+            cost: Token cost of the command
+
+        Returns:
+            True if the caller is within budget, False otherwise
+        """
+        now = time.monotonic()
+        if self._maybe_sweep(now) and self.shared is not None:
+            await asyncio.to_thread(self.shared.prune_rate_buckets, self.user_capacity, self.user_refill)
+
+        user_bucket = None
+        if self.shared is None:
+            user_bucket = self._users.get(user_id)
+            if user_bucket is None:
+                user_bucket = TokenBucket(self.user_capacity, self.user_refill, now)
+
+        guild_bucket = None
+        if guild_id is not None:
+            guild_bucket = self._guilds.get(guild_id)
+            if guild_bucket is None:
+                guild_bucket = TokenBucket(self.guild_capacity, self.guild_refill, now)
+
+        buckets = [bucket for bucket in (user_bucket, self._global, guild_bucket) if bucket is not None]
+
+        if not all(bucket.has(cost, now) for bucket in buckets):
+            logger.info(f"Rate limit hit for user {user_id} in guild {guild_id} (cost {cost})")
+            return False
+
+        # Spend before awaiting the shared user bucket so concurrent commands
+        # can't spend the same local tokens, and refund if it comes up short
+        for bucket in buckets:
+            bucket.consume(cost, now)
+
+        if self.shared is not None and not await asyncio.to_thread(
+            self.shared.spend_rate_tokens, f"user:{user_id}", self.user_capacity, self.user_refill, cost
+        ):
+            for bucket in buckets:
+                bucket.tokens = min(bucket.capacity, bucket.tokens + cost)
+            logger.info(f"Rate limit hit for user {user_id} in guild {guild_id} (cost {cost})")
+            return False
+
+        # Only store buckets once they hold state worth remembering
+        if user_bucket is not None:
+            self._users[user_id] = user_bucket
+        if guild_bucket is not None:
+            self._guilds[guild_id] = guild_bucket
+
+        return True
+
+    def active_buckets(self) -> int:
+        """Number of per-user and per-guild buckets currently held."""
+        return len(self._users) + len(self._guilds)
+
+    def _maybe_sweep(self, now: float) -> bool:
+        """Drop buckets that have refilled completely since they were last used."""
+        if now - self._last_sweep < self.sweep_interval:
+            return False
+        self._last_sweep = now
+
+        for buckets in (self._users, self._guilds):
+            idle = [key for key, bucket in buckets.items() if bucket.is_full(now)]
+            for key in idle:
+                del buckets[key]
+        return True
+
+
+def _global_share() -> float:
+    """Fraction of the shared Ollama budget owned by this process's shards."""
+    shards = shard_settings()
+    if shards.partial:
+        return len(shards.ids) / shards.count
+    return 1.0
+
+
+# Global instance (the global tier is split between shard processes and the
+# user tier is shared through the database)
+rate_limiter = RateLimiter(
+    global_capacity=RATE_LIMIT_GLOBAL_CAPACITY * _global_share(),
+    global_refill=RATE_LIMIT_GLOBAL_REFILL * _global_share(),
+    shared=db_manager if shard_settings().partial else None
+)